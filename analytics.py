@@ -0,0 +1,152 @@
+"""
+Analytics offline (map-reduce paralel) atas file log history
+File log (history-XXXXXXXX.log dari HistoryStore, boleh dari banyak user/mesin) dipecah
+per byte range, tiap shard di-aggregate di ProcessPoolExecutor, lalu hasilnya di-merge
+ke format yang sama dengan get_session_statistics
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from history_store import SEGMENT_PATTERN
+from stats import SessionAggregates
+
+CHUNK_SIZE = 16 * 1024 * 1024  # byte per shard
+_decode = json.JSONDecoder().decode  # tanpa deteksi encoding json.loads per baris
+
+Shard = Tuple[str, int, int]  # (path, start, end)
+
+def collect_files(paths: Iterable[str]) -> List[str]:
+    """
+    Daftar file log dari argumen (file langsung, atau directory dicari rekursif)
+    Args:
+        paths (Iterable[str]): File atau directory
+    Returns:
+        List path file, urut per directory lalu nama (urutan waktu per segment)
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names) if SEGMENT_PATTERN.match(name))
+        else:
+            files.append(path)
+    return files
+
+def plan_shards(files: List[str], chunk_size: int = CHUNK_SIZE) -> List[Shard]:
+    """
+    Pecah file menjadi byte range kira-kira chunk_size (batas baris dirapikan oleh worker)
+    Args:
+        files (List[str]): File log
+        chunk_size (int): Ukuran target satu shard
+    Returns:
+        List of (path, start, end)
+    """
+    shards = []
+    for path in files:
+        size = os.path.getsize(path)
+        for start in range(0, size, chunk_size):
+            shards.append((path, start, min(start + chunk_size, size)))
+    return shards
+
+def aggregate_shard(shard: Shard, by_user: bool = False) -> Tuple[SessionAggregates, Dict[str, SessionAggregates], int, int]:
+    """
+    Map: aggregate semua baris yang DIMULAI di [start, end)
+    Baris terakhir file yang terpotong (tanpa newline) dan baris rusak dilewati
+    Args:
+        shard (Shard): (path, start, end)
+        by_user (bool): Buat juga aggregates per user
+    Returns:
+        (aggregates total, aggregates per user, jumlah row, jumlah baris rusak)
+    """
+    path, start, end = shard
+    total = SessionAggregates()
+    users: Dict[str, SessionAggregates] = {}
+    rows = errors = 0
+    with open(path, "rb") as f:
+        if start:
+            # Baris yang melewati start milik shard sebelumnya
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        while position < end:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break
+            position += len(line)
+            try:
+                record = _decode(line.decode("utf-8"))
+                if by_user:
+                    user_id = record.get("user_id", "")
+                    aggregates = users.get(user_id)
+                    if aggregates is None:
+                        aggregates = users[user_id] = SessionAggregates()
+                    aggregates.add(record)
+                else:
+                    total.add(record)
+            except (ValueError, KeyError, TypeError, IndexError, AttributeError):  # termasuk UnicodeDecodeError
+                errors += 1
+                continue
+            rows += 1
+    # Total per shard dari merge per user (lebih murah daripada add dua kali per row)
+    for aggregates in users.values():
+        total.merge(aggregates)
+    return total, users, rows, errors
+
+def analyze(paths: Iterable[str], workers: Optional[int] = None, by_user: bool = False, by_day: bool = False,
+            chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Reduce: merge hasil semua shard ke format get_session_statistics
+    Args:
+        paths (Iterable[str]): File log atau directory
+        workers (int): Jumlah proses (None = jumlah CPU, 1 = tanpa process pool)
+        by_user (bool): Sertakan statistik per user ("users")
+        by_day (bool): Sertakan rollup harian ("buckets")
+        chunk_size (int): Ukuran target satu shard dalam byte
+    Returns:
+        Dict statistics + rows, errors, files, shards, workers, elapsed_seconds, rows_per_second
+    """
+    started = time.perf_counter()
+    files = collect_files(paths)
+    shards = plan_shards(files, chunk_size)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(shards) <= 1:
+        partials = [aggregate_shard(shard, by_user) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+            partials = list(executor.map(aggregate_shard, shards, [by_user] * len(shards)))
+
+    # Merge urut shard (urut file, lalu offset) agar streak digabung sesuai urutan waktu
+    total = SessionAggregates()
+    users: Dict[str, SessionAggregates] = {}
+    rows = errors = 0
+    for shard_total, shard_users, shard_rows, shard_errors in partials:
+        total.merge(shard_total)
+        for user_id, aggregates in shard_users.items():
+            if user_id in users:
+                users[user_id].merge(aggregates)
+            else:
+                users[user_id] = aggregates
+        rows += shard_rows
+        errors += shard_errors
+
+    period = "day" if by_day else None
+    result = total.report(period, limit=None)
+    if by_user:
+        result["users"] = {user_id: users[user_id].report(period, limit=None) for user_id in sorted(users)}
+
+    elapsed = time.perf_counter() - started
+    result.update({
+        "rows": rows,
+        "errors": errors,
+        "files": len(files),
+        "shards": len(shards),
+        "workers": workers,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed) if elapsed > 0 else 0,
+    })
+    return result
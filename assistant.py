@@ -3,13 +3,131 @@ Memproses user input dan generate responses
 """
 
 import random
-from config import RESPONSES
+import re
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from config import MAX_TIMER_MINUTES, RESPONSES, SESSIONS_UNTIL_LONG_BREAK, PROFILE_COMMANDS
+from cycle import MAX_CYCLE_SESSIONS
+
+# COMMAND KEYWORDS (urutan = prioritas jika beberapa intent cocok)
+COMMAND_KEYWORDS = (
+    ("phase", ("fase", "phase")),
+    ("cycle", ("siklus", "cycle", "auto")),
+    ("start", ("mulai", "start", "begin", "run", "timer")),
+    ("check_time", ("berapa", "sisa", "time", "remaining", "progress")),
+    ("pause", ("pause", "jeda", "istirahat")),
+    ("resume", ("resume", "lanjut", "continue", "go")),
+    ("stop", ("stop", "henti", "berhenti", "halt")),
+    ("motivation", ("motivasi", "motivation", "semangat", "inspire")),
+    ("stats", ("stats", "statistik", "summary")),
+    ("perf", ("perf", "performa", "performance", "latency")),
+    ("help", ("help", "bantuan", "?")),
+    ("timeline", ("riwayat", "timeline", "history")),
+    ("at", ("pukul", "at")),
+)
+PARSE_CACHE_SIZE = 1024
+MAX_DURATION = MAX_TIMER_MINUTES  # sama dengan batas validator tool start_pomodoro
+
+# Awalan Indonesia opsional (dimulai, memulai, dihentikan) untuk keyword >= 3 huruf
+_PREFIXES = "di|meng|mem|men|me|ber|ter"
+# Batas kata = bukan huruf, jadi angka boleh menempel ("timer25", "25menit")
+_NOT_LETTER_BEFORE = r"(?<![^\W\d_])"
+_NOT_LETTER_AFTER = r"(?![^\W\d_])"
+
+def _keyword_pattern(keyword: str) -> str:
+    """Regex satu keyword: awalan + akhiran Indonesia opsional (dimulai, hentikan, lanjutlah)"""
+    if not keyword[0].isalnum():
+        return re.escape(keyword)
+    prefix = f"(?:{_PREFIXES})?" if len(keyword) >= 3 else ""
+    return rf"{_NOT_LETTER_BEFORE}{prefix}{re.escape(keyword)}(?:kan|lah|nya)?{_NOT_LETTER_AFTER}"
+
+# Satu regex untuk semua intent + angka durasi, dicocokkan sekali jalan
+_COMMAND_PATTERN = re.compile(
+    "|".join(
+        [f"(?P<{command}>{'|'.join(_keyword_pattern(word) for word in words)})" for command, words in COMMAND_KEYWORDS]
+        + [r"(?P<number>\d+)"]
+    ),
+    re.IGNORECASE
+)
+_PRIORITY = {command: priority for priority, (command, _) in enumerate(COMMAND_KEYWORDS)}
+_DATE_PATTERN = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+_CLOCK_PATTERN = re.compile(r"\b(\d{1,2})[:.](\d{2})\b")
+# Sub-perintah perf (default: tampilkan metric)
+_PERF_ACTIONS = {"on": "on", "nyala": "on", "off": "off", "mati": "off", "reset": "reset", "profile": "profile"}
+_PERF_PATTERN = re.compile(rf"\b({'|'.join(_PERF_ACTIONS)})(?:kan)?\b", re.IGNORECASE)
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse(user_input: str) -> tuple:
+    """
+    Parse input sekali jalan (hasil di-cache)
+    Args:
+        user_input (str): Raw input dari user
+    Returns:
+        tuple: (command_type, angka (durasi start / jumlah sesi cycle / jumlah command profile) atau None)
+    """
+    best = None
+    number = None
+    for match in _COMMAND_PATTERN.finditer(user_input):
+        group = match.lastgroup
+        if group == "number":
+            if number is None:
+                number = int(match.group())
+        elif best is None or _PRIORITY[group] < _PRIORITY[best]:
+            best = group
+    
+    if best is None:
+        return "unknown", None
+    if best == "start":
+        return best, max(min(25 if number is None else number, MAX_DURATION), 1)
+    if best == "cycle":
+        return best, max(min(SESSIONS_UNTIL_LONG_BREAK if number is None else number, MAX_CYCLE_SESSIONS), 1)
+    if best == "perf":
+        return best, number
+    return best, None
+
+# RESPONSE TEMPLATES
+class ResponseTemplate:
+    """Template response yang sudah di-compile (field yang dibutuhkan diketahui di awal)"""
+    __slots__ = ("text", "fields", "render")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.fields: FrozenSet[str] = frozenset(
+            field.split(".")[0].split("[")[0] for _, field, _, _ in Formatter().parse(text) if field
+        )
+        # Template tanpa placeholder tidak perlu diformat sama sekali
+        self.render = text.format if self.fields else (lambda **kwargs: text)
+
+class _KeepMissing(dict):
+    """Mapping untuk format_map: placeholder yang tidak ada dibiarkan apa adanya"""
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+def compile_responses(responses: Dict[str, List[str]]) -> Dict[str, Tuple[ResponseTemplate, ...]]:
+    """
+    Compile semua template response
+    Args:
+        responses (Dict): Format config.RESPONSES
+    Returns:
+        Dict command -> tuple ResponseTemplate
+    """
+    return {command: tuple(ResponseTemplate(text) for text in texts) for command, texts in responses.items()}
 
 # LOCAL ASSISTANT (Rule-Based)
 class LocalAssistant:
-    def __init__(self):
-        """Inisialisasi assistant"""
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Inisialisasi assistant
+        Args:
+            seed (int): Seed RNG untuk response yang reproducible (None = random)
+        """
         self.responses = RESPONSES
+        self.templates = compile_responses(RESPONSES)
+        self.rng = random.Random(seed)
+        # (command, field yang tersedia) -> template yang bisa dirender
+        self._candidates: Dict[Tuple[str, FrozenSet[str]], Tuple[ResponseTemplate, ...]] = {}
     
     def get_response(self, command: str, **kwargs) -> str:
         """
@@ -20,17 +138,23 @@ class LocalAssistant:
         Returns:
             str: Response message yang random dari template
         """
-        if command not in self.responses:
-            return self._default_response()
+        key = (command, frozenset(kwargs))
+        candidates = self._candidates.get(key)
+        if candidates is None:
+            templates = self.templates.get(command)
+            if templates is None:
+                return self._default_response()
+            # Hanya template yang semua field-nya tersedia
+            candidates = tuple(t for t in templates if t.fields <= key[1]) or templates
+            self._candidates[key] = candidates
         
         # Get random response dari template
-        response_template = random.choice(self.responses[command])
+        template = candidates[self.rng.randrange(len(candidates))] if len(candidates) > 1 else candidates[0]
         
         # Format dengan parameter
-        try:
-            return response_template.format(**kwargs)
-        except KeyError:
-            return response_template
+        if template.fields <= key[1]:
+            return template.render(**kwargs)
+        return template.text.format_map(_KeepMissing(kwargs))
     
     def _default_response(self) -> str:
         """Default response jika command tidak dikenali"""
@@ -42,62 +166,49 @@ class LocalAssistant:
         Args:
             user_input (str): Raw input dari user
         Returns:
-            dict: {type: command_type, duration: duration (jika ada)}
+            dict: {type: command_type, duration: duration (start), sessions: jumlah sesi (cycle),
+                   action + count (perf)}
         """
-        lower_input = user_input.lower().strip()
-        
-        # Start timer
-        if any(word in lower_input for word in ["mulai", "start", "begin", "run", "timer"]):
-            # Extract duration
-            duration = self._extract_number(user_input, default=25)
-            return {"type": "start", "duration": min(duration, 120), "raw": user_input}
-        
-        # Check time
-        elif any(word in lower_input for word in ["berapa", "sisa", "time", "remaining", "progress"]):
-            return {"type": "check_time", "raw": user_input}
-        
-        # Pause
-        elif any(word in lower_input for word in ["pause", "jeda", "istirahat"]):
-            return {"type": "pause", "raw": user_input}
-        
-        # Resume
-        elif any(word in lower_input for word in ["resume", "lanjut", "continue", "go"]):
-            return {"type": "resume", "raw": user_input}
-        
-        # Stop
-        elif any(word in lower_input for word in ["stop", "henti", "berhenti", "halt"]):
-            return {"type": "stop", "raw": user_input}
-        
-        # Motivation
-        elif any(word in lower_input for word in ["motivasi", "motivation", "semangat", "inspire"]):
-            return {"type": "motivation", "raw": user_input}
-        
-        # Statistics
-        elif any(word in lower_input for word in ["stats", "statistik", "statistik", "progress", "summary"]):
-            return {"type": "stats", "raw": user_input}
-        
-        # Help
-        elif any(word in lower_input for word in ["help", "bantuan", "?"]):
-            return {"type": "help", "raw": user_input}
-        
-        else:
-            return {"type": "unknown", "raw": user_input}
+        command_type, number = _parse(user_input.strip())
+        if command_type == "start":
+            return {"type": command_type, "duration": number, "raw": user_input}
+        if command_type == "cycle":
+            return {"type": command_type, "sessions": number, "raw": user_input}
+        if command_type == "perf":
+            match = _PERF_PATTERN.search(user_input)
+            action = _PERF_ACTIONS[match.group(1).lower()] if match else "show"
+            return {"type": command_type, "action": action, "count": number or PROFILE_COMMANDS, "raw": user_input}
+        if command_type in ("timeline", "at"):
+            return dict(_parse_times(command_type, user_input), type=command_type, raw=user_input)
+        return {"type": command_type, "raw": user_input}
+
+def _parse_times(command_type: str, user_input: str) -> Dict[str, str]:
+    """
+    Ambil tanggal (YYYY-MM-DD, default hari ini) dan jam (HH:MM) dari input
+    Args:
+        command_type (str): "timeline" (rentang) atau "at" (satu waktu)
+        user_input (str): Raw input dari user
+    Returns:
+        dict: {start, end} untuk timeline, {timestamp} untuk at (ISO local time)
+    """
+    match = _DATE_PATTERN.search(user_input)
+    try:
+        day = date(*map(int, match.groups())) if match else date.today()
+    except ValueError:
+        day = date.today()
+    clocks = [time(int(h), int(m)) for h, m in _CLOCK_PATTERN.findall(user_input) if int(h) < 24 and int(m) < 60]
     
-    @staticmethod
-    def _extract_number(text: str, default: int = 25) -> int:
-        """
-        Extract number dari text
-        Args:
-            text (str): Text untuk extract
-            default (int): Default jika tidak ada number
-        Returns:
-            int: Number yang diekstract
-        """
-        import re
-        numbers = re.findall(r'\d+', text)
-        if numbers:
-            return int(numbers[0])
-        return default
+    if command_type == "at":
+        moment = datetime.combine(day, clocks[0]) if clocks else datetime.now()
+        return {"timestamp": moment.isoformat(timespec="minutes")}
+    
+    # Tanpa jam = sehari penuh, satu jam = satu jam ke depan
+    start = datetime.combine(day, clocks[0] if clocks else time())
+    if len(clocks) >= 2:
+        end = datetime.combine(day, clocks[1])
+    else:
+        end = start + (timedelta(hours=1) if clocks else timedelta(days=1))
+    return {"start": start.isoformat(timespec="minutes"), "end": end.isoformat(timespec="minutes")}
 
 # MOTIVATIONAL QUOTES
 QUOTES = [
@@ -108,11 +219,19 @@ QUOTES = [
     "🌟 Mengambil jeda bukan berarti berhenti, karena istirahat yang berkualitas adalah bahan bakar vital bagi produktivitas untuk menjaga energimu tetap prima. Keseimbangan itu kuncinya! ⚖️"
 ]
 
-def get_motivation_quote() -> str:
-    """Dapatkan motivational quote random"""
-    return random.choice(QUOTES)
+def get_motivation_quote(rng: Optional[random.Random] = None) -> str:
+    """
+    Dapatkan motivational quote random
+    Args:
+        rng (random.Random): RNG yang dipakai (default: module random)
+    """
+    return (rng or random).choice(QUOTES)
 
 # FACTORY
-def create_assistant() -> LocalAssistant:
-    """Create local assistant instance"""
-    return LocalAssistant()
+def create_assistant(seed: Optional[int] = None) -> LocalAssistant:
+    """
+    Create local assistant instance
+    Args:
+        seed (int): Seed RNG untuk response yang reproducible (None = random)
+    """
+    return LocalAssistant(seed)
@@ -0,0 +1,201 @@
+"""
+Versi asyncio dari tools Pomodoro
+Timer dijadwalkan dengan loop.call_at (tanpa thread per timer), state dan history
+sama dengan tools.py sehingga hasilnya identik dengan fungsi sync
+"""
+
+import asyncio
+import json
+import weakref
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+import tools
+from config import DEFAULT_USER_ID
+
+# ASYNCIO SCHEDULER
+class LoopTimerHandle:
+    """Handle jadwal di event loop (bisa di-cancel dari thread mana pun)"""
+    __slots__ = ("deadline", "callback", "cancelled", "timer")
+
+    def __init__(self, deadline: int, callback: Callable[[], None]):
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def fire(self) -> None:
+        """Dipanggil event loop saat deadline"""
+        if not self.cancelled:
+            self.cancelled = True
+            self.callback()
+
+class AsyncioScheduler:
+    """
+    Scheduler dengan interface sama seperti TimerScheduler, di atas loop.call_at
+    Deadline tools.clock.monotonic_ns dikonversi ke loop.time() (clock harus berjalan real-time)
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+
+    def schedule_at(self, deadline: int, callback: Callable[[], None]) -> LoopTimerHandle:
+        """
+        Jadwalkan callback pada deadline absolut (nanodetik, tools.clock.monotonic_ns)
+        Args:
+            deadline (int): Deadline absolut
+            callback (Callable): Fungsi tanpa argumen, dipanggil di event loop
+        Returns:
+            LoopTimerHandle untuk cancel
+        """
+        handle = LoopTimerHandle(deadline, callback)
+        if self._in_loop():
+            self._arm(handle)
+        else:
+            self.loop.call_soon_threadsafe(self._arm, handle)
+        return handle
+
+    def cancel(self, handle: Optional[LoopTimerHandle]) -> bool:
+        """
+        Batalkan jadwal
+        Args:
+            handle (LoopTimerHandle): Handle dari schedule_at()
+        Returns:
+            bool: True jika jadwal berhasil dibatalkan
+        """
+        if handle is None or handle.cancelled:
+            return False
+        handle.cancelled = True
+        if handle.timer is not None:
+            if self._in_loop():
+                handle.timer.cancel()
+            else:
+                self.loop.call_soon_threadsafe(handle.timer.cancel)
+        return True
+
+    def _arm(self, handle: LoopTimerHandle) -> None:
+        """Pasang loop.call_at (harus di thread event loop)"""
+        if handle.cancelled:
+            return
+        when = self.loop.time() + (handle.deadline - tools.clock.monotonic_ns()) / 1e9
+        handle.timer = self.loop.call_at(when, handle.fire)
+
+    def _in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncioScheduler]" = weakref.WeakKeyDictionary()
+
+def get_scheduler() -> AsyncioScheduler:
+    """AsyncioScheduler untuk event loop yang sedang berjalan (satu per loop)"""
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        scheduler = _schedulers[loop] = AsyncioScheduler(loop)
+    return scheduler
+
+# ASYNC POMODORO TOOLS
+async def start_pomodoro(duration_minutes: int, user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
+    """Versi async tools.start_pomodoro (countdown berjalan di event loop ini)"""
+    return tools.start_timer(duration_minutes, user_id, get_scheduler())
+
+async def start_cycle(sessions: int = tools.SESSIONS_UNTIL_LONG_BREAK, focus_minutes: int = tools.POMODORO_DURATION,
+                      user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
+    """Versi async tools.start_cycle (pergantian fase berjalan di event loop ini)"""
+    return tools.start_cycle_timer(sessions, focus_minutes, user_id, get_scheduler())
+
+async def get_remaining_time(user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
+    """Versi async tools.get_remaining_time"""
+    return tools.get_remaining_time(user_id)
+
+async def stop_pomodoro(user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
+    """Versi async tools.stop_pomodoro"""
+    return tools.stop_pomodoro(user_id)
+
+async def pause_pomodoro(user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
+    """Versi async tools.pause_pomodoro"""
+    return tools.pause_pomodoro(user_id)
+
+async def resume_pomodoro(user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
+    """Versi async tools.resume_pomodoro (dijadwalkan ulang di scheduler asal timer)"""
+    return tools.resume_pomodoro(user_id)
+
+async def get_session_statistics(user_id: str = DEFAULT_USER_ID, **kwargs) -> Dict[str, Any]:
+    """Versi async tools.get_session_statistics (argumen sama)"""
+    return tools.get_session_statistics(user_id, **kwargs)
+
+async def watch_progress(user_id: str = DEFAULT_USER_ID, follow: bool = False) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Versi async tools.watch_progress (async iterator, tanpa thread)
+    Args:
+        user_id (str): ID user/session pemilik timer
+        follow (bool): Terus watch timer berikutnya setelah timer selesai/berhenti
+    Yields:
+        Dict event progress
+    """
+    subscription = tools.progress_hub.subscribe(user_id, asyncio.get_running_loop())
+    try:
+        last_key = None
+        while True:
+            event = subscription.take()
+            if event is None:
+                event = tools.get_progress(user_id)
+                # get_progress bisa menyelesaikan timer yang lewat deadline (event complete ikut dipublish)
+                event = subscription.take() or event
+            key = (event["status"], event["remaining"], event["percentage"])
+            if event["event"] is not None or key != last_key:
+                last_key = key
+                yield event
+            if not follow and event["status"] in ("idle", "completed", "stopped"):
+                return
+            await subscription.wait_async(event["next_update_in"])
+    finally:
+        tools.progress_hub.unsubscribe(subscription)
+
+ASYNC_TOOL_MAPPING = {
+    "start_pomodoro": start_pomodoro,
+    "get_remaining_time": get_remaining_time,
+    "stop_pomodoro": stop_pomodoro,
+    "pause_pomodoro": pause_pomodoro,
+    "resume_pomodoro": resume_pomodoro,
+    "get_session_statistics": get_session_statistics,
+    "start_cycle": start_cycle,
+}
+
+async def call_tool(tool_name: str, tool_input: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Versi async tools.call_tool (validasi sama, tool async)
+    Args:
+        tool_name (str): Nama tool yang dipanggil
+        tool_input (Dict): Parameter tool
+    Returns:
+        Dict hasil tool, atau {"error": ...}
+    """
+    tool = ASYNC_TOOL_MAPPING.get(tool_name)
+    if tool is None:
+        # Tool tanpa versi async (atau tidak dikenal) langsung ke versi sync, semuanya non-blocking
+        return tools.call_tool(tool_name, tool_input)
+
+    error = tools.TOOL_VALIDATORS[tool_name](tool_input)
+    if error is not None:
+        return {"error": error}
+
+    try:
+        return await tool(**tool_input)
+    except Exception as e:
+        return {"error": str(e)}
+
+async def execute_tool(tool_name: str, tool_input: Dict[str, Any]) -> str:
+    """
+    Versi async tools.execute_tool
+    Args:
+        tool_name (str): Nama tool yang dipanggil
+        tool_input (Dict): Parameter tool
+    Returns:
+        JSON string dengan hasil tool (format sama dengan versi sync)
+    """
+    result = await call_tool(tool_name, tool_input)
+    if "error" in result:
+        return json.dumps(result, ensure_ascii=False)
+    return json.dumps(result, indent=2, ensure_ascii=False)
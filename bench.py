@@ -0,0 +1,324 @@
+"""
+Micro-benchmark untuk hot path Pomodoro Timer
+parse_command, get_response, get_remaining_time, execute_tool, get_session_statistics
+(history 10 - 10 juta session), dan cold import main.py. Hasil dalam JSON; bisa dibandingkan
+dengan baseline tersimpan, exit code 1 jika ada benchmark yang lebih lambat dari threshold
+
+    python bench.py --save-baseline bench_baseline.json
+    python bench.py --baseline bench_baseline.json --threshold 0.25 --output bench.json
+    python bench.py --import-budget            # CI: cold import main.py harus di bawah budget
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import assistant
+import tools
+from columnar import ColumnarHistory, STATUS_CODES
+from stats import SessionAggregates
+
+RESULTS_VERSION = 1
+HISTORY_SIZES = (10, 1_000, 100_000, 1_000_000, 10_000_000)
+HISTORY_SPAN_DAYS = 3650       # history fixture tersebar di 10 tahun terakhir
+STATS_SAMPLE = 100_000         # aggregates fixture dibangun dari sample ini lalu di-merge sampai n
+DEFAULT_THRESHOLD = 0.25       # regresi jika lebih lambat > 25% dari baseline
+REPEAT = 5
+IMPORT_REPEAT = 7
+IMPORT_BUDGET_MS = 30          # budget cold import main.py (waktu sampai prompt pertama)
+BENCH_USER = "bench"
+
+# Input REPL campuran Indonesia/Inggris, termasuk typo dan kalimat tanpa intent
+CORPUS = (
+    "mulai 25", "start 50 menit", "mulai timer 15", "tolong mulaikan pomodoro 30 menit ya",
+    "start", "run 45", "begin a 20 minute session", "timer 90",
+    "berapa sisa waktu?", "sisa", "time", "how much time remaining", "progress dong",
+    "pause", "jeda dulu", "istirahat sebentar", "resume", "lanjut", "lanjutkan", "continue please", "go",
+    "stop", "hentikan", "berhenti sekarang", "halt",
+    "motivasi", "kasih semangat dong", "inspire me",
+    "stats", "statistik minggu ini", "summary",
+    "help", "bantuan", "?",
+    "siklus 4", "auto cycle", "fase", "phase sekarang apa",
+    "riwayat 2024-05-01", "timeline 2024-05-01 09:00 12:00", "pukul 10:30", "history kemarin",
+    "halo", "apa kabar", "terima kasih", "asdfgh", "",
+)
+
+# FIXTURES
+def history_fixture(size: int, now: Optional[float] = None) -> Tuple[ColumnarHistory, SessionAggregates]:
+    """
+    History dan aggregates untuk size session, tersebar rata di HISTORY_SPAN_DAYS terakhir
+    History berisi semua row; aggregates dibangun dari sample lalu di-merge sampai tepat size
+    session (bucket dan sketch sama bentuknya, total exact), agar 10 juta session tidak perlu
+    stats.add satu per satu
+    Args:
+        size (int): Jumlah session
+        now (float): Epoch session terakhir (None = sekarang)
+    Returns:
+        (ColumnarHistory, SessionAggregates)
+    """
+    now = time.time() if now is None else now
+    step = HISTORY_SPAN_DAYS * 86400 / size
+    first = now - step * size
+    completed, stopped = STATUS_CODES["completed"], STATUS_CODES["stopped"]
+
+    history = ColumnarHistory()
+    append_row = history.append_row
+    for i in range(size):
+        minutes = 5 + i % 46
+        append_row(first + i * step, 25, minutes, stopped if i % 7 == 0 else completed)
+
+    sample_size = min(size, STATS_SAMPLE)
+    stride = size // sample_size
+
+    def build(count: int) -> SessionAggregates:
+        aggregates = SessionAggregates()
+        for row in range(0, count * stride, stride):
+            timestamp, requested, minutes, status = history.row(row)
+            aggregates.add({
+                "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+                "duration_requested": requested,
+                "duration_completed": minutes,
+                "status": "stopped" if status == stopped else "completed",
+            })
+        return aggregates
+
+    stats = build(sample_size)
+    sample = stats.copy()
+    for _ in range(size // sample_size - 1):
+        stats.merge(sample)
+    if size % sample_size:
+        stats.merge(build(size % sample_size))
+    return history, stats
+
+def install_fixture(user_id: str, history: ColumnarHistory, stats: SessionAggregates) -> None:
+    """Pasang history dan aggregates ke session user di registry tools"""
+    with tools.registry.session(user_id) as state:
+        state.history = history
+        state.stats = stats
+        state.time_index = None
+
+# BENCHMARKS
+Benchmark = Tuple[str, Callable[[], Any], int]  # (nama, fungsi, jumlah operasi per panggilan)
+
+def core_benchmarks() -> Iterator[Benchmark]:
+    """Benchmark REPL/tool tanpa fixture besar"""
+    local = assistant.create_assistant(seed=0)
+    parse = local.parse_command
+
+    def parse_corpus() -> None:
+        for text in CORPUS:
+            parse(text)
+
+    def parse_corpus_cold() -> None:
+        assistant._parse.cache_clear()
+        for text in CORPUS:
+            parse(text)
+
+    yield "parse_command", parse_corpus, len(CORPUS)
+    yield "parse_command_uncached", parse_corpus_cold, len(CORPUS)
+    yield "get_response_start", lambda: local.get_response("start", duration=25), 1
+    yield "get_response_check_time", lambda: local.get_response(
+        "check_time", formatted="12:34", percentage=50, progress_bar=tools.PROGRESS_BARS[50]), 1
+    yield "get_response_unknown", lambda: local.get_response("unknown"), 1
+
+    timer_user = BENCH_USER + "-timer"
+    tools.start_pomodoro(25, timer_user)
+    yield "get_remaining_time", lambda: tools.get_remaining_time(timer_user), 1
+    tool_input = {"user_id": timer_user}
+    yield "execute_tool_remaining", lambda: tools.execute_tool("get_remaining_time", tool_input), 1
+    yield "execute_tool_invalid", lambda: tools.execute_tool("start_pomodoro", {"duration_minutes": "x"}), 1
+
+STATS_BENCHMARKS = ("get_session_statistics", "get_session_statistics_period", "get_session_statistics_range",
+                    "execute_tool_statistics")
+
+def stats_benchmarks(sizes: Iterable[int], selected: Optional[str] = None) -> Iterator[Benchmark]:
+    """get_session_statistics untuk setiap ukuran history (fixture dibuat sekali per ukuran, jika dipilih)"""
+    for size in sizes:
+        if selected is not None and not any(selected in f"{name}[{size}]" for name in STATS_BENCHMARKS):
+            continue
+        user_id = f"{BENCH_USER}-{size}"
+        install_fixture(user_id, *history_fixture(size))
+        recent = datetime.fromtimestamp(time.time() - 30 * 86400).isoformat()
+        yield f"get_session_statistics[{size}]", lambda u=user_id: tools.get_session_statistics(u), 1
+        yield f"get_session_statistics_period[{size}]", \
+            lambda u=user_id: tools.get_session_statistics(u, period="day", include_history=True), 1
+        yield f"get_session_statistics_range[{size}]", \
+            lambda u=user_id, s=recent: tools.get_session_statistics(u, start=s), 1
+        yield f"execute_tool_statistics[{size}]", \
+            lambda u=user_id: tools.execute_tool("get_session_statistics", {"user_id": u, "period": "month"}), 1
+        with tools.registry.session(user_id) as state:
+            # Lepas fixture sebelum ukuran berikutnya (10 juta row ~130 MB)
+            state.history = ColumnarHistory()
+            state.stats = SessionAggregates()
+
+def measure(func: Callable[[], Any], ops: int, repeat: int = REPEAT) -> Dict[str, Any]:
+    """
+    Jalankan func berulang (jumlah iterasi dikalibrasi timeit.autorange, minimal ~0.2 detik)
+    Returns:
+        Dict per_op_us (minimum, dipakai untuk perbandingan), median_us, number, repeat
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    timings = [elapsed / (number * ops) for elapsed in timer.repeat(repeat, number)]
+    return {
+        "per_op_us": round(min(timings) * 1e6, 4),
+        "median_us": round(statistics.median(timings) * 1e6, 4),
+        "number": number * ops,
+        "repeat": repeat,
+    }
+
+def measure_import(module: str = "main", repeat: int = IMPORT_REPEAT) -> Dict[str, Any]:
+    """
+    Cold import module di interpreter baru (dikurangi waktu start interpreter kosong)
+    Returns:
+        Dict per_op_us, median_us, interpreter_us
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    def run(code: str) -> List[float]:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], cwd=here, check=True)
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    interpreter = min(run("pass"))
+    timings = [max(elapsed - interpreter, 0.0) for elapsed in run(f"import {module}")]
+    return {
+        "per_op_us": round(min(timings) * 1e6, 1),
+        "median_us": round(statistics.median(timings) * 1e6, 1),
+        "interpreter_us": round(interpreter * 1e6, 1),
+        "number": repeat,
+        "repeat": 1,
+    }
+
+def run_benchmarks(sizes: Iterable[int], selected: Optional[str] = None, repeat: int = REPEAT,
+                   log: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Jalankan semua benchmark
+    Args:
+        sizes (Iterable[int]): Ukuran history untuk get_session_statistics
+        selected (str): Hanya benchmark yang namanya mengandung substring ini
+        repeat (int): Jumlah pengulangan per benchmark
+        log (Callable): Dipanggil dengan satu baris progress per benchmark
+    Returns:
+        Dict version, meta, results
+    """
+    results = {}
+
+    def record(name: str, result: Dict[str, Any]) -> None:
+        results[name] = result
+        if log is not None:
+            log(f"{name:<44} {result['per_op_us']:>14.3f} us/op")
+
+    try:
+        for name, func, ops in core_benchmarks():
+            if selected is None or selected in name:
+                record(name, measure(func, ops, repeat))
+        for name, func, ops in stats_benchmarks(sizes, selected):
+            if selected is None or selected in name:
+                record(name, measure(func, ops, repeat))
+    finally:
+        tools.stop_pomodoro(BENCH_USER + "-timer")
+    if selected is None or selected in "import_main":
+        record("import_main", measure_import())
+
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+# BASELINE COMPARISON
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Bandingkan per_op_us dengan baseline
+    Args:
+        current (Dict): Hasil run_benchmarks
+        baseline (Dict): Hasil run_benchmarks tersimpan
+        threshold (float): Kenaikan relatif maksimal (0.25 = 25% lebih lambat)
+    Returns:
+        List per benchmark yang ada di keduanya: name, baseline_us, current_us, ratio, regressed
+    """
+    rows = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None or not previous["per_op_us"]:
+            continue
+        ratio = result["per_op_us"] / previous["per_op_us"]
+        rows.append({
+            "name": name,
+            "baseline_us": previous["per_op_us"],
+            "current_us": result["per_op_us"],
+            "ratio": round(ratio, 3),
+            "regressed": ratio > 1 + threshold,
+        })
+    return rows
+
+def main() -> None:
+    """Entry point CLI"""
+    parser = argparse.ArgumentParser(description="Micro-benchmark Pomodoro Timer")
+    parser.add_argument("--sizes", type=lambda text: [int(size) for size in text.split(",")], default=list(HISTORY_SIZES),
+                        help="Ukuran history, dipisah koma (default: 10,1000,100000,1000000,10000000)")
+    parser.add_argument("--filter", help="Hanya benchmark yang namanya mengandung teks ini")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Pengulangan per benchmark")
+    parser.add_argument("--output", help="Tulis hasil JSON ke file (default: stdout)")
+    parser.add_argument("--baseline", help="Bandingkan dengan file hasil sebelumnya")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Regresi relatif maksimal (default: 0.25)")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Simpan hasil sebagai baseline baru")
+    parser.add_argument("--import-budget", type=float, nargs="?", const=IMPORT_BUDGET_MS, metavar="MS",
+                        help=f"Hanya cek cold import main.py terhadap budget (default: {IMPORT_BUDGET_MS} ms)")
+    args = parser.parse_args()
+
+    if args.import_budget is not None:
+        result = measure_import()
+        elapsed_ms = result["per_op_us"] / 1000
+        within = elapsed_ms <= args.import_budget
+        print(f"{'✅' if within else '❌'} import main: {elapsed_ms:.1f} ms (median {result['median_us'] / 1000:.1f} ms, "
+              f"budget {args.import_budget:g} ms)", file=sys.stderr)
+        if not within:
+            sys.exit(1)
+        return
+
+    results = run_benchmarks(args.sizes, args.filter, args.repeat, log=lambda line: print(line, file=sys.stderr))
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    elif not args.save_baseline:
+        print(output)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.threshold)
+        for row in rows:
+            marker = "❌" if row["regressed"] else "✅"
+            print(f"{marker} {row['name']:<44} {row['baseline_us']:>12.3f} -> {row['current_us']:>12.3f} us  x{row['ratio']}",
+                  file=sys.stderr)
+        regressed = [row["name"] for row in rows if row["regressed"]]
+        if regressed:
+            print(f"Regresi > {args.threshold:.0%}: {', '.join(regressed)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Client tipis untuk daemon Pomodoro (python main.py --daemon)
+Sengaja hanya import os, sys, dan _socket agar satu perintah selesai dalam beberapa milidetik
+Pakai: python -S client.py [--user NAMA] time | start [menit] | pause | resume | stop | stats | cycle [sesi] | phase
+"""
+
+import os
+import sys
+import _socket
+
+COMMANDS = {
+    "time": "get_remaining_time",
+    "start": "start_pomodoro",
+    "pause": "pause_pomodoro",
+    "resume": "resume_pomodoro",
+    "stop": "stop_pomodoro",
+    "stats": "get_session_statistics",
+    "cycle": "start_cycle",
+    "phase": "get_cycle_status",
+}
+
+def socket_path() -> str:
+    """Path socket daemon (sama dengan config.DAEMON_SOCKET, tanpa import config)"""
+    path = os.environ.get("POMODORO_SOCKET")
+    if path:
+        return path
+    home = os.environ.get("POMODORO_HOME") or os.path.join(os.path.expanduser("~"), ".pomodoro")
+    return os.path.join(home, "pomodoro.sock")
+
+def _json_string(text: str) -> str:
+    """Encode string sebagai JSON string (tanpa import json)"""
+    if any(ord(char) < 0x20 for char in text):
+        raise ValueError("Karakter kontrol tidak diizinkan")
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def build_request(command: str, args: list, user_id: str = None) -> str:
+    """
+    Buat satu baris request JSON dengan reply teks
+    Args:
+        command (str): Perintah client (lihat COMMANDS)
+        args (list): Argumen tambahan (durasi untuk start, jumlah sesi untuk cycle)
+        user_id (str): ID user (opsional)
+    Returns:
+        str: Baris request
+    """
+    fields = []
+    if command == "start":
+        duration = args[0] if args else "25"
+        if not duration.isdigit():
+            raise ValueError(f"Durasi harus angka: {duration}")
+        fields.append(f'"duration_minutes":{int(duration)}')
+    if command == "cycle" and args:
+        if not args[0].isdigit():
+            raise ValueError(f"Jumlah sesi harus angka: {args[0]}")
+        fields.append(f'"sessions":{int(args[0])}')
+    if user_id:
+        fields.append(f'"user_id":{_json_string(user_id)}')
+    return f'{{"name":"{COMMANDS[command]}","input":{{{",".join(fields)}}},"reply":"text"}}\n'
+
+def send(line: str, path: str) -> str:
+    """
+    Kirim satu request ke daemon dan tunggu satu baris response
+    Args:
+        line (str): Baris request
+        path (str): Path socket daemon
+    Returns:
+        str: Baris response (tanpa newline)
+    """
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        sock.sendall(line.encode("utf-8"))
+        chunks = []
+        while True:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b"\n"):
+                break
+        return b"".join(chunks).decode("utf-8").rstrip("\n")
+    finally:
+        sock.close()
+
+def main(argv: list) -> int:
+    """Entry point client, return exit code"""
+    user_id = os.environ.get("POMODORO_USER")
+    if len(argv) >= 2 and argv[0] == "--user":
+        user_id, argv = argv[1], argv[2:]
+    if not argv or argv[0] not in COMMANDS:
+        sys.stderr.write(f"Pakai: client.py [--user NAMA] {{{'|'.join(COMMANDS)}}} [menit|sesi]\n")
+        return 2
+
+    try:
+        line = build_request(argv[0], argv[1:], user_id)
+    except ValueError as e:
+        sys.stderr.write(f"❌ {e}\n")
+        return 2
+
+    path = socket_path()
+    try:
+        response = send(line, path)
+    except OSError:
+        sys.stderr.write(f"❌ Daemon tidak berjalan ({path}). Jalankan: python main.py --daemon\n")
+        return 1
+    sys.stdout.write(response + "\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,64 @@
+"""
+Sumber waktu yang bisa diganti (injectable clock)
+SystemClock = jam sistem; SimulatedClock = jam virtual yang hanya maju saat digerakkan
+(dipakai bersama scheduler.SimulatedScheduler yang melompat langsung ke deadline berikutnya)
+"""
+
+import time
+from datetime import datetime
+from typing import Optional
+
+# SYSTEM CLOCK
+class SystemClock:
+    """Jam sistem: monotonic untuk deadline, wall clock untuk timestamp history"""
+    __slots__ = ()
+
+    @staticmethod
+    def monotonic_ns() -> int:
+        """Waktu monotonic (nanodetik) untuk deadline timer"""
+        return time.monotonic_ns()
+
+    @staticmethod
+    def time() -> float:
+        """Epoch detik (wall clock)"""
+        return time.time()
+
+    @staticmethod
+    def now() -> datetime:
+        """Waktu lokal sekarang"""
+        return datetime.now()
+
+# SIMULATED CLOCK
+class SimulatedClock:
+    """
+    Jam virtual (deterministik): waktu hanya maju lewat advance/advance_to
+    monotonic_ns dimulai dari 0; wall clock = start + monotonic
+    """
+    __slots__ = ("_start", "_ns")
+
+    def __init__(self, start: Optional[float] = None):
+        """
+        Args:
+            start (float): Epoch awal simulasi (None = sekarang)
+        """
+        self._start = time.time() if start is None else start
+        self._ns = 0
+
+    def monotonic_ns(self) -> int:
+        return self._ns
+
+    def time(self) -> float:
+        return self._start + self._ns / 1e9
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.time())
+
+    def advance(self, delta_ns: int) -> None:
+        """Majukan jam sebanyak delta_ns (negatif diabaikan)"""
+        if delta_ns > 0:
+            self._ns += delta_ns
+
+    def advance_to(self, monotonic_ns: int) -> None:
+        """Majukan jam ke monotonic_ns (tidak pernah mundur)"""
+        if monotonic_ns > self._ns:
+            self._ns = monotonic_ns
@@ -0,0 +1,319 @@
+"""
+Columnar session history (typed array per kolom)
+Satu row = epoch timestamp + durasi requested/completed + status code (13 byte)
+File on-disk bisa dibuka via mmap tanpa parsing
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsional, fallback ke array + builtin
+    np = None
+
+# Status di-intern jadi kode 1 byte
+STATUS_NAMES = ("completed", "stopped")
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+# (nama kolom, typecode array)
+COLUMNS = (
+    ("timestamp", "d"),   # epoch detik
+    ("requested", "H"),   # menit
+    ("completed", "H"),   # menit
+    ("status", "B"),      # STATUS_CODES
+)
+
+ROW_SIZE = sum(array(code).itemsize for _, code in COLUMNS)
+MAX_MINUTES = 0xFFFF  # batas kolom requested/completed (uint16)
+
+FILE_MAGIC = b"PMCH"
+FILE_VERSION = 1
+_HEADER = struct.Struct("<4sHHQ")  # magic, version, jumlah kolom, jumlah row
+
+def _aligned(size: int) -> int:
+    """Bulatkan ke kelipatan 8 byte"""
+    return (size + 7) & ~7
+
+def to_epoch(timestamp: str) -> float:
+    """Timestamp ISO (local time) -> epoch detik"""
+    return datetime.fromisoformat(timestamp).timestamp()
+
+def check_row(requested: int, completed: int, status: int) -> None:
+    """
+    Validasi satu row sebelum disimpan ke kolom
+    Raises:
+        ValueError: Durasi di luar 0-MAX_MINUTES atau status code tidak dikenal
+    """
+    if not 0 <= requested <= MAX_MINUTES or not 0 <= completed <= MAX_MINUTES:
+        raise ValueError(f"Durasi session harus 0-{MAX_MINUTES} menit (requested={requested}, completed={completed})")
+    if not 0 <= status < len(STATUS_NAMES):
+        raise ValueError(f"Status code tidak dikenal: {status}")
+
+# COLUMNAR HISTORY
+class ColumnarHistory:
+    """
+    History session dalam bentuk kolom
+    Row lama bisa berasal dari file mmap (read-only), row baru di-append ke array.
+    Row diasumsikan di-append urut waktu sehingga range query cukup bisect.
+    """
+
+    def __init__(self):
+        """History kosong (tanpa file)"""
+        self._base: Dict[str, memoryview] = {}
+        self._base_rows = 0
+        self._mmap: Optional[mmap.mmap] = None
+        self._tail: Dict[str, array] = {name: array(code) for name, code in COLUMNS}
+
+    @classmethod
+    def open(cls, path: str) -> "ColumnarHistory":
+        """
+        Buka file columnar via mmap (instant, tidak membaca semua data)
+        Args:
+            path (str): Path file dari save()
+        Returns:
+            ColumnarHistory dengan row dari file sebagai base read-only
+        """
+        history = cls()
+        with open(path, "rb") as f:
+            magic, version, column_count, rows = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != FILE_MAGIC or version != FILE_VERSION or column_count != len(COLUMNS):
+                raise ValueError(f"Format file history tidak dikenal: {path}")
+            if rows:
+                history._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if rows:
+            view = memoryview(history._mmap)
+            offset = _aligned(_HEADER.size)
+            for name, code in COLUMNS:
+                size = rows * array(code).itemsize
+                history._base[name] = view[offset:offset + size].cast(code)
+                offset += _aligned(size)
+        history._base_rows = rows
+        return history
+
+    def save(self, path: str) -> None:
+        """
+        Tulis semua row ke file (atomic via rename, di-fsync)
+        Args:
+            path (str): Path file tujuan
+        """
+        rows = len(self)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(FILE_MAGIC, FILE_VERSION, len(COLUMNS), rows).ljust(_aligned(_HEADER.size), b"\0"))
+            for name, code in COLUMNS:
+                written = 0
+                for segment in self._segments(name, 0, rows):
+                    f.write(segment)
+                    written += len(segment) * array(code).itemsize
+                f.write(b"\0" * (_aligned(written) - written))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    # APPEND
+    def append(self, entry: Dict[str, Any]) -> None:
+        """
+        Tambahkan satu entry history (format dict tools.py)
+        Args:
+            entry (Dict): timestamp ISO, duration_requested, duration_completed, status
+        """
+        self.append_row(
+            to_epoch(entry["timestamp"]),
+            entry["duration_requested"],
+            entry["duration_completed"],
+            STATUS_CODES[entry["status"]]
+        )
+
+    def append_row(self, timestamp: float, requested: int, completed: int, status: int) -> None:
+        """
+        Tambahkan satu row dalam bentuk kolom mentah
+        Semua nilai dicek dulu sehingga row yang ditolak tidak meninggalkan kolom yang tidak sejajar
+        Raises:
+            ValueError: Durasi di luar 0-MAX_MINUTES atau status code tidak dikenal
+        """
+        check_row(requested, completed, status)
+        tail = self._tail
+        tail["timestamp"].append(timestamp)
+        tail["requested"].append(requested)
+        tail["completed"].append(completed)
+        tail["status"].append(status)
+
+    def __len__(self) -> int:
+        return self._base_rows + len(self._tail["timestamp"])
+
+    def tail(self, start: int) -> "ColumnarHistory":
+        """
+        History baru berisi row [start, len) (untuk eviction)
+        Bagian mmap di-slice tanpa copy, bagian array di-copy; objek lama tidak berubah
+        Args:
+            start (int): Index row pertama yang dipertahankan
+        Returns:
+            ColumnarHistory
+        """
+        history = ColumnarHistory()
+        start = min(max(start, 0), len(self))
+        base_rows = self._base_rows
+        if start < base_rows:
+            history._mmap = self._mmap
+            history._base = {name: view[start:] for name, view in self._base.items()}
+            history._base_rows = base_rows - start
+        history._tail = {name: values[max(start - base_rows, 0):] for name, values in self._tail.items()}
+        return history
+
+    @property
+    def mapped_rows(self) -> int:
+        """Jumlah row dari file mmap (row [0, mapped_rows)), sisanya di array heap"""
+        return self._base_rows
+
+    def memory_usage(self) -> int:
+        """
+        Byte row di heap (array tail) untuk memory budget
+        Row mmap tidak dihitung: di-back oleh file (page cache), dan tail() atas row mmap
+        tetap memakai mapping yang sama sehingga eviction-nya tidak membebaskan apa pun
+        """
+        return len(self._tail["timestamp"]) * ROW_SIZE
+
+    # READ
+    def row(self, index: int) -> Tuple[float, int, int, int]:
+        """Satu row mentah (timestamp, requested, completed, status)"""
+        if index < 0:
+            index += len(self)
+        if index < self._base_rows:
+            source, position = self._base, index
+        else:
+            source, position = self._tail, index - self._base_rows
+        return tuple(source[name][position] for name, _ in COLUMNS)
+
+    def entry(self, index: int) -> Dict[str, Any]:
+        """Satu row dalam format dict tools.py"""
+        return row_entry(*self.row(index))
+
+    def entries(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Row [start, stop) dalam format dict tools.py
+        Args:
+            start (int): Index awal
+            stop (int): Index akhir (exclusive), default sampai akhir
+        Returns:
+            List of entry dict
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        return [row_entry(*self.row(i)) for i in range(max(start, 0), stop)]
+
+    def iter_rows(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[float, int, int, int]]:
+        """Iterasi row mentah [start, stop) (zip kolom per segment, tanpa lookup per index)"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        segments = [self._segments(name, max(start, 0), stop) for name, _ in COLUMNS]
+        for columns in zip(*segments):
+            yield from zip(*columns)
+
+    # QUERIES
+    def index_range(self, start_ts: Optional[float] = None, end_ts: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Range index row dengan start_ts <= timestamp < end_ts (bisect, O(log n))
+        Args:
+            start_ts (float): Epoch awal (None = dari awal)
+            end_ts (float): Epoch akhir exclusive (None = sampai akhir)
+        Returns:
+            (lo, hi) untuk dipakai di query lain
+        """
+        lo = 0 if start_ts is None else self._bisect(start_ts)
+        hi = len(self) if end_ts is None else self._bisect(end_ts)
+        return lo, max(lo, hi)
+
+    def total(self, column: str, lo: int = 0, hi: Optional[int] = None) -> int:
+        """Jumlah nilai kolom di range [lo, hi)"""
+        hi = len(self) if hi is None else hi
+        if np is not None:
+            return int(self._numpy(column, lo, hi).sum())
+        return sum(sum(segment) for segment in self._segments(column, lo, hi))
+
+    def maximum(self, column: str, lo: int = 0, hi: Optional[int] = None) -> int:
+        """Nilai terbesar kolom di range [lo, hi) (0 jika kosong)"""
+        hi = len(self) if hi is None else hi
+        return max((max(segment) for segment in self._segments(column, lo, hi) if len(segment)), default=0)
+
+    def status_count(self, status: str, lo: int = 0, hi: Optional[int] = None) -> int:
+        """Jumlah row dengan status tertentu di range [lo, hi)"""
+        hi = len(self) if hi is None else hi
+        code = bytes((STATUS_CODES[status],))
+        return sum(segment.tobytes().count(code) for segment in self._segments("status", lo, hi))
+
+    def percentile(self, column: str, q: float, lo: int = 0, hi: Optional[int] = None) -> float:
+        """
+        Percentile (linear interpolation) kolom di range [lo, hi)
+        Args:
+            column (str): Nama kolom
+            q (float): Percentile 0-100
+        Returns:
+            float (0.0 jika range kosong)
+        """
+        hi = len(self) if hi is None else hi
+        if hi <= lo:
+            return 0.0
+        if np is not None:
+            return float(np.percentile(self._numpy(column, lo, hi), q))
+        values = sorted(value for segment in self._segments(column, lo, hi) for value in segment)
+        position = (len(values) - 1) * q / 100
+        below = int(position)
+        above = min(below + 1, len(values) - 1)
+        return values[below] + (values[above] - values[below]) * (position - below)
+
+    def summary(self, lo: int = 0, hi: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Ringkasan statistik untuk range [lo, hi)
+        Returns:
+            Dict sessions, total/requested minutes, completed/stopped, average/median/p90
+        """
+        hi = len(self) if hi is None else hi
+        sessions = max(hi - lo, 0)
+        total_minutes = self.total("completed", lo, hi)
+        return {
+            "sessions": sessions,
+            "total_minutes": total_minutes,
+            "requested_minutes": self.total("requested", lo, hi),
+            "completed_sessions": self.status_count("completed", lo, hi),
+            "stopped_sessions": self.status_count("stopped", lo, hi),
+            "average_minutes": round(total_minutes / sessions, 2) if sessions else 0.0,
+            "median_minutes": self.percentile("completed", 50, lo, hi),
+            "p90_minutes": self.percentile("completed", 90, lo, hi),
+        }
+
+    # INTERNAL
+    def _segments(self, column: str, lo: int, hi: int) -> Iterator[Any]:
+        """Potongan kolom (memoryview base + array tail) yang menutupi [lo, hi)"""
+        base_rows = self._base_rows
+        if lo < base_rows:
+            yield self._base[column][lo:min(hi, base_rows)]
+        if hi > base_rows:
+            yield self._tail[column][max(lo - base_rows, 0):hi - base_rows]
+
+    def _numpy(self, column: str, lo: int, hi: int) -> Any:
+        """Kolom [lo, hi) sebagai numpy array (tanpa copy untuk bagian mmap)"""
+        parts = [np.frombuffer(segment, dtype=segment.typecode if isinstance(segment, array) else segment.format)
+                 for segment in self._segments(column, lo, hi)]
+        if not parts:
+            return np.empty(0)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def _bisect(self, value: float) -> int:
+        """Index row pertama dengan timestamp >= value (base dulu, lalu tail)"""
+        base_rows = self._base_rows
+        if base_rows and value <= self._base["timestamp"][base_rows - 1]:
+            return bisect_left(self._base["timestamp"], value)
+        return base_rows + bisect_left(self._tail["timestamp"], value)
+
+def row_entry(timestamp: float, requested: int, completed: int, status: int) -> Dict[str, Any]:
+    """Row mentah -> entry dict tools.py"""
+    return {
+        "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+        "duration_requested": requested,
+        "duration_completed": completed,
+        "status": STATUS_NAMES[status]
+    }
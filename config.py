@@ -2,11 +2,40 @@
 Konfigurasi global untuk Pomodoro Timer
 """
 
+import os
+
 # Pomodoro Constants
 POMODORO_DURATION = 25  # minutes
 SHORT_BREAK = 5         # minutes
 LONG_BREAK = 15         # minutes
 SESSIONS_UNTIL_LONG_BREAK = 4
+MAX_TIMER_MINUTES = 24 * 60  # durasi timer maksimal (history menyimpan menit sebagai uint16)
+
+# Multi-user
+DEFAULT_USER_ID = "local"  # user_id jika tool dipanggil tanpa user_id
+
+# Persistent History
+HISTORY_DIR = os.environ.get("POMODORO_HOME", os.path.join(os.path.expanduser("~"), ".pomodoro"))
+HISTORY_KEEP_LOGS = os.environ.get("POMODORO_KEEP_LOGS") == "1"  # simpan log lama setelah snapshot (untuk --analyze)
+
+# Retention history: row detail hanya untuk N session / D hari terakhir per user,
+# row lama tetap dihitung di statistik (rollup harian/bulanan); kosong/0 = tanpa batas
+HISTORY_KEEP_SESSIONS = int(os.environ.get("POMODORO_KEEP_SESSIONS", "10000")) or None
+HISTORY_KEEP_DAYS = float(os.environ.get("POMODORO_KEEP_DAYS", "0")) or None
+HISTORY_MEMORY_BUDGET = int(float(os.environ.get("POMODORO_MEMORY_BUDGET_MB", "64")) * 1024 * 1024) or None  # byte, semua user
+
+# Daemon (Unix domain socket)
+DAEMON_SOCKET = os.environ.get("POMODORO_SOCKET", os.path.join(HISTORY_DIR, "pomodoro.sock"))
+
+# Instrumentasi latency (bisa dinyalakan saat runtime lewat 'perf on')
+METRICS_ENABLED = os.environ.get("POMODORO_METRICS") == "1"
+PROFILE_COMMANDS = 20  # default 'perf profile': jumlah command yang di-profile
+PROFILE_PATH = os.path.join(HISTORY_DIR, "profile.pstats")
+
+# Notifikasi tambahan (selain terminal bell), kosong = nonaktif
+NOTIFY_COMMAND = os.environ.get("POMODORO_NOTIFY_COMMAND")  # mis. "notify-send Pomodoro {message}"
+NOTIFY_FILE = os.environ.get("POMODORO_NOTIFY_FILE")        # append event JSON Lines
+NOTIFY_WEBHOOK = os.environ.get("POMODORO_NOTIFY_WEBHOOK")  # http://127.0.0.1:PORT/... atau unix:///path.sock
 
 # Terminal Colors & Styling
 class Colors:
@@ -23,6 +52,15 @@ class Colors:
     # Background colors
     BG_GREEN = '\033[102m'
     BG_BLACK = '\033[100m'
+    
+    # Cursor addressing (live dashboard)
+    SAVE_CURSOR = '\0337'
+    RESTORE_CURSOR = '\0338'
+    CURSOR_TO = '\033[{row};{col}H'        # format(row=..., col=...), 1-based
+    CLEAR_TO_EOL = '\033[K'
+    CLEAR_SCREEN = '\033[2J\033[H'
+    SCROLL_REGION = '\033[{top};{bottom}r'  # format(top=..., bottom=...)
+    RESET_SCROLL_REGION = '\033[r'
 
 # AI Responses (Simple Rule-Based)
 RESPONSES = {
@@ -32,6 +70,11 @@ RESPONSES = {
         "⏱️  {duration} menit dimulai. Saatnya produktif! 🔥"
     ],
     
+    "cycle": [
+        "🔁  Siklus {sessions} sesi dimulai! Break berjalan otomatis, total {total_minutes} menit. 💪",
+        "🔁  {sessions} sesi fokus + break otomatis. Ayo mulai! 🚀"
+    ],
+    
     "check_time": [
         "⏱️  Sisa: {formatted} ({percentage}%)",
         "📊  Progress: {formatted} | {progress_bar}",
@@ -59,7 +102,8 @@ RESPONSES = {
     "stats": [
         "📊  Statistik Anda:\n   Total: {total_sessions} sessions\n   Waktu: {total_minutes} menit ({total_hours}j)\n   Impresif! 🔥",
         "📈  Performa Harian:\n   Sessions: {total_sessions}\n   Total: {total_minutes} menit\n   Keep it up! 💪",
-        "🏆  Ringkasan:\n   {total_sessions} sesi selesai\n   {total_minutes} menit produktif\n   Excellent work! 👍"
+        "🏆  Ringkasan:\n   {total_sessions} sesi selesai\n   {total_minutes} menit produktif\n   Excellent work! 👍",
+        "🔥  Streak {current_streak} hari!\n   {total_sessions} sesi, {total_minutes} menit\n   Median sesi {median_minutes} menit, completion {completion_percent}%"
     ],
     
     "error_no_timer": [
@@ -83,11 +127,15 @@ WELCOME_MESSAGE = f"""\n{Colors.BG_GREEN}{Colors.BOLD}{'':^60}{Colors.RESET}
 
 AVAILABLE_COMMANDS = f"""{Colors.MAGENTA}📌 Perintah yang bisa diberikan:{Colors.RESET}
   • 'Mulai pomodoro 25 menit' atau 'start 25' - Mulai timer
+  • 'Siklus 4' - Siklus otomatis fokus + break
+  • 'Fase' - Cek fase siklus
   • 'Berapa sisa?' atau 'time' - Cek sisa waktu
   • 'Pause' - Pause timer
   • 'Resume' - Lanjut timer
   • 'Stop' - Hentikan timer
   • 'Motivasi' - Minta motivasi
   • 'Stats' - Lihat statistik
+  • 'Perf' / 'Perf on|off|reset|profile 20' - Latency per command
+  • 'Riwayat 09:00 12:00' / 'Pukul 10:30' - Timeline session
   • 'Help' - Bantuan
   • 'Exit' - Keluar\n"""
@@ -0,0 +1,119 @@
+"""
+Cycle engine Pomodoro: fokus -> short break -> ... -> long break
+Timeline satu run dihitung sekali di awal sebagai array batas fase (offset nanodetik),
+pertanyaan "fase sekarang / fase berikutnya / kapan long break" dijawab dengan bisect
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Optional
+from config import POMODORO_DURATION, SHORT_BREAK, LONG_BREAK, SESSIONS_UNTIL_LONG_BREAK
+
+PHASE_FOCUS = 0
+PHASE_SHORT_BREAK = 1
+PHASE_LONG_BREAK = 2
+PHASE_NAMES = ("focus", "short_break", "long_break")
+PHASE_LABELS = ("🎯 Fokus", "☕ Istirahat pendek", "🌴 Istirahat panjang")
+MAX_CYCLE_SESSIONS = 32  # 16 sesi sudah kira-kira satu hari kerja 8 jam
+
+_MINUTE_NS = 60 * 1_000_000_000
+
+# CYCLE PLAN
+class CyclePlan:
+    """
+    Timeline fase satu run (immutable)
+    ends[i] = offset akhir fase i dari awal run, kinds[i] = jenis fase i
+    Pause tidak mengubah plan: offset dihitung dari waktu aktif (pause dikeluarkan)
+    """
+    __slots__ = ("sessions", "kinds", "ends", "long_break_starts")
+
+    def __init__(self, sessions: int, focus_minutes: int = POMODORO_DURATION, short_break: int = SHORT_BREAK,
+                 long_break: int = LONG_BREAK, sessions_until_long_break: int = SESSIONS_UNTIL_LONG_BREAK):
+        """
+        Args:
+            sessions (int): Jumlah sesi fokus dalam run (setiap sesi diikuti break)
+            focus_minutes (int): Durasi fokus dalam menit
+            short_break (int): Durasi short break dalam menit
+            long_break (int): Durasi long break dalam menit
+            sessions_until_long_break (int): Long break setelah sesi ke-n, 2n, ...
+        """
+        self.sessions = sessions
+        self.kinds = array("B")
+        self.ends = array("q")
+        self.long_break_starts = array("q")
+        offset = 0
+        for number in range(1, sessions + 1):
+            offset += focus_minutes * _MINUTE_NS
+            self.kinds.append(PHASE_FOCUS)
+            self.ends.append(offset)
+            if number % sessions_until_long_break == 0:
+                self.long_break_starts.append(offset)
+                offset += long_break * _MINUTE_NS
+                self.kinds.append(PHASE_LONG_BREAK)
+            else:
+                offset += short_break * _MINUTE_NS
+                self.kinds.append(PHASE_SHORT_BREAK)
+            self.ends.append(offset)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    @property
+    def total_ns(self) -> int:
+        """Panjang seluruh run (nanodetik)"""
+        return self.ends[-1] if self.ends else 0
+
+    def start_of(self, index: int) -> int:
+        """Offset awal fase index"""
+        return self.ends[index - 1] if index else 0
+
+    def phase_at(self, offset_ns: int) -> int:
+        """
+        Index fase pada offset tertentu (bisect)
+        Args:
+            offset_ns (int): Waktu aktif sejak awal run (nanodetik)
+        Returns:
+            int: Index fase, len(plan) jika run sudah selesai
+        """
+        return bisect_right(self.ends, offset_ns)
+
+    def focus_before(self, index: int) -> int:
+        """Jumlah sesi fokus yang selesai sebelum fase index (fokus dan break selalu bergantian)"""
+        return (index + 1) // 2
+
+    def status(self, offset_ns: int, index: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Ringkasan posisi dalam run
+        Args:
+            offset_ns (int): Waktu aktif sejak awal run (nanodetik)
+            index (int): Index fase aktif jika sudah diketahui (None = bisect)
+        Returns:
+            Dict dengan phase, phase_remaining, next_phase, time_to_long_break, dll (detik)
+        """
+        if index is None:
+            index = self.phase_at(offset_ns)
+        if index >= len(self.kinds):
+            return {"phase": None, "phase_index": index, "phases_total": len(self.kinds),
+                    "focus_completed": self.sessions, "sessions": self.sessions, "next_phase": None,
+                    "phase_remaining": 0, "time_to_long_break": None, "cycle_remaining": 0}
+
+        # Long break berikutnya: long break yang sedang berjalan dihitung 0
+        position = bisect_left(self.long_break_starts, offset_ns)
+        if self.kinds[index] == PHASE_LONG_BREAK:
+            time_to_long_break = 0
+        elif position < len(self.long_break_starts):
+            time_to_long_break = max(self.long_break_starts[position] - offset_ns, 0) // 1_000_000_000
+        else:
+            time_to_long_break = None
+
+        return {
+            "phase": PHASE_NAMES[self.kinds[index]],
+            "phase_index": index,
+            "phases_total": len(self.kinds),
+            "focus_completed": self.focus_before(index),
+            "sessions": self.sessions,
+            "next_phase": PHASE_NAMES[self.kinds[index + 1]] if index + 1 < len(self.kinds) else None,
+            "phase_remaining": max(self.ends[index] - offset_ns, 0) // 1_000_000_000,
+            "time_to_long_break": time_to_long_break,
+            "cycle_remaining": max(self.total_ns - offset_ns, 0) // 1_000_000_000,
+        }
@@ -0,0 +1,130 @@
+"""
+Daemon Pomodoro: timer engine + history tetap resident di satu proses
+Melayani tool call lewat Unix domain socket (JSON Lines, koneksi persistent)
+"""
+
+import json
+import os
+import signal
+import socket
+import socketserver
+from typing import Any, Dict
+
+from config import DAEMON_SOCKET, HISTORY_DIR
+from tools import call_tool, configure_history, close_history, notifier
+
+_compact_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+# PROTOCOL
+def render_text(tool_name: str, result: Dict[str, Any]) -> str:
+    """
+    Ringkasan satu baris untuk client tipis (reply "text")
+    Args:
+        tool_name (str): Nama tool yang dipanggil
+        result (Dict): Hasil call_tool
+    Returns:
+        str: Teks satu baris
+    """
+    if "error" in result:
+        return f"❌ {result['error']}"
+    if tool_name == "get_remaining_time" and result["status"] == "running":
+        return f"⏱️ {result['formatted']} {result['progress_bar']}"
+    return result.get("message", "").replace("\n", " ")
+
+def handle_request(line: bytes) -> bytes:
+    """
+    Proses satu baris request
+    Request: {"id": ..., "name": ..., "input": {...}, "reply": "json"|"text"}
+    Response: baris JSON {"id", "result"|"error"} atau satu baris teks jika reply "text"
+    Args:
+        line (bytes): Satu baris JSON
+    Returns:
+        bytes: Baris response (diakhiri newline)
+    """
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("request harus berupa object")
+    except ValueError as e:
+        return (_compact_json({"id": None, "error": f"Invalid JSON: {e}"}) + "\n").encode("utf-8")
+
+    tool_name = request.get("name")
+    result = call_tool(tool_name, request.get("input", {}))
+    if request.get("reply") == "text":
+        return (render_text(tool_name, result) + "\n").encode("utf-8")
+
+    response = {"id": request.get("id")}
+    if "error" in result:
+        response["error"] = result["error"]
+    else:
+        response["result"] = result
+    return (_compact_json(response) + "\n").encode("utf-8")
+
+# SERVER
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Satu koneksi client: baca request per baris sampai client menutup koneksi"""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if line.strip():
+                self.wfile.write(handle_request(line))
+
+class PomodoroDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server, satu thread per koneksi persistent"""
+    daemon_threads = True
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """Hapus socket file lama jika tidak ada daemon yang mendengarkan"""
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.remove(socket_path)
+    else:
+        raise RuntimeError(f"Daemon sudah berjalan di {socket_path}")
+    finally:
+        probe.close()
+
+def create_server(socket_path: str) -> PomodoroDaemon:
+    """
+    Bind socket daemon dengan permission 0600 sejak dibuat (umask, bukan chmod setelah bind)
+    sehingga user lokal lain tidak bisa connect di antara bind dan chmod
+    Args:
+        socket_path (str): Path Unix domain socket
+    Returns:
+        PomodoroDaemon yang sudah listen
+    """
+    old_umask = os.umask(0o177)
+    try:
+        return PomodoroDaemon(socket_path, _RequestHandler)
+    finally:
+        os.umask(old_umask)
+
+def serve(socket_path: str = DAEMON_SOCKET, history_dir: str = HISTORY_DIR) -> None:
+    """
+    Jalankan daemon sampai SIGINT/SIGTERM
+    Args:
+        socket_path (str): Path Unix domain socket
+        history_dir (str): Directory persistent history
+    """
+    os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+    _remove_stale_socket(socket_path)
+    configure_history(history_dir)
+
+    def _terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _terminate)
+    server = create_server(socket_path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        notifier.close(timeout=1.0)
+        close_history()
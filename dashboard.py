@@ -0,0 +1,151 @@
+"""
+Live terminal dashboard untuk Pomodoro timer
+Countdown, progress bar, dan jumlah sesi di baris atas terminal, di-update in-place
+(hanya cell yang berubah) sementara REPL tetap menerima perintah di bawahnya
+"""
+
+import shutil
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from config import Colors, DEFAULT_USER_ID, MAX_TIMER_MINUTES
+import tools
+
+STATUS_LABELS = {
+    "running": ("BERJALAN", Colors.GREEN),
+    "paused": ("PAUSE", Colors.YELLOW),
+    "idle": ("IDLE", Colors.WHITE),
+    "completed": ("SELESAI", Colors.CYAN),
+    "stopped": ("BERHENTI", Colors.RED),
+}
+
+# Layout: nama cell -> (row, col, lebar), 1-based
+HEADER_ROWS = 3
+TIME_WIDTH = len(f"{MAX_TIMER_MINUTES}:00")  # "MM:SS" terpanjang dari timer terpanjang
+BAR_COL = 8 + TIME_WIDTH + 2
+CELLS = {
+    "time": (1, 8, TIME_WIDTH),
+    "bar": (1, BAR_COL, len(tools.PROGRESS_BARS[100])),
+    "status": (1, BAR_COL + 1 + len(tools.PROGRESS_BARS[100]), 8),
+    "sessions": (2, 16, 6),
+}
+# Progress bar berwarna untuk setiap status x persentase, dibuat sekali saja
+BAR_FRAMES = {
+    status: tuple(f"{color}{bar.ljust(CELLS['bar'][2])}{Colors.RESET}" for bar in tools.PROGRESS_BARS)
+    for status, (_, color) in STATUS_LABELS.items()
+}
+STATUS_FRAMES = {
+    status: f"{color}{label.ljust(CELLS['status'][2])}{Colors.RESET}"
+    for status, (label, color) in STATUS_LABELS.items()
+}
+STATIC_TEXT = (
+    (1, 1, f"{Colors.BOLD}Timer:{Colors.RESET}"),
+    (2, 1, f"{Colors.BOLD}Sesi selesai:{Colors.RESET}"),
+)
+
+# DASHBOARD
+class LiveDashboard:
+    """
+    Status area tetap di atas (scroll region untuk REPL di bawahnya)
+    Redraw event-driven dari progress subscription, dibatasi max_fps,
+    satu sys.stdout.write per frame
+    """
+
+    def __init__(self, user_id: str = DEFAULT_USER_ID, stream: TextIO = sys.stdout, max_fps: float = 4.0):
+        """
+        Args:
+            user_id (str): User yang ditampilkan
+            stream (TextIO): Output terminal
+            max_fps (float): Batas frame per detik
+        """
+        self.user_id = user_id
+        self.stream = stream
+        self.min_frame_interval = 1.0 / max_fps
+        self._cells: Dict[str, str] = {}
+        self._subscription = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._write_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Siapkan layar (static text + scroll region) dan mulai thread redraw"""
+        rows = shutil.get_terminal_size().lines
+        width = shutil.get_terminal_size().columns
+        frame = [Colors.CLEAR_SCREEN]
+        for row, col, text in STATIC_TEXT:
+            frame.append(Colors.CURSOR_TO.format(row=row, col=col) + text)
+        frame.append(Colors.CURSOR_TO.format(row=HEADER_ROWS, col=1) + "─" * width)
+        frame.append(Colors.SCROLL_REGION.format(top=HEADER_ROWS + 1, bottom=rows))
+        frame.append(Colors.CURSOR_TO.format(row=HEADER_ROWS + 1, col=1))
+        self._write("".join(frame))
+
+        self._cells.clear()
+        self._running = True
+        self._subscription = tools.progress_hub.subscribe(self.user_id)
+        self._thread = threading.Thread(target=self._run, name="pomodoro-dashboard", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Hentikan redraw dan kembalikan scroll region normal"""
+        if not self._running:
+            return
+        self._running = False
+        # Bangunkan thread yang sedang menunggu event
+        self._subscription.publish(tools.get_progress(self.user_id))
+        self._thread.join()
+        tools.progress_hub.unsubscribe(self._subscription)
+        self._write(Colors.RESET_SCROLL_REGION + Colors.CURSOR_TO.format(row=shutil.get_terminal_size().lines, col=1) + "\n")
+
+    def render(self, event: Dict) -> List[Tuple[str, str]]:
+        """
+        Nilai cell (sudah berwarna) untuk satu event progress
+        Args:
+            event (Dict): Event dari tools.get_progress / subscription
+        Returns:
+            List of (nama cell, teks)
+        """
+        status = event["status"]
+        session = tools.registry.get(self.user_id)
+        sessions_completed = session.sessions_completed if session is not None else 0
+        # Teks sudah di-pad selebar cell agar sisa nilai lama ikut tertimpa
+        return [
+            ("time", f"{Colors.BOLD}{event['formatted'].ljust(CELLS['time'][2])}{Colors.RESET}"),
+            ("bar", BAR_FRAMES[status][event["percentage"]]),
+            ("status", STATUS_FRAMES[status]),
+            ("sessions", str(sessions_completed).ljust(CELLS["sessions"][2])),
+        ]
+
+    def draw(self, event: Dict) -> None:
+        """Tulis hanya cell yang berubah sejak frame sebelumnya (satu write)"""
+        changes = []
+        for name, text in self.render(event):
+            if self._cells.get(name) == text:
+                continue
+            self._cells[name] = text
+            row, col, _ = CELLS[name]
+            changes.append(Colors.CURSOR_TO.format(row=row, col=col) + text)
+        if changes:
+            self._write(Colors.SAVE_CURSOR + "".join(changes) + Colors.RESTORE_CURSOR)
+
+    def _run(self) -> None:
+        """Thread redraw: tunggu event/tick berikutnya, batasi fps"""
+        last_frame = 0.0
+        while self._running:
+            wait = self.min_frame_interval - (time.monotonic() - last_frame)
+            if wait > 0:
+                time.sleep(wait)
+            event = self._subscription.take()
+            if event is None:
+                event = tools.get_progress(self.user_id)
+                # get_progress bisa menyelesaikan timer yang lewat deadline (event complete ikut dipublish)
+                event = self._subscription.take() or event
+            self.draw(event)
+            last_frame = time.monotonic()
+            self._subscription.wait(event["next_update_in"])
+
+    def _write(self, data: str) -> None:
+        with self._write_lock:
+            self.stream.write(data)
+            self.stream.flush()
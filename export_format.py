@@ -0,0 +1,154 @@
+"""
+Format binary untuk export/import session history
+Header (magic, versi, ukuran record, jumlah record, user_id) + record fixed-width struct
++ trailer CRC32; file bisa dibaca streaming atau via mmap tanpa memuat semuanya
+"""
+
+import mmap
+import os
+import struct
+import zlib
+from typing import Iterable, Iterator, Optional, Tuple
+
+FILE_MAGIC = b"PMSE"
+FILE_VERSION = 1
+TRAILER_MAGIC = b"PEND"
+
+# magic, versi, ukuran record, panjang user_id, jumlah record
+_HEADER = struct.Struct("<4sHHHQ")
+# epoch detik, menit requested, menit completed, status code (13 byte, tanpa padding)
+RECORD = struct.Struct("<dHHB")
+# magic, CRC32 semua byte record
+_TRAILER = struct.Struct("<4sI")
+
+Row = Tuple[float, int, int, int]
+
+# WRITER
+def write_sessions(path: str, rows: Iterable[Row], count: int, user_id: str = "",
+                   batch_size: int = 65536) -> int:
+    """
+    Tulis record ke file (atomic via rename)
+    Args:
+        path (str): File tujuan
+        rows (Iterable[Row]): (timestamp, requested, completed, status) sebanyak count
+        count (int): Jumlah record (ditulis di header)
+        user_id (str): Pemilik history (disimpan di header)
+        batch_size (int): Record per write
+    Returns:
+        int: Jumlah byte file
+    """
+    owner = user_id.encode("utf-8")
+    buffer = bytearray(RECORD.size * batch_size)
+    crc = 0
+    written = 0
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(FILE_MAGIC, FILE_VERSION, RECORD.size, len(owner), count) + owner)
+        filled = 0
+        for row in rows:
+            RECORD.pack_into(buffer, filled * RECORD.size, *row)
+            filled += 1
+            if filled == batch_size:
+                crc = zlib.crc32(buffer, crc)
+                f.write(buffer)
+                written += filled
+                filled = 0
+        tail = memoryview(buffer)[:filled * RECORD.size]
+        crc = zlib.crc32(tail, crc)
+        f.write(tail)
+        written += filled
+        if written != count:
+            raise ValueError(f"Jumlah record {written} tidak sama dengan header {count}")
+        f.write(_TRAILER.pack(TRAILER_MAGIC, crc))
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+# READER
+class SessionFile:
+    """
+    Reader file export via mmap (read-only, lazy)
+    records adalah memoryview atas region record; iterasi memakai struct.iter_unpack
+    """
+
+    def __init__(self, path: str, verify: bool = True):
+        """
+        Args:
+            path (str): File dari write_sessions
+            verify (bool): Cek CRC32 saat dibuka
+        Raises:
+            ValueError: Jika format, versi, ukuran, atau checksum tidak cocok
+        """
+        self.path = path
+        self._view: Optional[memoryview] = None
+        self.records: Optional[memoryview] = None
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else None
+        try:
+            self._read_header(verify)
+        except BaseException:
+            # Header/CRC tidak valid: lepas mapping sebelum error diteruskan
+            self.close()
+            raise
+
+    def _read_header(self, verify: bool) -> None:
+        """Parse header dan trailer, set user_id/count/records (dipanggil dari __init__)"""
+        path = self.path
+        if self._mmap is None or len(self._mmap) < _HEADER.size + _TRAILER.size:
+            raise ValueError(f"File export terlalu kecil: {path}")
+
+        magic, version, record_size, owner_size, count = _HEADER.unpack_from(self._mmap)
+        if magic != FILE_MAGIC:
+            raise ValueError(f"Bukan file export Pomodoro: {path}")
+        if version != FILE_VERSION or record_size != RECORD.size:
+            raise ValueError(f"Versi file export tidak didukung: v{version} (record {record_size} byte)")
+
+        start = _HEADER.size + owner_size
+        end = start + count * RECORD.size
+        if end + _TRAILER.size != len(self._mmap):
+            raise ValueError(f"Ukuran file export tidak cocok dengan header ({count} record): {path}")
+
+        view = self._view = memoryview(self._mmap)
+        self.user_id = bytes(view[_HEADER.size:start]).decode("utf-8")
+        self.count = count
+        self.records = view[start:end]
+        trailer_magic, self.checksum = _TRAILER.unpack_from(self._mmap, end)
+        if trailer_magic != TRAILER_MAGIC:
+            raise ValueError(f"Trailer file export rusak: {path}")
+        if verify and not self.verify():
+            raise ValueError(f"Checksum file export tidak cocok: {path}")
+
+    def verify(self) -> bool:
+        """True jika CRC32 record sama dengan trailer"""
+        return zlib.crc32(self.records) == self.checksum
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Row]:
+        """Record satu per satu (lazy, langsung dari mmap)"""
+        return RECORD.iter_unpack(self.records)
+
+    def record(self, index: int) -> Row:
+        """Satu record (random access)"""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return RECORD.unpack_from(self.records, index * RECORD.size)
+
+    def close(self) -> None:
+        """Lepas memoryview dan mmap (aman dipanggil berulang)"""
+        for view in (self.records, self._view):
+            if view is not None:
+                view.release()
+        self.records = self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "SessionFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
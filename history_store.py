@@ -0,0 +1,282 @@
+"""
+Persistent session history (append-only log + snapshot)
+Record ditulis oleh background writer dengan group commit (satu fsync per batch)
+Segment log yang sudah masuk snapshot dihapus (kecuali keep_segments, mis. untuk --analyze)
+"""
+
+import json
+import os
+import queue
+import re
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+SNAPSHOT_FILE = "snapshot.json"
+SEGMENT_PATTERN = re.compile(r"^history-(\d{8})\.log$")
+SNAPSHOT_VERSION = 1
+
+Reducer = Callable[[Dict[str, Any], Dict[str, Any]], None]
+Codec = Callable[[Dict[str, Any], str], Dict[str, Any]]
+
+def segment_name(seq: int) -> str:
+    """Nama file log untuk segment tertentu"""
+    return f"history-{seq:08d}.log"
+
+def list_segments(directory: str) -> List[Tuple[int, str]]:
+    """
+    Daftar segment log di directory, urut dari yang paling lama
+    Args:
+        directory (str): Directory history
+    Returns:
+        List of (seq, path)
+    """
+    segments = []
+    for name in os.listdir(directory):
+        match = SEGMENT_PATTERN.match(name)
+        if match:
+            segments.append((int(match.group(1)), os.path.join(directory, name)))
+    segments.sort()
+    return segments
+
+def read_segment(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Baca record dari satu segment log
+    Baris terakhir yang terpotong (crash saat menulis) dilewati
+    Args:
+        path (str): Path file segment
+    Yields:
+        Record session (dict)
+    """
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+def _fsync_directory(directory: str) -> None:
+    """fsync directory agar rename/file baru tahan crash (POSIX saja)"""
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+# HISTORY STORE
+class HistoryStore:
+    """
+    Append-only history log dengan snapshot berkala
+    State snapshot dibangun oleh reducer (state, record) sehingga startup hanya
+    membaca snapshot terakhir + tail log, bukan seluruh history.
+    """
+
+    def __init__(self, directory: str, reducer: Reducer, compact_every: int = 10000, max_batch: int = 1024,
+                 encode: Optional[Codec] = None, decode: Optional[Codec] = None, keep_segments: bool = False):
+        """
+        Args:
+            directory (str): Directory untuk snapshot dan segment log
+            reducer (Callable): Fungsi (state, record) yang mengubah state in-place
+            compact_every (int): Jumlah record sebelum snapshot baru dibuat
+            max_batch (int): Maksimal record per group commit
+            encode (Callable): (state, directory) -> bentuk JSON-serializable (default: apa adanya)
+            decode (Callable): (data, directory) -> state, kebalikan encode saat snapshot di-load
+            keep_segments (bool): Simpan segment log lama sebagai arsip setelah snapshot
+        """
+        self.directory = directory
+        self.reducer = reducer
+        self.encode = encode or (lambda state, directory: state)
+        self.decode = decode or (lambda data, directory: data)
+        self.compact_every = compact_every
+        self.max_batch = max_batch
+        self.keep_segments = keep_segments
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._state: Dict[str, Any] = {}
+        self._segment_seq = 0
+        self._segment_file = None
+        self._since_snapshot = 0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.error: Optional[BaseException] = None     # error writer thread (store berhenti menulis)
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Load snapshot terakhir + replay tail log, lalu mulai writer thread
+        Returns:
+            Dict state hasil reducer (milik store, jangan diubah)
+        """
+        snapshot_seq = -1
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self._state = self.decode(snapshot["state"], self.directory)
+            snapshot_seq = snapshot["segment"]
+
+        for seq, path in list_segments(self.directory):
+            if seq <= snapshot_seq:
+                continue
+            for record in read_segment(path):
+                self.reducer(self._state, record)
+                self._since_snapshot += 1
+            self._segment_seq = seq
+        self._segment_seq = max(self._segment_seq, snapshot_seq + 1)
+
+        self._open_segment()
+        self._thread = threading.Thread(target=self._run, name="pomodoro-history", daemon=True)
+        self._thread.start()
+        return self._state
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Antrikan record untuk ditulis (tidak pernah blocking pada disk I/O)
+        Args:
+            record (Dict): Record session yang JSON-serializable
+        Raises:
+            Exception: Error yang menghentikan writer thread
+        """
+        with self._lock:
+            if self.error is not None:
+                raise self.error
+            self._queue.put(record)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Tunggu sampai semua record yang sudah diantrikan ter-fsync
+        Args:
+            timeout (float): Batas waktu tunggu dalam detik
+        Returns:
+            bool: True jika semua record sudah durable
+        Raises:
+            Exception: Error yang menghentikan writer thread
+        """
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        with self._lock:
+            if self.error is not None:
+                raise self.error
+            self._queue.put(done)
+        finished = done.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return finished
+
+    def close(self) -> None:
+        """
+        Flush semua record lalu hentikan writer thread
+        Raises:
+            Exception: Error yang menghentikan writer thread (record sesudahnya tidak tertulis)
+        """
+        if self._thread is None:
+            return
+        with self._lock:
+            if self.error is None:
+                self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._segment_file.close()
+        self._segment_file = None
+        if self.error is not None:
+            raise self.error
+
+    def _open_segment(self) -> None:
+        """Buka segment log aktif untuk append (buang baris terpotong di akhir)"""
+        path = os.path.join(self.directory, segment_name(self._segment_seq))
+        self._segment_file = open(path, "ab+")
+        size = self._segment_file.seek(0, os.SEEK_END)
+        if size:
+            self._segment_file.seek(size - 1)
+            if self._segment_file.read(1) != b"\n":
+                self._segment_file.seek(0)
+                data = self._segment_file.read()
+                self._segment_file.truncate(data.rfind(b"\n") + 1)
+        _fsync_directory(self.directory)
+
+    def _run(self) -> None:
+        """Writer loop: kumpulkan batch, tulis sekali, fsync sekali"""
+        stopping = False
+        waiters = []
+        try:
+            while not stopping:
+                batch = []
+                item = self._queue.get()
+                while True:
+                    if item is None:
+                        stopping = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        batch.append(item)
+                    if stopping or len(batch) >= self.max_batch:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+
+                if batch:
+                    self._commit(batch)
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+                if self._since_snapshot >= self.compact_every:
+                    self._compact()
+        except Exception as e:
+            self._fail(e, waiters)
+
+    def _fail(self, error: Exception, waiters: List[threading.Event]) -> None:
+        """
+        Writer berhenti karena error (mis. disk penuh): simpan error dan bangunkan semua flush()
+        append/flush/close berikutnya melempar error ini, bukan menunggu selamanya
+        """
+        with self._lock:
+            self.error = error
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+        for waiter in waiters:
+            waiter.set()
+
+    def _commit(self, batch: List[Dict[str, Any]]) -> None:
+        """Group commit: tulis semua record batch lalu satu kali fsync"""
+        data = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in batch)
+        self._segment_file.write(data.encode("utf-8"))
+        self._segment_file.flush()
+        os.fsync(self._segment_file.fileno())
+        for record in batch:
+            self.reducer(self._state, record)
+        self._since_snapshot += len(batch)
+
+    def _compact(self) -> None:
+        """
+        Tutup segment aktif, tulis snapshot state sampai segment itu (atomic rename)
+        Segment yang sudah masuk snapshot lalu dihapus (kecuali keep_segments)
+        """
+        sealed_seq = self._segment_seq
+        self._segment_file.close()
+        self._segment_seq += 1
+        self._open_segment()
+
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        tmp_path = snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": SNAPSHOT_VERSION, "segment": sealed_seq, "state": self.encode(self._state, self.directory)}, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, snapshot_path)
+        _fsync_directory(self.directory)
+        self._since_snapshot = 0
+
+        if not self.keep_segments:
+            for seq, path in list_segments(self.directory):
+                if seq <= sealed_seq:
+                    os.remove(path)
@@ -0,0 +1,319 @@
+"""
+Load test timer engine: ribuan user sintetis menjalankan skrip REPL
+(start, cek waktu berulang, pause/resume, stop, stats)
+Setiap langkah lewat jalur yang sama dengan REPL + tool API: LocalAssistant.parse_command
+lalu execute_tool (sync, atau async_tools.execute_tool untuk driver asyncio) dengan user_id sendiri.
+Driver: thread pool, process pool, asyncio. Hasil: throughput, latency p50/p99/p999,
+keterlambatan timer expire (probe di scheduler yang sama), dan peak RSS
+
+    python loadtest.py --driver thread --users 2000 --workers 64
+    python loadtest.py --driver process --users 8000 --workers 4 --output runs.jsonl --label before
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # bukan Unix: peak RSS tidak dilaporkan
+    resource = None
+
+import async_tools
+import tools
+from assistant import create_assistant
+
+DRIVERS = ("thread", "process", "asyncio")
+
+# Skrip user (input REPL campuran Indonesia/Inggris); {checks} cek waktu di tengah session
+OPENING = ("mulai 25", "berapa sisa?")
+CHECKS = ("sisa", "time", "progress")
+CLOSING = ("jeda", "sisa", "lanjut", "stop", "statistik")
+
+# command_type -> (tool, fungsi input dari parse_command)
+COMMAND_TOOLS = {
+    "start": ("start_pomodoro", lambda info: {"duration_minutes": info["duration"]}),
+    "check_time": ("get_remaining_time", lambda info: {}),
+    "pause": ("pause_pomodoro", lambda info: {}),
+    "resume": ("resume_pomodoro", lambda info: {}),
+    "stop": ("stop_pomodoro", lambda info: {}),
+    "stats": ("get_session_statistics", lambda info: {}),
+}
+
+def user_script(checks: int, rng: random.Random) -> List[str]:
+    """Urutan input satu user"""
+    return list(OPENING) + [rng.choice(CHECKS) for _ in range(checks)] + list(CLOSING)
+
+def plan_step(assistant: Any, text: str, user_id: str) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Parse input seperti REPL lalu petakan ke tool call user ini
+    Returns:
+        (command_type, nama tool, input tool)
+    """
+    info = assistant.parse_command(text)
+    tool_name, build = COMMAND_TOOLS[info["type"]]
+    tool_input = build(info)
+    tool_input["user_id"] = user_id
+    return info["type"], tool_name, tool_input
+
+def _is_error(reply: str) -> bool:
+    """Reply execute_tool berisi error (tanpa json.loads)"""
+    return reply.startswith('{"error"') or '"status": "error"' in reply
+
+# RECORDER
+class Recorder:
+    """Sampel latency per command, keterlambatan probe, dan jumlah error (thread-safe)"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[int]] = {}
+        self.lateness: List[int] = []
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._probes = 0
+        self._probes_done = threading.Event()
+        self._probes_done.set()
+
+    def sample(self, command: str, elapsed_ns: int, error: bool) -> None:
+        with self._lock:
+            self.latencies.setdefault(command, []).append(elapsed_ns)
+            if error:
+                self.errors += 1
+
+    def probe(self, scheduler: Any, delay_ns: int) -> None:
+        """Jadwalkan callback di scheduler dan catat selisih waktu jalan vs deadline"""
+        deadline = time.monotonic_ns() + delay_ns
+
+        def fired() -> None:
+            late = time.monotonic_ns() - deadline
+            with self._lock:
+                self.lateness.append(late)
+                self._probes -= 1
+                if not self._probes:
+                    self._probes_done.set()
+
+        with self._lock:
+            self._probes += 1
+            self._probes_done.clear()
+        scheduler.schedule_at(deadline, fired)
+
+    def wait_probes(self, timeout: float) -> None:
+        self._probes_done.wait(timeout)
+
+    @property
+    def pending_probes(self) -> int:
+        return self._probes
+
+    def export(self) -> Dict[str, Any]:
+        """Data mentah untuk dikirim dari proses worker"""
+        return {"latencies": self.latencies, "lateness": self.lateness, "errors": self.errors}
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        with self._lock:
+            for command, samples in data["latencies"].items():
+                self.latencies.setdefault(command, []).extend(samples)
+            self.lateness.extend(data["lateness"])
+            self.errors += data["errors"]
+
+# DRIVERS
+def run_user_sync(user_id: str, seed: int, options: Dict[str, Any], recorder: Recorder) -> None:
+    """Satu user sintetis di thread (execute_tool sync, probe di tools.scheduler)"""
+    rng = random.Random(seed)
+    assistant = create_assistant(seed)
+    for text in user_script(options["checks"], rng):
+        started = time.perf_counter_ns()
+        command, tool_name, tool_input = plan_step(assistant, text, user_id)
+        reply = tools.execute_tool(tool_name, tool_input)
+        recorder.sample(command, time.perf_counter_ns() - started, _is_error(reply))
+        if command == "start":
+            recorder.probe(tools.scheduler, rng.randint(*options["probe_ns"]))
+        if options["think_ms"]:
+            time.sleep(rng.uniform(0, options["think_ms"]) / 1000)
+
+def run_threads(user_ids: List[str], seeds: List[int], options: Dict[str, Any], recorder: Recorder) -> None:
+    """Driver thread pool: satu task per user, paralel sebanyak workers"""
+    with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+        futures = [executor.submit(run_user_sync, user_id, seed, options, recorder)
+                   for user_id, seed in zip(user_ids, seeds)]
+        for future in futures:
+            future.result()
+    recorder.wait_probes(options["probe_ns"][1] / 1e9 + 5)
+
+def _process_chunk(user_ids: List[str], seeds: List[int], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker process: jalankan sebagian user dengan thread pool sendiri"""
+    recorder = Recorder()
+    run_threads(user_ids, seeds, dict(options, workers=options["threads_per_process"]), recorder)
+    data = recorder.export()
+    data["peak_rss_mb"] = peak_rss_mb()
+    return data
+
+def run_processes(user_ids: List[str], seeds: List[int], options: Dict[str, Any], recorder: Recorder) -> float:
+    """
+    Driver process pool: user dibagi rata ke workers proses (state timer per proses)
+    Returns:
+        Peak RSS terbesar di antara proses worker (MB)
+    """
+    workers = options["workers"]
+    chunks = [(user_ids[i::workers], seeds[i::workers]) for i in range(workers) if user_ids[i::workers]]
+    with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+        results = list(executor.map(_process_chunk, *zip(*chunks), [options] * len(chunks)))
+    for data in results:
+        recorder.merge(data)
+    return max((data["peak_rss_mb"] or 0.0 for data in results), default=0.0)
+
+async def run_user_async(user_id: str, seed: int, options: Dict[str, Any], recorder: Recorder,
+                         limit: asyncio.Semaphore) -> None:
+    """Satu user sintetis di event loop (async_tools.execute_tool, probe di scheduler loop)"""
+    rng = random.Random(seed)
+    assistant = create_assistant(seed)
+    async with limit:
+        for text in user_script(options["checks"], rng):
+            started = time.perf_counter_ns()
+            command, tool_name, tool_input = plan_step(assistant, text, user_id)
+            reply = await async_tools.execute_tool(tool_name, tool_input)
+            recorder.sample(command, time.perf_counter_ns() - started, _is_error(reply))
+            if command == "start":
+                recorder.probe(async_tools.get_scheduler(), rng.randint(*options["probe_ns"]))
+            await asyncio.sleep(rng.uniform(0, options["think_ms"]) / 1000 if options["think_ms"] else 0)
+
+def run_asyncio(user_ids: List[str], seeds: List[int], options: Dict[str, Any], recorder: Recorder) -> None:
+    """Driver asyncio: semua user sebagai task, maksimal workers berjalan bersamaan"""
+    async def main() -> None:
+        limit = asyncio.Semaphore(options["workers"])
+        await asyncio.gather(*(run_user_async(user_id, seed, options, recorder, limit)
+                               for user_id, seed in zip(user_ids, seeds)))
+        # Probe dijalankan loop ini, jadi tunggu dengan sleep (bukan Event.wait yang memblok loop)
+        deadline = time.monotonic() + options["probe_ns"][1] / 1e9 + 5
+        while recorder.pending_probes and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+
+# REPORT
+def peak_rss_mb(children: bool = False) -> Optional[float]:
+    """Peak RSS proses ini (atau proses anak yang sudah selesai) dalam MB"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    return round(usage / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def summarize(samples: List[int]) -> Dict[str, Any]:
+    """count, mean, p50/p99/p999, max (milidetik, nearest rank)"""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    count = len(ordered)
+
+    def rank(q: float) -> float:
+        return round(ordered[min(int(count * q), count - 1)] / 1e6, 4)
+
+    return {
+        "count": count,
+        "mean_ms": round(sum(ordered) / count / 1e6, 4),
+        "p50_ms": rank(0.50),
+        "p99_ms": rank(0.99),
+        "p999_ms": rank(0.999),
+        "max_ms": round(ordered[-1] / 1e6, 4),
+    }
+
+def run_load(driver: str = "thread", users: int = 1000, workers: int = 32, checks: int = 5, think_ms: float = 0.0,
+             probe_ms: Tuple[float, float] = (10.0, 200.0), threads_per_process: int = 16, seed: int = 0,
+             label: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Jalankan load test
+    Args:
+        driver (str): "thread", "process", atau "asyncio"
+        users (int): Jumlah user sintetis
+        workers (int): Thread (thread), proses (process), atau task bersamaan (asyncio)
+        checks (int): Jumlah cek waktu per user di tengah session
+        think_ms (float): Jeda acak maksimal antar langkah (0 = tanpa jeda)
+        probe_ms (Tuple): Rentang delay probe expire (milidetik)
+        threads_per_process (int): Thread per proses untuk driver process
+        seed (int): Seed skrip dan jeda
+        label (str): Label bebas untuk membandingkan run
+    Returns:
+        Dict hasil (format stabil untuk dibandingkan antar run)
+    """
+    if driver not in DRIVERS:
+        raise ValueError(f"Driver tidak dikenal: {driver} (pilih: {', '.join(DRIVERS)})")
+    user_ids = [f"load-{seed}-{i}" for i in range(users)]
+    seeds = [seed * 1_000_003 + i for i in range(users)]
+    options = {
+        "workers": workers,
+        "checks": checks,
+        "think_ms": think_ms,
+        "probe_ns": (int(probe_ms[0] * 1e6), int(probe_ms[1] * 1e6)),
+        "threads_per_process": threads_per_process,
+    }
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    worker_rss = None
+    if driver == "thread":
+        run_threads(user_ids, seeds, options, recorder)
+    elif driver == "process":
+        worker_rss = run_processes(user_ids, seeds, options, recorder)
+    else:
+        run_asyncio(user_ids, seeds, options, recorder)
+    elapsed = time.perf_counter() - started
+
+    operations = sum(len(samples) for samples in recorder.latencies.values())
+    rss = peak_rss_mb()
+    return {
+        "label": label,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "driver": driver,
+        "users": users,
+        "workers": workers,
+        "checks": checks,
+        "think_ms": think_ms,
+        "cpu_count": os.cpu_count(),
+        "operations": operations,
+        "errors": recorder.errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_ops": round(operations / elapsed, 1) if elapsed > 0 else 0.0,
+        "latency": summarize([sample for samples in recorder.latencies.values() for sample in samples]),
+        "per_command": {command: summarize(samples) for command, samples in sorted(recorder.latencies.items())},
+        "expiry_lateness": summarize(recorder.lateness),
+        "peak_rss_mb": max(rss or 0.0, worker_rss or 0.0) if rss is not None else None,
+    }
+
+def main() -> None:
+    """Entry point CLI"""
+    parser = argparse.ArgumentParser(description="Load test timer engine Pomodoro")
+    parser.add_argument("--driver", choices=DRIVERS, default="thread")
+    parser.add_argument("--users", type=int, default=1000, help="Jumlah user sintetis")
+    parser.add_argument("--workers", type=int, default=32, help="Thread / proses / task bersamaan")
+    parser.add_argument("--checks", type=int, default=5, help="Cek waktu per user")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Jeda acak maksimal antar langkah")
+    parser.add_argument("--probe-ms", type=float, nargs=2, default=(10.0, 200.0), metavar=("MIN", "MAX"),
+                        help="Rentang delay probe expire (milidetik)")
+    parser.add_argument("--threads-per-process", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--label", help="Label run (untuk membandingkan)")
+    parser.add_argument("--output", help="Append hasil sebagai satu baris JSON ke file ini")
+    args = parser.parse_args()
+
+    result = run_load(args.driver, args.users, args.workers, args.checks, args.think_ms, tuple(args.probe_ms),
+                      args.threads_per_process, args.seed, args.label)
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    else:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+
+    latency, lateness = result["latency"], result["expiry_lateness"]
+    print(f"{result['driver']}: {result['operations']} ops, {result['throughput_ops']:.0f} ops/s, "
+          f"p50 {latency.get('p50_ms', 0)} / p99 {latency.get('p99_ms', 0)} / p999 {latency.get('p999_ms', 0)} ms, "
+          f"expire +{lateness.get('p99_ms', 0)} ms p99, {result['errors']} error, RSS {result['peak_rss_mb']} MB",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import sys
-from config import Colors
+import threading
+import time
+from config import Colors, DEFAULT_USER_ID, HISTORY_DIR, PROFILE_PATH
 from utils import (
     clear_terminal,
     print_welcome,
@@ -9,21 +11,104 @@ from utils import (
     print_error,
     handle_interrupt
 )
-from tools import start_pomodoro, get_remaining_time, stop_pomodoro, pause_pomodoro, resume_pomodoro, get_session_statistics
-from assistant import create_assistant
+from metrics import metrics
+
+# tools (registry, scheduler, history) dan assistant (regex, responses) dimuat di background
+# setelah banner tampil; lihat PomodoroApp._load_backend
+
+# Teks bantuan statis: dirangkai sekali saat import, bukan setiap 'help'
+HELP_TEXT = f"""
+{Colors.CYAN}{Colors.BOLD}📖 BANTUAN - Perintah Tersedia:{Colors.RESET}
+
+{Colors.GREEN}Mulai Timer:{Colors.RESET}
+  • 'Mulai pomodoro 25' atau 'start 25' - Timer 25 menit
+  • 'Mulai 30' - Timer 30 menit (sesuai kebutuhan)
+  • 'Mulai' - Timer default 25 menit
+  • 'Siklus 4' - 4 sesi fokus, short/long break berjalan otomatis
+
+{Colors.GREEN}Cek Waktu:{Colors.RESET}
+  • 'Berapa sisa?' atau 'time' - Lihat sisa waktu
+  • 'Progress' - Lihat progress bar
+  • 'Fase' - Fase siklus, fase berikutnya, dan waktu ke long break
+
+{Colors.GREEN}Kontrol Timer:{Colors.RESET}
+  • 'Pause' atau 'jeda' - Jeda sebentar
+  • 'Resume' atau 'lanjut' - Lanjutkan timer
+  • 'Stop' atau 'henti' - Hentikan & reset
+
+{Colors.GREEN}Info:{Colors.RESET}
+  • 'Stats' atau 'statistik' - Lihat statistik
+  • 'Riwayat 2024-05-14 09:00 12:00' - Session dalam rentang waktu (default hari ini)
+  • 'Pukul 10:30' - Session yang berjalan pada jam tersebut
+  • 'Perf' - Latency per command ('perf on', 'perf off', 'perf reset', 'perf profile 20')
+  • 'Motivasi' - Dapatkan motivasi
+  • 'Help' atau '?' - Tampilkan bantuan ini
+  • 'Exit' atau 'quit' - Keluar aplikasi
+
+{Colors.YELLOW}Tips:{Colors.RESET}
+  • Gunakan Pomodoro 25 menit untuk hasil optimal
+  • Istirahat 5 menit setelah setiap session
+  • Konsisten adalah kunci kesuksesan! 💪
+
+{Colors.MAGENTA}Contoh session:{Colors.RESET}
+  1. 'Mulai 25' → Start 25 menit timer
+  2. 'Berapa sisa?' → Cek sisa waktu (berkali-kali)
+  3. 'Pause' → Jeda jika perlu
+  4. 'Resume' → Lanjut fokus
+  5. 'Stats' → Lihat progress harian
+"""
 
 # MAIN APPLICATION
 class PomodoroApp:
     """Main application controller (No API)"""
     
-    def __init__(self):
-        """Inisialisasi aplikasi"""
-        self.assistant = create_assistant()
+    def __init__(self, live: bool = False):
+        """
+        Inisialisasi aplikasi
+        Args:
+            live (bool): Tampilkan live dashboard di atas REPL
+        """
+        self.assistant = None
         self.running = True
+        self.dashboard = None
+        self._tools = None
+        self._load_error = None
+        self._loader = threading.Thread(target=self._load_backend, name="backend-loader", daemon=True)
+        if live:
+            # Dashboard butuh tools sebelum REPL mulai: muat langsung
+            self._loader.run()
+            from dashboard import LiveDashboard
+            self.dashboard = LiveDashboard()
+        else:
+            self._loader.start()
+    
+    def _load_backend(self) -> None:
+        """Import tools + assistant dan restore history (berjalan selama user mengetik input pertama)"""
+        try:
+            import tools
+            from assistant import create_assistant
+            tools.configure_history(HISTORY_DIR)
+            self.assistant = create_assistant()
+            self._tools = tools
+        except Exception as e:
+            self._load_error = e
+    
+    @property
+    def backend(self):
+        """Module tools (menunggu preload selesai; error saat load dilempar ulang di sini)"""
+        if self._tools is None:
+            if self._loader.is_alive():
+                self._loader.join()
+            if self._load_error is not None:
+                raise self._load_error
+        return self._tools
     
     def run(self) -> None:
         """Main application loop"""
-        clear_terminal()
+        if self.dashboard is not None:
+            self.dashboard.start()
+        else:
+            clear_terminal()
         print_welcome()
         
         while self.running:
@@ -33,26 +118,51 @@ class PomodoroApp:
                 
                 # Check exit command
                 if user_input.lower() in ["exit", "q", "quit", "keluar"]:
-                    self.running = False
-                    print_goodbye()
+                    self.shutdown()
                     break
                 
                 # Skip empty input
                 if not user_input.strip():
                     continue
                 
-                # Parse command
-                command_info = self.assistant.parse_command(user_input)
-                command_type = command_info["type"]
-                
-                # Handle command
-                self.handle_command(command_type, command_info)
+                # Parse + handle command
+                self.dispatch(user_input)
             
             except KeyboardInterrupt:
                 handle_interrupt()
+            except EOFError:
+                # stdin ditutup (Ctrl+D / pipe habis)
+                self.shutdown()
+                break
             except Exception as e:
                 print_error(f"Error: {str(e)}")
     
+    def dispatch(self, user_input: str) -> None:
+        """
+        Parse dan jalankan satu input (diukur per tahap jika instrumentasi aktif)
+        Args:
+            user_input (str): Raw input dari user
+        """
+        self.backend  # self.assistant tersedia setelah backend selesai dimuat
+        if not metrics.enabled and metrics.profiler is None:
+            command_info = self.assistant.parse_command(user_input)
+            self.handle_command(command_info["type"], command_info)
+            return
+        
+        profiling = metrics.profile_begin()
+        started = time.perf_counter_ns()
+        try:
+            command_info = self.assistant.parse_command(user_input)
+            parsed = time.perf_counter_ns()
+            self.handle_command(command_info["type"], command_info)
+        finally:
+            path = metrics.profile_end() if profiling else None
+        if metrics.enabled:
+            metrics.record("parse", command_info["type"], parsed - started)
+            metrics.record("command", command_info["type"], time.perf_counter_ns() - parsed)
+        if path is not None:
+            print_response(f"🔬 Profile disimpan di {path} (buka dengan: python -m pstats {path})")
+    
     def handle_command(self, command_type: str, command_info: dict) -> None:
         """
         Handle specific command
@@ -60,14 +170,35 @@ class PomodoroApp:
             command_type (str): Type of command
             command_info (dict): Command information
         """
+        tools = self.backend
         if command_type == "start":
             duration = command_info.get("duration", 25)
-            result = start_pomodoro(duration)
+            result = tools.start_pomodoro(duration)
             response = self.assistant.get_response("start", duration=duration)
             print_response(response)
         
+        elif command_type == "cycle":
+            sessions = command_info.get("sessions", 4)
+            result = tools.start_cycle(sessions)
+            if result["status"] == "error":
+                print_response(result["message"])
+            else:
+                total_minutes = result["cycle"]["cycle_remaining"] // 60
+                response = self.assistant.get_response("cycle", sessions=sessions, total_minutes=total_minutes)
+                print_response(response)
+        
+        elif command_type == "phase":
+            result = tools.get_cycle_status()
+            if result["status"] == "idle":
+                print_response("🔁 Tidak ada siklus yang berjalan. Ketik 'siklus 4' untuk mulai!")
+            else:
+                message = result["message"]
+                if result["time_to_long_break"]:
+                    message += f" | long break dalam {result['time_to_long_break'] // 60} menit"
+                print_response(message)
+        
         elif command_type == "check_time":
-            result = get_remaining_time()
+            result = tools.get_remaining_time()
             if result["status"] == "idle":
                 print_response("⏳ Tidak ada timer yang berjalan. Ketik 'start 25' untuk mulai!")
             else:
@@ -80,7 +211,7 @@ class PomodoroApp:
                 print_response(response)
         
         elif command_type == "pause":
-            result = pause_pomodoro()
+            result = tools.pause_pomodoro()
             if result["status"] == "error":
                 print_response(result["message"])
             else:
@@ -88,7 +219,7 @@ class PomodoroApp:
                 print_response(response)
         
         elif command_type == "resume":
-            result = resume_pomodoro()
+            result = tools.resume_pomodoro()
             if result["status"] == "error":
                 print_response(result["message"])
             else:
@@ -96,7 +227,7 @@ class PomodoroApp:
                 print_response(response)
         
         elif command_type == "stop":
-            result = stop_pomodoro()
+            result = tools.stop_pomodoro()
             if result["status"] == "error":
                 print_response(result["message"])
             else:
@@ -106,11 +237,11 @@ class PomodoroApp:
         
         elif command_type == "motivation":
             from assistant import get_motivation_quote
-            quote = get_motivation_quote()
+            quote = get_motivation_quote(self.assistant.rng)
             print_response(f"{quote}")
         
         elif command_type == "stats":
-            result = get_session_statistics()
+            result = tools.get_session_statistics()
             if result["status"] == "no_data":
                 print_response("📊 Belum ada session. Mulai sekarang dengan 'start 25'!")
             else:
@@ -118,70 +249,187 @@ class PomodoroApp:
                     "stats",
                     total_sessions=result["total_sessions"],
                     total_minutes=result["total_minutes"],
-                    total_hours=result["total_hours"]
+                    total_hours=result["total_hours"],
+                    current_streak=result["current_streak"],
+                    median_minutes=result["median_minutes"],
+                    completion_percent=round(result["completion_rate"] * 100)
                 )
                 print_response(response)
         
+        elif command_type == "timeline":
+            result = tools.query_sessions(command_info["start"], command_info["end"])
+            lines = [result["message"]]
+            for session in result["sessions"]:
+                lines.append(f"   {session['started_at'][11:16]}-{session['timestamp'][11:16]}  "
+                             f"{session['duration_completed']:>3} menit  {session['status']}")
+            if result["truncated"]:
+                lines.append(f"   ... dan {result['count'] - len(result['sessions'])} lainnya")
+            print_response("\n".join(lines))
+        
+        elif command_type == "at":
+            result = tools.sessions_at(command_info["timestamp"])
+            print_response(result["message"])
+        
+        elif command_type == "perf":
+            self.show_performance(command_info["action"], command_info["count"])
+        
         elif command_type == "help":
             self.show_help()
         
         else:
             print_response("❓ Perintah tidak dikenali. Ketik 'help' untuk bantuan.")
     
+    def show_performance(self, action: str, count: int) -> None:
+        """
+        Perintah perf: tampilkan/nyalakan/matikan/reset metric, atau profile N command berikutnya
+        Args:
+            action (str): "show", "on", "off", "reset", atau "profile"
+            count (int): Jumlah command untuk profile
+        """
+        if action == "on":
+            metrics.enable()
+            print_response("📈 Instrumentasi latency aktif. Ketik 'perf' untuk melihat hasilnya.")
+            return
+        if action == "off":
+            metrics.enable(False)
+            print_response("📉 Instrumentasi latency nonaktif (hasil yang ada tetap tersimpan).")
+            return
+        if action == "reset":
+            metrics.reset()
+            print_response("🧹 Metric latency dikosongkan.")
+            return
+        if action == "profile":
+            metrics.profile_next(count, PROFILE_PATH)
+            print_response(f"🔬 {count} command berikutnya akan di-profile ke {PROFILE_PATH}")
+            return
+        
+        snapshot = metrics.snapshot()
+        if not snapshot["metrics"]:
+            state = "aktif" if snapshot["enabled"] else "nonaktif (ketik 'perf on')"
+            print_response(f"📈 Belum ada metric. Instrumentasi {state}.")
+            return
+        lines = [f"📈 Latency sejak {snapshot['since']} ({'aktif' if snapshot['enabled'] else 'nonaktif'})",
+                 f"   {'metric':<28}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        for kind, names in snapshot["metrics"].items():
+            for name, summary in names.items():
+                lines.append(f"   {kind + ':' + name:<28}{summary['count']:>8}{summary['p50_ms']:>10.3f}"
+                             f"{summary['p99_ms']:>10.3f}{summary['max_ms']:>10.3f}")
+        print_response("\n".join(lines))
+    
     def show_help(self) -> None:
         """Show help message"""
-        help_text = f"""
-{Colors.CYAN}{Colors.BOLD}📖 BANTUAN - Perintah Tersedia:{Colors.RESET}
-
-{Colors.GREEN}Mulai Timer:{Colors.RESET}
-  • 'Mulai pomodoro 25' atau 'start 25' - Timer 25 menit
-  • 'Mulai 30' - Timer 30 menit (sesuai kebutuhan)
-  • 'Mulai' - Timer default 25 menit
-
-{Colors.GREEN}Cek Waktu:{Colors.RESET}
-  • 'Berapa sisa?' atau 'time' - Lihat sisa waktu
-  • 'Progress' - Lihat progress bar
-
-{Colors.GREEN}Kontrol Timer:{Colors.RESET}
-  • 'Pause' atau 'jeda' - Jeda sebentar
-  • 'Resume' atau 'lanjut' - Lanjutkan timer
-  • 'Stop' atau 'henti' - Hentikan & reset
-
-{Colors.GREEN}Info:{Colors.RESET}
-  • 'Stats' atau 'statistik' - Lihat statistik
-  • 'Motivasi' - Dapatkan motivasi
-  • 'Help' atau '?' - Tampilkan bantuan ini
-  • 'Exit' atau 'quit' - Keluar aplikasi
-
-{Colors.YELLOW}Tips:{Colors.RESET}
-  • Gunakan Pomodoro 25 menit untuk hasil optimal
-  • Istirahat 5 menit setelah setiap session
-  • Konsisten adalah kunci kesuksesan! 💪
-
-{Colors.MAGENTA}Contoh session:{Colors.RESET}
-  1. 'Mulai 25' → Start 25 menit timer
-  2. 'Berapa sisa?' → Cek sisa waktu (berkali-kali)
-  3. 'Pause' → Jeda jika perlu
-  4. 'Resume' → Lanjut fokus
-  5. 'Stats' → Lihat progress harian
-"""
-        print(help_text)
+        print(HELP_TEXT)
     
     def shutdown(self) -> None:
         """Cleanup dan shutdown"""
         self.running = False
+        if self.dashboard is not None:
+            self.dashboard.stop()
+        if self._loader.is_alive():
+            self._loader.join()
+        if self._tools is not None:
+            self._tools.notifier.close(timeout=1.0)
+            self._tools.close_history()
         print_goodbye()
 
-# ENTRY POINT
-def main():
-    """Main entry point"""
+# BATCH MODE
+def run_batch() -> None:
+    """
+    Mode automation: tool call JSON Lines dari stdin, hasil JSON Lines ke stdout
+    Contoh: echo '{"name": "get_remaining_time", "input": {}}' | python main.py --batch
+    """
+    from tools import configure_history, close_history, execute_tools_batch
+    configure_history(HISTORY_DIR)
+    try:
+        execute_tools_batch(sys.stdin, sys.stdout)
+    finally:
+        close_history()
+
+# OFFLINE ANALYTICS
+def run_analyze(paths: list, workers: int = None, by_user: bool = False, by_day: bool = False) -> None:
+    """
+    Statistik dari file log history (paralel), hasil JSON ke stdout, throughput ke stderr
+    Contoh: python main.py --analyze /srv/pomodoro-logs --by-user --workers 8
+    """
+    import json
+    from analytics import analyze
+    result = analyze(paths, workers=workers, by_user=by_user, by_day=by_day)
+    json.dump(result, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    sys.stderr.write(f"📈 {result['rows']} rows dari {result['files']} file ({result['shards']} shard, "
+                     f"{result['workers']} worker) dalam {result['elapsed_seconds']} detik: "
+                     f"{result['rows_per_second']} rows/detik\n")
+
+# EXPORT / IMPORT
+def run_transfer(export_path: str = None, import_path: str = None, user_id: str = None) -> None:
+    """
+    Export/import history dalam format binary (export_format)
+    Contoh: python main.py --export backup.pms --user aisyah
+    """
+    from tools import configure_history, close_history, export_sessions, import_sessions
+    configure_history(HISTORY_DIR)
     try:
-        app = PomodoroApp()
+        if export_path:
+            result = export_sessions(export_path, user_id or DEFAULT_USER_ID)
+        else:
+            result = import_sessions(import_path, user_id)
+    finally:
+        close_history()
+    print_response(result["message"])
+    if result["status"] == "error":
+        sys.exit(1)
+
+# INTERACTIVE MODE
+def run_repl(live: bool = False) -> None:
+    """Mode interaktif (default)"""
+    try:
+        app = PomodoroApp(live=live)
         app.run()
     except Exception as e:
         print_error(f"Fatal error: {str(e)}")
         sys.exit(1)
 
+# ENTRY POINT
+def main():
+    """Main entry point"""
+    if len(sys.argv) == 1:
+        # Jalur tercepat ke prompt: REPL tanpa argumen tidak perlu argparse
+        run_repl()
+        return
+    
+    import argparse
+    parser = argparse.ArgumentParser(description="Pomodoro Productivity Timer")
+    parser.add_argument("--batch", action="store_true", help="Baca tool call JSON Lines dari stdin, tulis hasil ke stdout")
+    parser.add_argument("--daemon", action="store_true", help="Jalankan daemon di Unix socket (lihat client.py)")
+    parser.add_argument("--live", action="store_true", help="Tampilkan countdown live di atas REPL")
+    parser.add_argument("--analyze", nargs="+", metavar="PATH", help="Statistik offline dari file/directory log history")
+    parser.add_argument("--workers", type=int, help="Jumlah proses untuk --analyze (default: jumlah CPU)")
+    parser.add_argument("--by-user", action="store_true", help="--analyze: sertakan statistik per user")
+    parser.add_argument("--by-day", action="store_true", help="--analyze: sertakan rollup harian")
+    parser.add_argument("--export", metavar="FILE", help="Export history ke file binary")
+    parser.add_argument("--import", dest="import_file", metavar="FILE", help="Import history dari file binary")
+    parser.add_argument("--user", help="--export/--import: user_id (default: user lokal / user di file)")
+    args = parser.parse_args()
+    
+    if args.batch:
+        run_batch()
+        return
+    
+    if args.analyze:
+        run_analyze(args.analyze, args.workers, args.by_user, args.by_day)
+        return
+    
+    if args.export or args.import_file:
+        run_transfer(args.export, args.import_file, args.user)
+        return
+    
+    if args.daemon:
+        from daemon import serve
+        serve()
+        return
+    
+    run_repl(live=args.live)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,185 @@
+"""
+Instrumentasi latency: counter + histogram bucket tetap per command/tool
+Nonaktif secara default; call site cukup cek `metrics.enabled` (satu attribute lookup)
+sebelum mengambil waktu, jadi biaya saat mati hampir nol
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from config import METRICS_ENABLED
+
+if TYPE_CHECKING:
+    import cProfile
+
+# Batas atas bucket (nanodetik): 1-2-5 per dekade dari 1 mikrodetik sampai 10 detik
+BUCKET_BOUNDS_NS = tuple(
+    base * 10 ** exponent
+    for exponent in range(3, 10)
+    for base in (1, 2, 5)
+) + (10_000_000_000,)
+
+# LATENCY HISTOGRAM
+class LatencyHistogram:
+    """Histogram latency dengan bucket tetap (bucket terakhir = lebih dari batas terbesar)"""
+    __slots__ = ("count", "total_ns", "max_ns", "counts")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.counts = [0] * (len(BUCKET_BOUNDS_NS) + 1)
+
+    def record(self, elapsed_ns: int) -> None:
+        """Tambahkan satu sampel"""
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.counts[bisect_left(BUCKET_BOUNDS_NS, elapsed_ns)] += 1
+
+    def percentile(self, q: float) -> int:
+        """
+        Perkiraan percentile (batas atas bucket, dibatasi max)
+        Args:
+            q (float): Percentile 0-100
+        Returns:
+            int: Nanodetik (0 jika kosong)
+        """
+        if not self.count:
+            return 0
+        rank = max(self.count * q / 100, 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(BUCKET_BOUNDS_NS[index], self.max_ns) if index < len(BUCKET_BOUNDS_NS) else self.max_ns
+        return self.max_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Ringkasan dalam milidetik plus jumlah sampel per bucket (hanya bucket terisi)"""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ns / self.count / 1e6, 4) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) / 1e6, 4),
+            "p90_ms": round(self.percentile(90) / 1e6, 4),
+            "p99_ms": round(self.percentile(99) / 1e6, 4),
+            "max_ms": round(self.max_ns / 1e6, 4),
+            "buckets": {
+                (f"<={BUCKET_BOUNDS_NS[index] / 1e6:g}ms" if index < len(BUCKET_BOUNDS_NS) else "inf"): count
+                for index, count in enumerate(self.counts) if count
+            },
+        }
+
+# PERFORMANCE METRICS
+class PerformanceMetrics:
+    """
+    Histogram per (jenis, nama): command, parse, output, tool, lock
+    Plus profiler cProfile opsional untuk N command berikutnya
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        Args:
+            enabled (bool): Mulai dalam keadaan aktif
+        """
+        self.enabled = enabled
+        self.profiler: Optional["cProfile.Profile"] = None
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._since = time.time()
+        self._profile_remaining = 0
+        self._profile_path: Optional[str] = None
+
+    def enable(self, enabled: bool = True) -> None:
+        """Nyalakan/matikan pencatatan (histogram yang sudah ada dipertahankan)"""
+        self.enabled = enabled
+
+    def reset(self) -> None:
+        """Hapus semua histogram"""
+        with self._lock:
+            self._histograms = {}
+            self._since = time.time()
+
+    def record(self, kind: str, name: str, elapsed_ns: int) -> None:
+        """
+        Catat satu sampel (panggil hanya jika enabled)
+        Args:
+            kind (str): Jenis, mis. "command", "tool", "parse", "output", "lock"
+            name (str): Nama command/tool
+            elapsed_ns (int): Durasi dalam nanodetik
+        """
+        with self._lock:
+            histograms = self._histograms.get(kind)
+            if histograms is None:
+                histograms = self._histograms[kind] = {}
+            histogram = histograms.get(name)
+            if histogram is None:
+                histogram = histograms[name] = LatencyHistogram()
+            histogram.record(elapsed_ns)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Semua histogram dalam bentuk dict
+        Returns:
+            Dict enabled, since, seconds, metrics {jenis: {nama: ringkasan}}, profiling
+        """
+        with self._lock:
+            metrics = {
+                kind: {name: histograms[name].to_dict() for name in sorted(histograms)}
+                for kind, histograms in sorted(self._histograms.items())
+            }
+            since = self._since
+        return {
+            "enabled": self.enabled,
+            "since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(since)),
+            "seconds": round(time.time() - since, 1),
+            "metrics": metrics,
+            "profiling": {"remaining": self._profile_remaining, "path": self._profile_path} if self.profiler else None,
+        }
+
+    # PROFILER
+    def profile_next(self, count: int, path: str) -> None:
+        """
+        Profile N command berikutnya dengan cProfile, hasil ditulis ke path (format pstats)
+        Args:
+            count (int): Jumlah command
+            path (str): File output (buka dengan `python -m pstats path`)
+        """
+        import cProfile  # hanya saat profiling diminta (tidak dimuat saat startup)
+        self.profiler = cProfile.Profile()
+        self._profile_remaining = count
+        self._profile_path = os.path.abspath(path)
+
+    def profile_begin(self) -> bool:
+        """
+        Mulai profiling satu command
+        Returns:
+            True jika profile_next aktif (panggil profile_end setelah command selesai)
+        """
+        if self.profiler is None:
+            return False
+        self.profiler.enable()
+        return True
+
+    def profile_end(self) -> Optional[str]:
+        """
+        Akhiri profiling satu command
+        Returns:
+            Path file profile jika N command sudah terpenuhi dan file ditulis, selain itu None
+        """
+        profiler = self.profiler
+        if profiler is None:
+            return None
+        profiler.disable()
+        self._profile_remaining -= 1
+        if self._profile_remaining > 0:
+            return None
+        self.profiler = None
+        profiler.dump_stats(self._profile_path)
+        return self._profile_path
+
+# Instance global yang dipakai main.py, tools.py, dan registry.py
+metrics = PerformanceMetrics(METRICS_ENABLED)
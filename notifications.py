@@ -0,0 +1,256 @@
+"""
+Notification dispatcher untuk event timer (warning, complete, break_start, ...)
+Timer engine hanya memasukkan event ke antrian terbatas (tidak pernah blocking);
+satu thread dispatcher mengirimkan event ke sink dengan rate limit + coalescing
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+import queue
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple
+
+# EVENT
+class NotificationEvent:
+    """Satu event notifikasi"""
+    __slots__ = ("kind", "user_id", "message", "timestamp")
+
+    def __init__(self, kind: str, user_id: str, message: str):
+        self.kind = kind
+        self.user_id = user_id
+        self.message = message
+        self.timestamp = time.time()
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"kind": self.kind, "user_id": self.user_id, "message": self.message, "timestamp": self.timestamp}
+
+# SINKS
+class NotificationSink(ABC):
+    """
+    Base class sink (subclass wajib mengimplementasikan send)
+    Event dengan (kind, user_id) sama dalam coalesce_window dianggap duplikat dan dilewati;
+    selain itu maksimal rate_limit event per detik (token bucket)
+    """
+
+    def __init__(self, coalesce_window: float = 1.0, rate_limit: float = 5.0):
+        """
+        Args:
+            coalesce_window (float): Jendela duplikat dalam detik
+            rate_limit (float): Maksimal event per detik (juga ukuran burst)
+        """
+        self.coalesce_window = coalesce_window
+        self.rate_limit = rate_limit
+        self._last_sent: Dict[Tuple[str, str], float] = {}
+        self._tokens = rate_limit
+        self._refilled_at = time.monotonic()
+
+    def accept(self, event: NotificationEvent) -> bool:
+        """True jika event boleh dikirim (bukan duplikat dan masih dalam rate limit)"""
+        now = time.monotonic()
+        key = (event.kind, event.user_id)
+        last = self._last_sent.get(key)
+        if last is not None and now - last < self.coalesce_window:
+            return False
+
+        self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled_at) * self.rate_limit)
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+
+        self._last_sent[key] = now
+        if len(self._last_sent) > 4096:
+            self._last_sent = {k: t for k, t in self._last_sent.items() if now - t < self.coalesce_window}
+        return True
+
+    @abstractmethod
+    def send(self, event: NotificationEvent) -> None:
+        """Kirim event (dipanggil di thread dispatcher, boleh blocking)"""
+
+class TerminalBellSink(NotificationSink):
+    """Terminal bell (beep) untuk warning dan timer selesai"""
+
+    def __init__(self, stream: TextIO = sys.stdout, **kwargs):
+        # Beep warning tiap 0.5 detik tetap terdengar, hanya burst yang digabung
+        kwargs.setdefault("coalesce_window", 0.25)
+        super().__init__(**kwargs)
+        self.stream = stream
+
+    def send(self, event: NotificationEvent) -> None:
+        self.stream.write('\a')
+        self.stream.flush()
+
+class CommandSink(NotificationSink):
+    """
+    Jalankan command desktop notification, mis. ["notify-send", "Pomodoro", "{message}"]
+    Placeholder {kind}, {user_id}, {message} diganti per event
+    """
+
+    def __init__(self, command: Sequence[str], kinds: Optional[Sequence[str]] = None, timeout: float = 5.0, **kwargs):
+        """
+        Args:
+            command (Sequence[str]): Argumen command
+            kinds (Sequence[str]): Jenis event yang dikirim (None = semua kecuali warning)
+            timeout (float): Batas waktu command dalam detik
+        """
+        super().__init__(**kwargs)
+        self.command = list(command)
+        self.kinds = frozenset(kinds) if kinds is not None else None
+        self.timeout = timeout
+
+    def accept(self, event: NotificationEvent) -> bool:
+        if self.kinds is None:
+            if event.kind == "warning":
+                return False
+        elif event.kind not in self.kinds:
+            return False
+        return super().accept(event)
+
+    def send(self, event: NotificationEvent) -> None:
+        import subprocess  # dimuat saat sink dipakai, bukan saat startup
+        values = {"kind": event.kind, "user_id": event.user_id, "message": event.message}
+        subprocess.run([arg.format(**values) for arg in self.command], timeout=self.timeout,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+class FileSink(NotificationSink):
+    """Append event sebagai JSON Lines ke file"""
+
+    def __init__(self, path: str, **kwargs):
+        kwargs.setdefault("coalesce_window", 0.0)
+        kwargs.setdefault("rate_limit", 1000.0)
+        super().__init__(**kwargs)
+        self.path = path
+
+    def send(self, event: NotificationEvent) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event.to_dict(), ensure_ascii=False) + "\n")
+
+class WebhookSink(NotificationSink):
+    """
+    POST event JSON ke webhook lokal
+    URL http(s)://... untuk HTTP, atau unix:///path/socket untuk satu baris JSON ke Unix socket
+    """
+
+    def __init__(self, url: str, timeout: float = 2.0, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, event: NotificationEvent) -> None:
+        payload = json.dumps(event.to_dict(), ensure_ascii=False).encode("utf-8")
+        if self.url.startswith("unix://"):
+            import socket
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.url[len("unix://"):])
+                sock.sendall(payload + b"\n")
+            return
+        import urllib.request  # ~20ms import: hanya saat webhook pertama dikirim
+        request = urllib.request.Request(self.url, data=payload, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+# DISPATCHER
+class NotificationDispatcher:
+    """
+    Antrian event terbatas + satu thread dispatcher
+    emit() tidak pernah blocking: jika antrian penuh event dibuang dan dihitung
+    """
+
+    def __init__(self, sinks: Optional[List[NotificationSink]] = None, maxsize: int = 1024):
+        """
+        Args:
+            sinks (List[NotificationSink]): Sink awal
+            maxsize (int): Kapasitas antrian event
+        """
+        self.sinks: List[NotificationSink] = list(sinks or [])
+        self.dropped = 0
+        self.failed = 0
+        self._queue: "queue.Queue[Optional[NotificationEvent]]" = queue.Queue(maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self._stop: Optional[threading.Event] = None
+        self._lock = threading.Lock()
+
+    def add_sink(self, sink: NotificationSink) -> None:
+        """Tambahkan sink"""
+        with self._lock:
+            self.sinks = self.sinks + [sink]
+
+    def emit(self, kind: str, user_id: str, message: str = "") -> bool:
+        """
+        Antrikan event (aman dipanggil dari thread timer / event loop)
+        Args:
+            kind (str): Jenis event (warning, complete, break_start, ...)
+            user_id (str): User pemilik timer
+            message (str): Pesan untuk ditampilkan sink
+        Returns:
+            bool: False jika antrian penuh dan event dibuang
+        """
+        if not self.sinks:
+            return True
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(NotificationEvent(kind, user_id, message))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Kirim sisa event lalu hentikan thread dispatcher
+        Args:
+            timeout (float): Batas waktu total; jika antrian masih penuh (sink lambat),
+                thread berhenti setelah event yang sedang dikirim dan sisa antrian dibuang
+        """
+        if self._thread is None:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            self._stop.set()
+        self._thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+        self._thread = None
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._stop,), name="pomodoro-notify", daemon=True)
+                self._thread.start()
+
+    def _run(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            event = self._queue.get()
+            if event is None:
+                return
+            for sink in self.sinks:
+                try:
+                    if sink.accept(event):
+                        sink.send(event)
+                except Exception:
+                    self.failed += 1
+
+def sinks_from_config(command: Optional[str], path: Optional[str], webhook: Optional[str]) -> List[NotificationSink]:
+    """
+    Buat daftar sink dari nilai config (lihat config.NOTIFY_*)
+    Args:
+        command (str): Command desktop notification (dipisah spasi, boleh pakai {message})
+        path (str): File JSON Lines untuk log event
+        webhook (str): URL webhook (http:// atau unix://)
+    Returns:
+        List of NotificationSink
+    """
+    sinks: List[NotificationSink] = []
+    if command:
+        sinks.append(CommandSink(command.split()))
+    if path:
+        sinks.append(FileSink(os.path.expanduser(path)))
+    if webhook:
+        sinks.append(WebhookSink(webhook))
+    return sinks
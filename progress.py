@@ -0,0 +1,130 @@
+"""
+Progress subscription (push) untuk timer Pomodoro
+Subscriber hanya dibangunkan saat state timer berubah; event di-coalesce
+sehingga consumer lambat tidak pernah menumpuk antrian
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import asyncio
+
+# SUBSCRIPTION
+class ProgressSubscription:
+    """
+    Satu subscriber untuk timer satu user
+    Menyimpan satu event terakhir (bukan antrian): event baru menimpa yang lama
+    """
+    __slots__ = ("user_id", "_cond", "_event", "_version", "_loop", "_async_event")
+
+    def __init__(self, user_id: str, loop: Optional["asyncio.AbstractEventLoop"] = None):
+        """
+        Args:
+            user_id (str): ID user yang di-watch
+            loop (AbstractEventLoop): Event loop untuk subscriber async (None = sync)
+        """
+        self.user_id = user_id
+        self._cond = threading.Condition(threading.Lock())
+        self._event: Optional[Dict[str, Any]] = None
+        self._version = 0
+        self._loop = loop
+        self._async_event = None
+        if loop is not None:
+            import asyncio  # hanya untuk subscriber async (loop sudah berjalan)
+            self._async_event = asyncio.Event()
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Simpan event terbaru dan bangunkan subscriber (dipanggil dari thread mana pun)"""
+        with self._cond:
+            self._event = event
+            self._version += 1
+            self._cond.notify_all()
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._async_event.set)
+            except RuntimeError:
+                pass  # event loop sudah ditutup
+
+    def take(self) -> Optional[Dict[str, Any]]:
+        """Ambil dan kosongkan event yang tertunda"""
+        with self._cond:
+            event, self._event = self._event, None
+            return event
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Tunggu notifikasi (sync)
+        Args:
+            timeout (float): Batas tunggu dalam detik (None = tanpa batas)
+        Returns:
+            bool: True jika ada event baru
+        """
+        with self._cond:
+            if self._event is not None:
+                return True
+            return self._cond.wait_for(lambda: self._event is not None, timeout)
+
+    async def wait_async(self, timeout: Optional[float] = None) -> bool:
+        """Versi async dari wait()"""
+        import asyncio
+        if self._event is not None:
+            return True
+        self._async_event.clear()
+        if self._event is not None:
+            return True
+        try:
+            await asyncio.wait_for(self._async_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return self._event is not None
+        return True
+
+# HUB
+class ProgressHub:
+    """Registry subscriber per user; publish tanpa subscriber hanya satu lookup dict"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, List[ProgressSubscription]] = {}
+
+    def subscribe(self, user_id: str, loop: Optional["asyncio.AbstractEventLoop"] = None) -> ProgressSubscription:
+        """
+        Daftarkan subscriber baru
+        Args:
+            user_id (str): ID user yang di-watch
+            loop (AbstractEventLoop): Event loop untuk subscriber async
+        Returns:
+            ProgressSubscription
+        """
+        subscription = ProgressSubscription(user_id, loop)
+        with self._lock:
+            # Copy-on-write agar publish bisa iterasi tanpa lock
+            self._subscribers[user_id] = self._subscribers.get(user_id, []) + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: ProgressSubscription) -> None:
+        """Lepas subscriber"""
+        with self._lock:
+            remaining = [s for s in self._subscribers.get(subscription.user_id, []) if s is not subscription]
+            if remaining:
+                self._subscribers[subscription.user_id] = remaining
+            else:
+                self._subscribers.pop(subscription.user_id, None)
+
+    def has_subscribers(self, user_id: str) -> bool:
+        """True jika user punya subscriber"""
+        return user_id in self._subscribers
+
+    def publish(self, user_id: str, event: Dict[str, Any]) -> None:
+        """
+        Kirim event ke semua subscriber user
+        Args:
+            user_id (str): ID user
+            event (Dict): Event progress
+        """
+        for subscription in self._subscribers.get(user_id, ()):
+            subscription.publish(event)
+
+    def subscriber_count(self) -> int:
+        """Total subscriber aktif"""
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
@@ -0,0 +1,128 @@
+"""
+Session registry untuk banyak user dalam satu proses
+State timer per user disimpan di shard dengan lock masing-masing
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from columnar import ColumnarHistory
+from metrics import metrics
+from stats import SessionAggregates
+
+# TIMER SESSION
+class TimerSession:
+    """State timer satu user (compact, pakai __slots__)"""
+    __slots__ = (
+        "user_id",
+        "active",
+        "start_time",
+        "duration",
+        "duration_ns",
+        "deadline_ns",
+        "paused_ns",
+        "total_paused_ns",
+        "sessions_completed",
+        "total_focus_time",
+        "handle",
+        "scheduler",
+        "generation",
+        "cycle",
+        "phase",
+        "cycle_start_ns",
+        "history",
+        "stats",
+        "time_index",
+    )
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.active = False
+        self.start_time = None      # wall clock, hanya untuk ditampilkan
+        self.duration = 0           # dalam detik
+        self.duration_ns = 0        # durasi dalam nanodetik
+        self.deadline_ns = 0        # deadline time.monotonic_ns, digeser saat resume
+        self.paused_ns = 0          # time.monotonic_ns saat pause (0 = tidak pause)
+        self.total_paused_ns = 0
+        self.sessions_completed = 0
+        self.total_focus_time = 0   # dalam detik
+        self.handle = None          # jadwal aktif di scheduler
+        self.scheduler = None       # scheduler yang menjalankan timer aktif (thread atau asyncio)
+        self.generation = 0         # naik setiap jadwal baru, untuk buang callback basi
+        self.cycle = None           # CyclePlan jika timer bagian dari siklus otomatis
+        self.phase = 0              # index fase aktif di cycle
+        self.cycle_start_ns = 0     # awal run (time.monotonic_ns), digeser saat resume seperti deadline
+        self.history = ColumnarHistory()
+        self.stats = SessionAggregates()  # aggregates seluruh history (termasuk yang sudah tidak di memory)
+        self.time_index = None      # SessionTimeIndex untuk history, dibuat saat query pertama
+
+# SHARDED REGISTRY
+class _Shard:
+    """Satu shard: dict session + lock sendiri"""
+    __slots__ = ("lock", "sessions")
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.sessions: Dict[str, TimerSession] = {}
+
+class SessionRegistry:
+    """
+    Map user_id -> TimerSession dengan lock striping
+    Operasi untuk user di shard berbeda tidak saling menunggu
+    """
+
+    def __init__(self, shard_count: int = 32):
+        """
+        Args:
+            shard_count (int): Jumlah shard (lock) yang dipakai
+        """
+        self._shards = [_Shard() for _ in range(shard_count)]
+
+    def _shard_for(self, user_id: str) -> _Shard:
+        return self._shards[hash(user_id) % len(self._shards)]
+
+    @contextmanager
+    def session(self, user_id: str) -> Iterator[TimerSession]:
+        """
+        Ambil session user (dibuat jika belum ada) dengan lock shard dipegang
+        Args:
+            user_id (str): ID user/session
+        Yields:
+            TimerSession milik user
+        """
+        shard = self._shard_for(user_id)
+        if metrics.enabled:
+            started = time.perf_counter_ns()
+            shard.lock.acquire()
+            metrics.record("lock", "registry", time.perf_counter_ns() - started)
+        else:
+            shard.lock.acquire()
+        try:
+            state = shard.sessions.get(user_id)
+            if state is None:
+                state = shard.sessions[user_id] = TimerSession(user_id)
+            yield state
+        finally:
+            shard.lock.release()
+
+    def get(self, user_id: str) -> Optional[TimerSession]:
+        """
+        Ambil session tanpa membuat baru (tanpa lock, untuk read-only)
+        Args:
+            user_id (str): ID user/session
+        Returns:
+            TimerSession atau None
+        """
+        return self._shard_for(user_id).sessions.get(user_id)
+
+    def user_ids(self) -> List[str]:
+        """Daftar semua user_id yang terdaftar"""
+        result = []
+        for shard in self._shards:
+            with shard.lock:
+                result.extend(shard.sessions)
+        return result
+
+    def __len__(self) -> int:
+        return sum(len(shard.sessions) for shard in self._shards)
@@ -0,0 +1,116 @@
+"""
+Retention session history (memory tetap stabil untuk proses yang berjalan berbulan-bulan)
+Row detail hanya disimpan untuk N session / D hari terakhir. Row yang lebih lama sudah
+ter-rollup di SessionAggregates sejak di-add (total, bucket harian/mingguan/bulanan, sketch),
+jadi eviction cukup membuang row dari ColumnarHistory dan total stats tetap exact
+"""
+
+import time
+from typing import Dict, Optional
+from columnar import ColumnarHistory, ROW_SIZE
+
+_DAY_SECONDS = 86400
+
+# RETENTION POLICY
+class RetentionPolicy:
+    """
+    Batas row detail per user plus memory budget untuk semua user
+    Eviction memakai slack (hysteresis): history dipotong sekaligus saat melewati batas + slack,
+    bukan satu row setiap append
+    """
+    __slots__ = ("keep_sessions", "keep_days", "memory_budget", "slack")
+
+    def __init__(self, keep_sessions: Optional[int] = None, keep_days: Optional[float] = None,
+                 memory_budget: Optional[int] = None, slack: float = 0.1):
+        """
+        Args:
+            keep_sessions (int): Jumlah session terakhir per user (None = tanpa batas)
+            keep_days (float): Umur maksimal row dalam hari (None = tanpa batas)
+            memory_budget (int): Total byte row history di heap semua user (None = tanpa batas)
+            slack (float): Kelebihan relatif sebelum eviction dijalankan
+        """
+        self.keep_sessions = keep_sessions
+        self.keep_days = keep_days
+        self.memory_budget = memory_budget
+        self.slack = slack
+
+    def cutoff(self, history: ColumnarHistory, now: Optional[float] = None) -> int:
+        """
+        Index row pertama yang masih dipertahankan (tanpa slack)
+        Args:
+            history (ColumnarHistory): History satu user
+            now (float): Epoch sekarang (None = time.time())
+        Returns:
+            int: Row [0, cutoff) boleh di-evict
+        """
+        start = 0
+        if self.keep_sessions is not None:
+            start = max(len(history) - self.keep_sessions, 0)
+        if self.keep_days is not None:
+            now = time.time() if now is None else now
+            start = max(start, history.index_range(now - self.keep_days * _DAY_SECONDS)[0])
+        return start
+
+    def apply(self, history: ColumnarHistory, now: Optional[float] = None) -> Optional[ColumnarHistory]:
+        """
+        Evict row lama jika history melewati batas + slack
+        Args:
+            history (ColumnarHistory): History satu user
+            now (float): Epoch sekarang (None = time.time())
+        Returns:
+            ColumnarHistory baru tanpa row lama, atau None jika belum perlu eviction
+        """
+        rows = len(history)
+        if not rows:
+            return None
+        over_count = self.keep_sessions is not None and rows > self.keep_sessions * (1 + self.slack)
+        over_age = False
+        if self.keep_days is not None:
+            now = time.time() if now is None else now
+            over_age = history.row(0)[0] < now - self.keep_days * (1 + self.slack) * _DAY_SECONDS
+        if not (over_count or over_age):
+            return None
+        return history.tail(self.cutoff(history, now))
+
+    def over_budget(self, total_bytes: int) -> bool:
+        """True jika total byte history melewati memory budget + slack"""
+        return self.memory_budget is not None and total_bytes > self.memory_budget * (1 + self.slack)
+
+    def budget_cutoff(self, histories: Dict[str, ColumnarHistory]) -> Dict[str, int]:
+        """
+        Cutoff per user agar total row heap muat di memory budget (lihat ColumnarHistory.memory_usage)
+        Yang di-evict adalah row tertua secara global (satu batas waktu untuk semua user),
+        dicari dengan bisect atas timestamp. Cutoff yang hanya memotong row mmap dilewati
+        karena tidak membebaskan memory
+        Args:
+            histories (Dict[str, ColumnarHistory]): History per user
+        Returns:
+            Dict user_id -> index row pertama yang dipertahankan (hanya user yang perlu dipotong)
+        """
+        budget_rows = self.memory_budget // ROW_SIZE if self.memory_budget is not None else None
+        histories = {user_id: history for user_id, history in histories.items() if len(history) > history.mapped_rows}
+        if budget_rows is None or sum(len(history) - history.mapped_rows for history in histories.values()) <= budget_rows:
+            return {}
+
+        def kept(threshold: float) -> int:
+            return sum(len(history) - max(history.index_range(threshold)[0], history.mapped_rows)
+                       for history in histories.values())
+
+        # Cari batas waktu terkecil yang menyisakan <= budget_rows row
+        lo = min(history.row(0)[0] for history in histories.values())
+        hi = max(history.row(-1)[0] for history in histories.values()) + 1
+        for _ in range(64):
+            middle = (lo + hi) / 2
+            if middle in (lo, hi):
+                break
+            if kept(middle) > budget_rows:
+                lo = middle
+            else:
+                hi = middle
+
+        cutoffs = {}
+        for user_id, history in histories.items():
+            start = history.index_range(hi)[0]
+            if start > history.mapped_rows:
+                cutoffs[user_id] = start
+        return cutoffs
@@ -0,0 +1,244 @@
+"""
+Timer scheduler untuk banyak Pomodoro timer sekaligus
+Satu worker thread + min-heap berdasarkan deadline (clock.monotonic_ns)
+SimulatedScheduler: heap yang sama tanpa thread, untuk SimulatedClock
+"""
+
+import heapq
+import itertools
+import sys
+import threading
+from typing import Any, Callable, Optional
+from clock import SimulatedClock, SystemClock
+
+# TIMER HANDLE
+class TimerHandle:
+    """Handle untuk satu jadwal di scheduler (bisa di-cancel)"""
+    __slots__ = ("deadline", "callback", "cancelled")
+
+    def __init__(self, deadline: int, callback: Callable[[], None]):
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+# SCHEDULER
+class TimerScheduler:
+    """
+    Menjalankan callback pada deadline tertentu (nanodetik, clock.monotonic_ns)
+    Semua timer disimpan di satu min-heap, dilayani oleh satu worker thread
+    yang tidur sampai deadline terdekat dan hanya bangun saat timer expire
+    atau saat deadline terdekat berubah.
+    """
+
+    def __init__(self, clock: Any = None):
+        """
+        Inisialisasi scheduler (worker thread dibuat saat jadwal pertama)
+        Args:
+            clock: Sumber waktu dengan monotonic_ns() yang berjalan real-time (default: SystemClock)
+        """
+        self.clock = clock or SystemClock()
+        self._heap = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._cancelled = 0
+        self._running = True
+        self.failed = 0                                   # callback yang melempar exception
+        self.last_error: Optional[BaseException] = None
+
+    def schedule(self, delay_ns: int, callback: Callable[[], None]) -> TimerHandle:
+        """
+        Jadwalkan callback setelah delay tertentu
+        Args:
+            delay_ns (int): Jeda dalam nanodetik
+            callback (Callable): Fungsi tanpa argumen yang dipanggil di worker thread
+        Returns:
+            TimerHandle untuk cancel
+        """
+        return self.schedule_at(self.clock.monotonic_ns() + delay_ns, callback)
+
+    def schedule_at(self, deadline: int, callback: Callable[[], None]) -> TimerHandle:
+        """
+        Jadwalkan callback pada deadline absolut (nanodetik, clock.monotonic_ns)
+        Args:
+            deadline (int): Deadline absolut
+            callback (Callable): Fungsi tanpa argumen yang dipanggil di worker thread
+        Returns:
+            TimerHandle untuk cancel
+        Raises:
+            RuntimeError: Jika scheduler sudah di-shutdown
+        """
+        handle = TimerHandle(deadline, callback)
+        with self._cond:
+            if not self._running:
+                raise RuntimeError("Scheduler sudah di-shutdown")
+            heapq.heappush(self._heap, (deadline, next(self._counter), handle))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="pomodoro-scheduler", daemon=True)
+                self._thread.start()
+            elif self._heap[0][2] is handle:
+                # Deadline terdekat berubah, bangunkan worker
+                self._cond.notify()
+        return handle
+
+    def cancel(self, handle: Optional[TimerHandle]) -> bool:
+        """
+        Batalkan jadwal (lazy deletion, entry dibuang saat sampai di puncak heap)
+        Args:
+            handle (TimerHandle): Handle dari schedule()
+        Returns:
+            bool: True jika jadwal berhasil dibatalkan
+        """
+        if handle is None:
+            return False
+        with self._cond:
+            if handle.cancelled:
+                return False
+            handle.cancelled = True
+            self._cancelled += 1
+            # Buang entry mati jika sudah mendominasi heap
+            if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+                self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+                self._cond.notify()
+            elif self._heap and self._heap[0][2] is handle:
+                self._cond.notify()
+        return True
+
+    def shutdown(self) -> None:
+        """Hentikan worker thread dan buang semua jadwal (schedule() sesudahnya ditolak)"""
+        with self._cond:
+            self._running = False
+            self._heap.clear()
+            self._cancelled = 0
+            self._cond.notify()
+
+    def __len__(self) -> int:
+        """Jumlah jadwal aktif"""
+        with self._cond:
+            return len(self._heap) - self._cancelled
+
+    def _run(self) -> None:
+        """Worker loop: tidur sampai deadline terdekat, lalu jalankan callback"""
+        while True:
+            with self._cond:
+                while self._running:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    deadline, _, handle = self._heap[0]
+                    if handle.cancelled:
+                        heapq.heappop(self._heap)
+                        self._cancelled -= 1
+                        continue
+                    delay = deadline - self.clock.monotonic_ns()
+                    if delay > 0:
+                        self._cond.wait(delay / 1e9)
+                        continue
+                    heapq.heappop(self._heap)
+                    handle.cancelled = True
+                    break
+                else:
+                    self._thread = None
+                    return
+            # Callback dijalankan di luar lock agar bisa menjadwalkan ulang
+            try:
+                handle.callback()
+            except Exception as e:
+                import traceback
+                # Worker tetap jalan untuk timer lain, tapi kegagalan dicatat dan ditulis ke stderr
+                self.failed += 1
+                self.last_error = e
+                sys.stderr.write(f"⚠️ Callback scheduler gagal: {e!r}\n")
+                traceback.print_exc(file=sys.stderr)
+
+# SIMULATED SCHEDULER
+class SimulatedScheduler:
+    """
+    Scheduler tanpa thread untuk SimulatedClock (interface sama dengan TimerScheduler)
+    Callback hanya berjalan lewat run_next/run_until: jam virtual melompat langsung ke
+    deadline berikutnya, jadi simulasi berbulan-bulan selesai dalam hitungan detik.
+    Urutan deterministik: deadline, lalu urutan penjadwalan
+    """
+
+    def __init__(self, clock: Optional[SimulatedClock] = None):
+        """
+        Args:
+            clock (SimulatedClock): Jam virtual yang digerakkan scheduler ini
+        """
+        self.clock = clock or SimulatedClock()
+        self._heap = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self.executed = 0
+
+    def schedule(self, delay_ns: int, callback: Callable[[], None]) -> TimerHandle:
+        """Jadwalkan callback setelah delay (waktu virtual)"""
+        return self.schedule_at(self.clock.monotonic_ns() + delay_ns, callback)
+
+    def schedule_at(self, deadline: int, callback: Callable[[], None]) -> TimerHandle:
+        """Jadwalkan callback pada deadline absolut (nanodetik, clock.monotonic_ns)"""
+        handle = TimerHandle(deadline, callback)
+        heapq.heappush(self._heap, (deadline, next(self._counter), handle))
+        return handle
+
+    def cancel(self, handle: Optional[TimerHandle]) -> bool:
+        """Batalkan jadwal (lazy deletion)"""
+        if handle is None or handle.cancelled:
+            return False
+        handle.cancelled = True
+        self._cancelled += 1
+        return True
+
+    def next_deadline(self) -> Optional[int]:
+        """Deadline terdekat yang masih aktif (None jika kosong)"""
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+        return heap[0][0] if heap else None
+
+    def run_next(self) -> bool:
+        """
+        Lompat ke deadline terdekat dan jalankan callback-nya
+        Returns:
+            bool: False jika tidak ada jadwal lagi
+        """
+        deadline = self.next_deadline()
+        if deadline is None:
+            return False
+        _, _, handle = heapq.heappop(self._heap)
+        self.clock.advance_to(deadline)
+        handle.cancelled = True
+        self.executed += 1
+        handle.callback()
+        return True
+
+    def run_until(self, monotonic_ns: int) -> int:
+        """
+        Jalankan semua jadwal dengan deadline <= monotonic_ns, lalu majukan jam ke sana
+        Returns:
+            int: Jumlah callback yang dijalankan
+        """
+        executed = self.executed
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > monotonic_ns:
+                break
+            self.run_next()
+        self.clock.advance_to(monotonic_ns)
+        return self.executed - executed
+
+    def run_for(self, seconds: float) -> int:
+        """run_until untuk durasi virtual tertentu dari sekarang"""
+        return self.run_until(self.clock.monotonic_ns() + int(seconds * 1e9))
+
+    def shutdown(self) -> None:
+        """Buang semua jadwal"""
+        self._heap.clear()
+        self._cancelled = 0
+
+    def __len__(self) -> int:
+        """Jumlah jadwal aktif"""
+        return len(self._heap) - self._cancelled
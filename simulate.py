@@ -0,0 +1,206 @@
+"""
+Simulasi dipercepat di jam virtual (SimulatedClock + SimulatedScheduler)
+Ribuan user sintetis bekerja berhari-hari (mulai, cek waktu, pause/resume, stop, siklus);
+aksi user dan deadline timer ada di heap yang sama, jam melompat langsung ke event berikutnya.
+Deterministik untuk seed yang sama: cocok untuk membuat data history dan mengecek stats/expire
+
+    python simulate.py --users 1000 --days 30 --seed 1
+    python simulate.py --users 200 --days 30 --history /tmp/sim-history
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import tools
+from clock import SimulatedClock
+from config import SHORT_BREAK
+from notifications import NotificationDispatcher
+from scheduler import SimulatedScheduler
+
+_MINUTE_NS = 60 * 1_000_000_000
+
+# Perilaku user (probabilitas per cek waktu, durasi dalam menit)
+WORKDAY_START_HOUR = (8, 10)      # mulai kerja antara jam 8 dan 10
+SESSIONS_PER_DAY = (2, 10)
+DURATIONS = (25, 25, 25, 50, 15)
+CYCLE_CHANCE = 0.15               # mulai siklus 2-4 sesi, bukan satu timer
+CHECK_INTERVAL = (3, 15)
+PAUSE_CHANCE = 0.08
+PAUSE_LENGTH = (1, 10)
+STOP_CHANCE = 0.04
+BREAK_LENGTH = (SHORT_BREAK, 3 * SHORT_BREAK)
+SKIP_DAY_CHANCE = 0.1             # hari libur (streak putus)
+
+# SIMULATED USER
+class SimulatedUser:
+    """Satu user sintetis: state machine yang menjadwalkan aksi berikutnya di scheduler virtual"""
+    __slots__ = ("user_id", "rng", "scheduler", "paused", "running", "sessions_left", "actions", "errors")
+
+    def __init__(self, user_id: str, seed: int, scheduler: SimulatedScheduler):
+        self.user_id = user_id
+        self.rng = random.Random(seed)
+        self.scheduler = scheduler
+        self.paused = False
+        self.running = False
+        self.sessions_left = 0
+        self.actions = 0
+        self.errors = 0
+
+    def start_day(self) -> None:
+        """Jadwalkan mulai kerja hari berikutnya (atau hari ini jika belum lewat jam mulai)"""
+        now = self.scheduler.clock.now()
+        day = now.date()
+        while True:
+            start = datetime.combine(day, datetime.min.time()) + timedelta(
+                hours=self.rng.uniform(*WORKDAY_START_HOUR))
+            if start > now and self.rng.random() >= SKIP_DAY_CHANCE:
+                break
+            day += timedelta(days=1)
+        self.sessions_left = self.rng.randint(*SESSIONS_PER_DAY)
+        self._after((start - now).total_seconds() / 60)
+
+    def act(self) -> None:
+        """Satu aksi: cek waktu, lalu mulai/pause/resume/stop sesuai state"""
+        self.actions += 1
+        status = tools.get_remaining_time(self.user_id)["status"]
+        rng = self.rng
+
+        if status != "running":
+            if self.running:
+                # Timer selesai sejak cek terakhir: istirahat dulu
+                self.running = False
+                self._after(rng.uniform(*BREAK_LENGTH))
+                return
+            if self.sessions_left <= 0:
+                self.start_day()
+                return
+            if rng.random() < CYCLE_CHANCE:
+                result = tools.start_cycle(rng.randint(2, 4), user_id=self.user_id)
+            else:
+                result = tools.start_pomodoro(rng.choice(DURATIONS), self.user_id)
+            self._check(result)
+            self.sessions_left -= 1
+            self.running = True
+        elif self.paused:
+            self._check(tools.resume_pomodoro(self.user_id))
+            self.paused = False
+        else:
+            roll = rng.random()
+            if roll < PAUSE_CHANCE:
+                self._check(tools.pause_pomodoro(self.user_id))
+                self.paused = True
+                self._after(rng.uniform(*PAUSE_LENGTH))
+                return
+            if roll < PAUSE_CHANCE + STOP_CHANCE:
+                self._check(tools.stop_pomodoro(self.user_id))
+                self.running = False
+                self._after(rng.uniform(*BREAK_LENGTH))
+                return
+        self._after(rng.uniform(*CHECK_INTERVAL))
+
+    def _after(self, minutes: float) -> None:
+        self.scheduler.schedule(int(minutes * _MINUTE_NS), self.act)
+
+    def _check(self, result: Dict[str, Any]) -> None:
+        if result.get("status") == "error":
+            self.errors += 1
+
+# SIMULATION
+def simulate(users: int = 1000, days: float = 30, seed: int = 0, start: Optional[datetime] = None,
+             history_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Jalankan simulasi di jam virtual
+    Args:
+        users (int): Jumlah user sintetis
+        days (float): Lama simulasi (hari virtual)
+        seed (int): Seed perilaku user (hasil identik untuk seed yang sama)
+        start (datetime): Awal simulasi (default: tengah malam days hari yang lalu)
+        history_dir (str): Simpan history ke directory ini (persistent history), None = in-memory
+    Returns:
+        Dict sessions, minutes, expire check, checksum, events, speedup
+    """
+    if start is None:
+        start = datetime.combine((datetime.now() - timedelta(days=days)).date(), datetime.min.time())
+    clock = SimulatedClock(start.timestamp())
+    scheduler = SimulatedScheduler(clock)
+    previous = tools.use_clock(clock, scheduler)
+    # Tanpa sink: event notifikasi (warning, complete) tidak diantrikan
+    previous_notifier, tools.notifier = tools.notifier, NotificationDispatcher()
+    if history_dir is not None:
+        tools.configure_history(history_dir)
+
+    started = time.perf_counter()
+    try:
+        population = [SimulatedUser(f"sim-{seed}-{i}", seed * 1_000_003 + i, scheduler) for i in range(users)]
+        for user in population:
+            user.start_day()
+        end_ns = int(days * 86400 * 1e9)
+        scheduler.run_until(end_ns)
+        # Hentikan timer yang masih berjalan di akhir simulasi (tercatat sebagai stopped)
+        for user in population:
+            if tools.get_remaining_time(user.user_id)["status"] == "running":
+                tools.stop_pomodoro(user.user_id)
+        elapsed = time.perf_counter() - started
+
+        totals = {"sessions": 0, "minutes": 0, "completed": 0, "stopped": 0}
+        mismatches = 0
+        digest = hashlib.sha1()
+        for user in population:
+            with tools.registry.session(user.user_id) as state:
+                stats = state.stats
+                totals["sessions"] += stats.total_sessions
+                totals["minutes"] += stats.total_minutes
+                totals["completed"] += stats.completed_sessions
+                totals["stopped"] += stats.stopped_sessions
+                # Timer yang expire harus tercatat tepat selama durasi yang diminta
+                for _, requested, completed, status in state.history.iter_rows():
+                    if status == 0 and completed != requested:
+                        mismatches += 1
+                digest.update(json.dumps(stats.to_dict(), sort_keys=True).encode("utf-8"))
+    finally:
+        if history_dir is not None:
+            tools.close_history()
+        tools.notifier = previous_notifier
+        tools.use_clock(*previous)
+
+    simulated = end_ns / 1e9
+    return {
+        "users": users,
+        "days": days,
+        "seed": seed,
+        "start": start.isoformat(),
+        **totals,
+        "actions": sum(user.actions for user in population),
+        "errors": sum(user.errors for user in population),
+        "expiry_mismatches": mismatches,
+        "events": scheduler.executed,
+        "checksum": digest.hexdigest(),
+        "elapsed_seconds": round(elapsed, 3),
+        "speedup": round(simulated / elapsed) if elapsed > 0 else None,
+    }
+
+def main() -> None:
+    """Entry point CLI"""
+    parser = argparse.ArgumentParser(description="Simulasi Pomodoro dipercepat (jam virtual)")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Awal simulasi (ISO, default: days hari lalu)")
+    parser.add_argument("--history", help="Tulis history ke directory ini (format sama dengan ~/.pomodoro)")
+    args = parser.parse_args()
+
+    result = simulate(args.users, args.days, args.seed, args.start, args.history)
+    print(json.dumps(result, indent=2))
+    print(f"{result['sessions']} session, {result['events']} event dalam {result['elapsed_seconds']} detik "
+          f"(x{result['speedup']}), {result['errors']} error, {result['expiry_mismatches']} expire tidak tepat",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
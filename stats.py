@@ -0,0 +1,396 @@
+"""
+Statistik session incremental (O(1) per session baru)
+Total, bucket harian/mingguan/bulanan, dan sketch (quantile, streak, jam) di-update
+setiap session dicatat; ukuran sketch tetap kecil berapa pun panjang history
+"""
+
+import math
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+BUCKET_PERIODS = ("day", "week", "month")
+
+def bucket_keys(timestamp: str) -> Dict[str, str]:
+    """
+    Key bucket untuk timestamp ISO
+    Args:
+        timestamp (str): Timestamp ISO (YYYY-MM-DDTHH:MM:SS...)
+    Returns:
+        Dict {"day": "YYYY-MM-DD", "week": "YYYY-Www", "month": "YYYY-MM"}
+    """
+    return _day_keys(timestamp[:10])
+
+@lru_cache(maxsize=4096)
+def _day_keys(day: str) -> Dict[str, str]:
+    """bucket_keys per tanggal (di-cache: banyak session jatuh di hari yang sama)"""
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return {"day": day, "week": f"{year}-W{week:02d}", "month": day[:7]}
+
+@lru_cache(maxsize=4096)
+def _day_ordinal(day: str) -> int:
+    """Tanggal ISO -> date.toordinal() (di-cache)"""
+    return date.fromisoformat(day).toordinal()
+
+# SKETCHES
+class QuantileSketch:
+    """
+    Quantile sketch mergeable dengan ukuran terbatas
+    Menit bulat < EXACT_LIMIT dihitung exact (durasi Pomodoro hampir selalu di sini),
+    nilai lain masuk bucket logaritmik (gaya DDSketch) dengan error relatif <= accuracy
+    """
+    __slots__ = ("accuracy", "count", "exact", "bins", "_log_gamma")
+    EXACT_LIMIT = 256
+
+    def __init__(self, accuracy: float = 0.01):
+        """
+        Args:
+            accuracy (float): Error relatif maksimal untuk nilai di luar range exact
+        """
+        self.accuracy = accuracy
+        self.count = 0
+        self.exact: Dict[int, int] = {}
+        self.bins: Dict[int, int] = {}
+        self._log_gamma = math.log((1 + accuracy) / (1 - accuracy))
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Tambahkan nilai (count kali)"""
+        self.count += count
+        if value <= 0:
+            value = 0
+        if value < self.EXACT_LIMIT and value == int(value):
+            self.exact[int(value)] = self.exact.get(int(value), 0) + count
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + count
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Gabungkan sketch lain (accuracy harus sama)"""
+        self.count += other.count
+        for mine, theirs in ((self.exact, other.exact), (self.bins, other.bins)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimasi quantile
+        Args:
+            q (float): Quantile 0-1
+        Returns:
+            float (0.0 jika kosong)
+        """
+        if not self.count:
+            return 0.0
+        gamma = math.exp(self._log_gamma)
+        values = sorted(
+            [(float(value), count) for value, count in self.exact.items()]
+            + [(round(2 * gamma ** key / (gamma + 1), 1), count) for key, count in self.bins.items()]
+        )
+        rank = q * (self.count - 1)
+        seen = 0
+        for value, count in values:
+            seen += count
+            if rank < seen:
+                return value
+        return values[-1][0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialisasi JSON-friendly"""
+        return {"accuracy": self.accuracy, "count": self.count,
+                "exact": {str(key): count for key, count in self.exact.items()},
+                "bins": {str(key): count for key, count in self.bins.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        """Buat sketch dari hasil to_dict()"""
+        sketch = cls(data["accuracy"])
+        sketch.count = data["count"]
+        sketch.exact = {int(key): count for key, count in data["exact"].items()}
+        sketch.bins = {int(key): count for key, count in data["bins"].items()}
+        return sketch
+
+class StreakCounter:
+    """
+    Streak hari berturut-turut dari bitmap hari aktif (1 bit per hari, ~46 byte per tahun)
+    Bitmap digabung dengan OR sehingga merge exact walau range waktu tumpang tindih;
+    add urut waktu tetap O(1)
+    """
+    __slots__ = ("base", "bits", "last", "trailing", "longest")
+
+    def __init__(self):
+        self.base: Optional[int] = None   # ordinal hari untuk bit 0
+        self.bits = bytearray()
+        self.last: Optional[int] = None   # hari aktif terakhir
+        self.trailing = 0                 # streak yang berakhir di last
+        self.longest = 0
+
+    def add_day(self, day: int) -> None:
+        """
+        Tandai hari aktif
+        Args:
+            day (int): date.toordinal()
+        """
+        if self.base is None:
+            self.base = day
+        elif day < self.base:
+            shift = (self.base - day + 7) // 8
+            self.bits[0:0] = bytes(shift)
+            self.base -= shift * 8
+        offset = day - self.base
+        index = offset >> 3
+        if index >= len(self.bits):
+            self.bits.extend(bytes(index - len(self.bits) + 1))
+        mask = 1 << (offset & 7)
+        if self.bits[index] & mask:
+            return
+        self.bits[index] |= mask
+
+        if self.last is None or day > self.last + 1:
+            self.trailing = 1
+        elif day == self.last + 1:
+            self.trailing += 1
+        else:
+            self._recount()  # hari di masa lalu (tidak urut)
+            return
+        self.last = day
+        self.longest = max(self.longest, self.trailing)
+
+    def merge(self, other: "StreakCounter") -> None:
+        """Gabungkan counter lain (OR bitmap)"""
+        if other.base is None:
+            return
+        if self.base is None:
+            self.base, self.bits = other.base, bytearray(other.bits)
+        else:
+            base = min(self.base, other.base)
+            merged = self._shifted(base) | other._shifted(base)
+            self.base = base
+            self.bits = bytearray(merged.to_bytes((merged.bit_length() + 7) // 8, "little"))
+        self._recount()
+
+    def _shifted(self, base: int) -> int:
+        """Bitmap sebagai int dengan bit 0 = hari base"""
+        return int.from_bytes(self.bits, "little") << (self.base - base)
+
+    def _recount(self) -> None:
+        """Hitung ulang last/trailing/longest dari bitmap (O(jumlah hari), di C)"""
+        value = int.from_bytes(self.bits, "little")
+        if not value:
+            self.last, self.trailing, self.longest = None, 0, 0
+            return
+        text = format(value, "b")  # hari terbaru di depan
+        self.last = self.base + len(text) - 1
+        self.trailing = len(text) - len(text.lstrip("1"))
+        self.longest = max(map(len, text.split("0")))
+
+    def current(self, today: int) -> int:
+        """Streak yang masih berjalan (hari ini atau kemarin masih aktif)"""
+        if self.last is None or self.last < today - 1:
+            return 0
+        return self.trailing
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialisasi JSON-friendly (bitmap sebagai hex)"""
+        return {"base": self.base, "bits": self.bits.hex()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StreakCounter":
+        """Buat counter dari hasil to_dict()"""
+        counter = cls()
+        counter.base = data["base"]
+        counter.bits = bytearray.fromhex(data["bits"])
+        if counter.base is not None:
+            counter._recount()
+        return counter
+
+# AGGREGATES
+class SessionAggregates:
+    """Running aggregates untuk history satu user"""
+    __slots__ = (
+        "total_sessions",
+        "total_minutes",
+        "requested_minutes",
+        "completed_sessions",
+        "completed_minutes",
+        "stopped_sessions",
+        "buckets",
+        "lengths",
+        "streak",
+        "hours",
+    )
+    _SKETCHES = {"lengths": QuantileSketch, "streak": StreakCounter}
+
+    def __init__(self):
+        self.total_sessions = 0
+        self.total_minutes = 0        # menit yang benar-benar dikerjakan
+        self.requested_minutes = 0
+        self.completed_sessions = 0
+        self.completed_minutes = 0    # menit dari session yang selesai penuh
+        self.stopped_sessions = 0
+        # period -> key -> [sessions, minutes]
+        self.buckets: Dict[str, Dict[str, List[int]]] = {period: {} for period in BUCKET_PERIODS}
+        self.lengths = QuantileSketch()   # durasi session yang selesai penuh
+        self.streak = StreakCounter()     # hari dengan minimal satu session selesai
+        self.hours = [[0, 0] for _ in range(24)]  # jam -> [sessions, minutes]
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        """
+        Tambahkan satu session ke aggregates
+        Args:
+            entry (Dict): Entry history (timestamp, duration_requested, duration_completed, status)
+        """
+        timestamp = entry["timestamp"]
+        minutes = entry["duration_completed"]
+        requested = entry["duration_requested"]
+        keys = bucket_keys(timestamp)  # timestamp tidak valid gagal sebelum ada yang berubah
+        self.total_sessions += 1
+        self.total_minutes += minutes
+        self.requested_minutes += requested
+        if entry["status"] == "completed":
+            self.completed_sessions += 1
+            self.completed_minutes += minutes
+            self.lengths.add(minutes)
+            self.streak.add_day(_day_ordinal(timestamp[:10]))
+        else:
+            self.stopped_sessions += 1
+
+        for period, key in keys.items():
+            bucket = self.buckets[period].get(key)
+            if bucket is None:
+                self.buckets[period][key] = [1, minutes]
+            else:
+                bucket[0] += 1
+                bucket[1] += minutes
+        hour = self.hours[int(timestamp[11:13])]
+        hour[0] += 1
+        hour[1] += minutes
+
+    def merge(self, other: "SessionAggregates") -> None:
+        """Gabungkan aggregates lain (mis. hasil shard lain) ke aggregates ini"""
+        for slot in ("total_sessions", "total_minutes", "requested_minutes",
+                     "completed_sessions", "completed_minutes", "stopped_sessions"):
+            setattr(self, slot, getattr(self, slot) + getattr(other, slot))
+        for period, buckets in other.buckets.items():
+            mine = self.buckets[period]
+            for key, (sessions, minutes) in buckets.items():
+                bucket = mine.setdefault(key, [0, 0])
+                bucket[0] += sessions
+                bucket[1] += minutes
+        self.lengths.merge(other.lengths)
+        self.streak.merge(other.streak)
+        for hour, (sessions, minutes) in zip(self.hours, other.hours):
+            hour[0] += sessions
+            hour[1] += minutes
+
+    def copy(self) -> "SessionAggregates":
+        """Salinan independen (tidak berbagi bucket/sketch)"""
+        clone = SessionAggregates()
+        clone.merge(self)
+        return clone
+
+    def insights(self, today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Laporan dari sketch (tanpa scan history)
+        Args:
+            today (date): Tanggal acuan current streak (default: hari ini)
+        Returns:
+            Dict median/p90, completion_rate, streak, dan heatmap per jam
+        """
+        today = today or date.today()
+        peak = max(range(24), key=lambda hour: self.hours[hour][1])
+        return {
+            "median_minutes": self.lengths.quantile(0.5),
+            "p90_minutes": self.lengths.quantile(0.9),
+            "completion_rate": round(self.total_minutes / self.requested_minutes, 3) if self.requested_minutes else 0.0,
+            "current_streak": self.streak.current(today.toordinal()),
+            "longest_streak": self.streak.longest,
+            "hour_heatmap": [{"hour": hour, "sessions": sessions, "minutes": minutes}
+                             for hour, (sessions, minutes) in enumerate(self.hours)],
+            "peak_hour": peak if self.hours[peak][1] else None,
+        }
+
+    def bucket(self, period: str, key: str) -> Dict[str, int]:
+        """
+        Ambil satu bucket (0 jika kosong)
+        Args:
+            period (str): "day", "week", atau "month"
+            key (str): Key bucket (lihat bucket_keys)
+        Returns:
+            Dict {"sessions", "minutes"}
+        """
+        sessions, minutes = self.buckets[period].get(key, (0, 0))
+        return {"sessions": sessions, "minutes": minutes}
+
+    def series(self, period: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Daftar bucket untuk satu periode, urut dari yang paling baru
+        Args:
+            period (str): "day", "week", atau "month"
+            limit (int): Maksimal jumlah bucket
+        Returns:
+            List of {"period", "sessions", "minutes"}
+        """
+        keys = sorted(self.buckets[period], reverse=True)
+        if limit is not None:
+            keys = keys[:limit]
+        return [
+            {"period": key, "sessions": self.buckets[period][key][0], "minutes": self.buckets[period][key][1]}
+            for key in keys
+        ]
+
+    def report(self, period: Optional[str] = None, limit: Optional[int] = 20,
+               now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Statistik lengkap dalam format get_session_statistics
+        Args:
+            period (str): "day", "week", atau "month" untuk menyertakan rollup per periode
+            limit (int): Maksimal jumlah bucket (None = semua)
+            now (datetime): Acuan hari/minggu/bulan ini (default: sekarang)
+        Returns:
+            Dict statistics (status "no_data" jika belum ada session)
+        """
+        if not self.total_sessions:
+            return {
+                "status": "no_data",
+                "message": "📊 Belum ada session yang tercatat"
+            }
+        
+        now = now or datetime.now()
+        total_hours = round(self.total_minutes / 60, 2)
+        current = bucket_keys(now.isoformat())
+        result = {
+            "status": "success",
+            "total_sessions": self.total_sessions,
+            "total_minutes": self.total_minutes,
+            "total_hours": total_hours,
+            "requested_minutes": self.requested_minutes,
+            "completed_sessions": self.completed_sessions,
+            "stopped_sessions": self.stopped_sessions,
+            "today": self.bucket("day", current["day"]),
+            "this_week": self.bucket("week", current["week"]),
+            "this_month": self.bucket("month", current["month"]),
+            **self.insights(now.date()),
+            "message": f"📊 Total: {self.total_sessions} sessions, {self.total_minutes} menit ({total_hours} jam)"
+        }
+        if period is not None:
+            result["buckets"] = self.series(period, limit)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialisasi ke dict JSON-friendly (untuk snapshot)"""
+        data = {slot: getattr(self, slot) for slot in self.__slots__}
+        for slot in self._SKETCHES:
+            data[slot] = data[slot].to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SessionAggregates":
+        """Buat aggregates dari hasil to_dict()"""
+        aggregates = cls()
+        for slot in cls.__slots__:
+            if slot in data:
+                value = data[slot]
+                if slot in cls._SKETCHES:
+                    value = cls._SKETCHES[slot].from_dict(value)
+                setattr(aggregates, slot, value)
+        return aggregates
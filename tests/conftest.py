@@ -0,0 +1,45 @@
+"""
+Fixture bersama untuk test suite (jalankan dari root repo: python -m pytest -q)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tools
+from clock import SimulatedClock
+from notifications import NotificationDispatcher
+from progress import ProgressHub
+from registry import SessionRegistry
+from retention import RetentionPolicy
+from scheduler import SimulatedScheduler
+
+START = 1_700_000_000.0  # 2023-11-14, epoch awal jam virtual
+
+@pytest.fixture
+def engine(monkeypatch):
+    """
+    tools dengan state bersih: jam virtual, registry/progress hub baru, tanpa sink notifikasi,
+    tanpa retention; persistent history ditutup setelah test
+    Yields:
+        (SimulatedClock, SimulatedScheduler)
+    """
+    clock = SimulatedClock(START)
+    scheduler = SimulatedScheduler(clock)
+    monkeypatch.setattr(tools, "registry", SessionRegistry())
+    monkeypatch.setattr(tools, "progress_hub", ProgressHub())
+    monkeypatch.setattr(tools, "notifier", NotificationDispatcher())
+    monkeypatch.setattr(tools, "retention", RetentionPolicy())
+    previous = tools.use_clock(clock, scheduler)
+    try:
+        yield clock, scheduler
+    finally:
+        tools.close_history()
+        tools.use_clock(*previous)
+
+def minutes(count: float) -> int:
+    """Menit -> nanodetik (untuk SimulatedClock.advance)"""
+    return int(count * 60 * 1_000_000_000)
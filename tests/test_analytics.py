@@ -0,0 +1,72 @@
+"""Analytics offline: shard per byte range, map-reduce paralel, hasil sama dengan scan berurutan"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from analytics import aggregate_shard, analyze, collect_files, plan_shards
+from history_store import segment_name
+from stats import SessionAggregates
+
+def _records(count: int, user_id: str):
+    start = datetime(2024, 3, 1, 8, 0)
+    for i in range(count):
+        yield {"timestamp": (start + timedelta(hours=5 * i)).isoformat(), "duration_requested": 25,
+               "duration_completed": 25 if i % 4 else 10, "status": "completed" if i % 4 else "stopped",
+               "user_id": user_id}
+
+def _write(path, records, tail: bytes = b"") -> None:
+    with open(path, "wb") as f:
+        for record in records:
+            f.write(json.dumps(record).encode("utf-8") + b"\n")
+        f.write(tail)
+
+@pytest.fixture
+def logs(tmp_path):
+    """Dua directory mesin; satu baris rusak dan satu baris terpotong di akhir file"""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b" / "nested").mkdir(parents=True)
+    _write(tmp_path / "a" / segment_name(0), _records(120, "aisyah"), b"not json\n")
+    _write(tmp_path / "a" / segment_name(1), _records(30, "budi"))
+    _write(tmp_path / "b" / "nested" / segment_name(0), _records(80, "citra"), b'{"timestamp": "2024')
+    (tmp_path / "b" / "notes.txt").write_text("bukan log\n")
+    return tmp_path
+
+def _expected(*groups):
+    aggregates = SessionAggregates()
+    for count, user_id in groups:
+        for record in _records(count, user_id):
+            aggregates.add(record)
+    return aggregates
+
+def test_collect_files_is_recursive_and_sorted(logs):
+    files = collect_files([str(logs)])
+    assert [path[len(str(logs)):] for path in files] == [
+        "/a/history-00000000.log", "/a/history-00000001.log", "/b/nested/history-00000000.log"]
+
+def test_shards_split_lines_exactly_once(logs):
+    path = collect_files([str(logs / "a")])[0]
+    shards = plan_shards([path], chunk_size=100)
+    assert len(shards) > 10
+    rows = errors = 0
+    total = SessionAggregates()
+    for shard in shards:
+        shard_total, _, shard_rows, shard_errors = aggregate_shard(shard)
+        total.merge(shard_total)
+        rows += shard_rows
+        errors += shard_errors
+    assert (rows, errors) == (120, 1)
+    assert total.to_dict() == _expected((120, "aisyah")).to_dict()
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_analyze_matches_sequential_report(logs, workers):
+    result = analyze([str(logs)], workers=workers, by_user=True, by_day=True, chunk_size=512)
+    expected = _expected((120, "aisyah"), (30, "budi"), (80, "citra")).report("day", limit=None)
+    assert result["rows"] == 230
+    assert result["errors"] == 1
+    assert result["files"] == 3
+    for key in ("total_sessions", "total_minutes", "completed_sessions", "longest_streak", "median_minutes", "buckets"):
+        assert result[key] == expected[key]
+    assert sorted(result["users"]) == ["aisyah", "budi", "citra"]
+    assert result["users"]["budi"]["total_sessions"] == 30
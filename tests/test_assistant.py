@@ -0,0 +1,64 @@
+"""Parser command REPL (campuran Indonesia/Inggris)"""
+
+import pytest
+
+from assistant import create_assistant
+from config import MAX_TIMER_MINUTES
+from cycle import MAX_CYCLE_SESSIONS
+
+@pytest.fixture(scope="module")
+def assistant():
+    return create_assistant(seed=1)
+
+@pytest.mark.parametrize("text, command, duration", [
+    ("mulai 25", "start", 25),
+    ("dimulai 10", "start", 10),
+    ("memulai pomodoro 30", "start", 30),
+    ("timer25", "start", 25),
+    ("start", "start", 25),
+    ("start 0", "start", 1),
+    ("mulai 500", "start", 500),
+    ("mulai 99999", "start", MAX_TIMER_MINUTES),
+])
+def test_start_duration(assistant, text, command, duration):
+    result = assistant.parse_command(text)
+    assert result["type"] == command
+    assert result["duration"] == duration
+
+@pytest.mark.parametrize("text, command", [
+    ("berapa sisa waktu?", "check_time"),
+    ("jeda dulu", "pause"),
+    ("lanjutkan", "resume"),
+    ("melanjutkan", "resume"),
+    ("hentikan", "stop"),
+    ("dihentikan", "stop"),
+    ("berhenti sekarang", "stop"),
+    ("kasih semangat dong", "motivation"),
+    ("statistik minggu ini", "stats"),
+    ("?", "help"),
+    ("fase", "phase"),
+    ("pukul 10:30", "at"),
+    ("riwayat 2024-05-01", "timeline"),
+    ("perf on", "perf"),
+    ("stopwatch", "unknown"),
+    ("apa kabar", "unknown"),
+    ("", "unknown"),
+])
+def test_intent(assistant, text, command):
+    assert assistant.parse_command(text)["type"] == command
+
+def test_cycle_sessions_are_clamped(assistant):
+    assert assistant.parse_command("siklus 4")["sessions"] == 4
+    assert assistant.parse_command("siklus 0")["sessions"] == 1
+    assert assistant.parse_command("siklus 999")["sessions"] == MAX_CYCLE_SESSIONS
+
+def test_timeline_range(assistant):
+    result = assistant.parse_command("timeline 2024-05-01 09:00 12:00")
+    assert result["start"] == "2024-05-01T09:00"
+    assert result["end"] == "2024-05-01T12:00"
+
+def test_parser_limit_matches_tool_validator(assistant):
+    import tools
+    duration = assistant.parse_command("mulai 99999")["duration"]
+    assert tools.TOOL_VALIDATORS["start_pomodoro"]({"duration_minutes": duration}) is None
+    assert tools.TOOL_VALIDATORS["start_pomodoro"]({"duration_minutes": duration + 1}) is not None
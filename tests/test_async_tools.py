@@ -0,0 +1,102 @@
+"""Timer engine asyncio: AsyncioScheduler di atas loop.call_at dan async tool API"""
+
+import asyncio
+import json
+import threading
+
+import async_tools
+import tools
+
+def test_scheduler_fires_in_deadline_order(engine):
+    async def scenario():
+        scheduler = async_tools.get_scheduler()
+        assert async_tools.get_scheduler() is scheduler
+        fired = []
+        now = tools.clock.monotonic_ns()
+        scheduler.schedule_at(now + 30_000_000, lambda: fired.append("b"))
+        scheduler.schedule_at(now + 10_000_000, lambda: fired.append("a"))
+        cancelled = scheduler.schedule_at(now + 20_000_000, lambda: fired.append("x"))
+        assert scheduler.cancel(cancelled)
+        assert not scheduler.cancel(cancelled)
+        await asyncio.sleep(0.1)
+        return fired
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+
+def test_scheduler_accepts_other_threads(engine):
+    async def scenario():
+        scheduler = async_tools.get_scheduler()
+        done = asyncio.Event()
+        fired = []
+        deadline = tools.clock.monotonic_ns() + 10_000_000
+
+        def from_thread():
+            scheduler.schedule_at(deadline, done.set)
+            scheduler.cancel(scheduler.schedule_at(deadline, lambda: fired.append("x")))
+        thread = threading.Thread(target=from_thread)
+        thread.start()
+        thread.join()
+        await asyncio.wait_for(done.wait(), 5)
+        await asyncio.sleep(0.05)
+        return fired
+
+    assert asyncio.run(scenario()) == []
+
+def test_async_tools_share_state_with_sync_api(engine):
+    clock, _ = engine
+
+    async def scenario():
+        started = await async_tools.start_pomodoro(10, "a")
+        clock.advance(1_000_000_000)
+        remaining = await async_tools.get_remaining_time("a")
+        paused = await async_tools.pause_pomodoro("a")
+        resumed = await async_tools.resume_pomodoro("a")
+        stopped = await async_tools.stop_pomodoro("a")
+        return started, remaining, paused, resumed, stopped
+
+    started, remaining, paused, resumed, stopped = asyncio.run(scenario())
+    assert started["status"] == "success"
+    assert remaining["remaining"] == 599
+    assert (paused["status"], resumed["status"], stopped["status"]) == ("paused", "resumed", "stopped")
+    assert tools.get_remaining_time("a")["status"] == "idle"
+    with tools.registry.session("a") as state:
+        assert state.stats.total_sessions == 1
+
+def test_call_tool_validation_and_sync_fallback(engine):
+    async def scenario():
+        return (await async_tools.call_tool("start_pomodoro", {"duration_minutes": 0}),
+                await async_tools.call_tool("get_cycle_status", {"user_id": "a"}),
+                await async_tools.call_tool("nope", {}),
+                json.loads(await async_tools.execute_tool("start_pomodoro", {"duration_minutes": 5, "user_id": "a"})))
+
+    invalid, fallback, unknown, executed = asyncio.run(scenario())
+    assert "error" in invalid
+    assert fallback["status"] == "idle"
+    assert "error" in unknown
+    assert executed["status"] == "success"
+
+def test_watch_progress_until_completion(engine):
+    clock, _ = engine
+
+    async def scenario():
+        await async_tools.start_pomodoro(1, "w")
+        clock.advance(59_999_000_000)            # 1 ms sebelum deadline
+        statuses = []
+        async for event in async_tools.watch_progress("w"):
+            statuses.append(event["status"])
+            clock.advance(10_000_000)
+        return statuses
+
+    assert asyncio.run(asyncio.wait_for(scenario(), 5)) == ["running", "completed"]
+
+def test_watch_progress_wakes_on_stop(engine):
+    async def scenario():
+        await async_tools.start_pomodoro(25, "s")
+        statuses = []
+        async for event in async_tools.watch_progress("s"):
+            statuses.append(event["status"])
+            if event["status"] == "running":
+                await async_tools.stop_pomodoro("s")
+        return statuses
+
+    assert asyncio.run(asyncio.wait_for(scenario(), 5)) == ["running", "stopped"]
@@ -0,0 +1,73 @@
+"""ColumnarHistory: file round-trip, validasi row, eviction"""
+
+import pytest
+
+from columnar import MAX_MINUTES, ColumnarHistory, STATUS_CODES
+
+def _history(count: int, start: float = 1_700_000_000.0) -> ColumnarHistory:
+    history = ColumnarHistory()
+    for i in range(count):
+        history.append_row(start + i * 60, 25, i % 26, i % 2)
+    return history
+
+def test_save_open_round_trip(tmp_path):
+    history = _history(100)
+    path = str(tmp_path / "user.col")
+    history.save(path)
+
+    opened = ColumnarHistory.open(path)
+    assert len(opened) == 100
+    assert list(opened.iter_rows()) == list(history.iter_rows())
+
+    # Row baru di atas base mmap
+    opened.append_row(1_800_000_000.0, 50, 50, STATUS_CODES["completed"])
+    assert len(opened) == 101
+    assert opened.row(-1) == (1_800_000_000.0, 50, 50, 0)
+    assert opened.summary()["sessions"] == 101
+
+def test_open_empty_file(tmp_path):
+    path = str(tmp_path / "empty.col")
+    ColumnarHistory().save(path)
+    assert len(ColumnarHistory.open(path)) == 0
+
+def test_open_rejects_unknown_format(tmp_path):
+    path = tmp_path / "bogus.col"
+    path.write_bytes(b"XXXX" + bytes(64))
+    with pytest.raises(ValueError):
+        ColumnarHistory.open(str(path))
+
+@pytest.mark.parametrize("row", [
+    (1.0, -1, 0, 0),
+    (1.0, MAX_MINUTES + 1, 0, 0),
+    (1.0, 25, 70000, 0),
+    (1.0, 25, 25, len(STATUS_CODES)),
+])
+def test_append_row_rejects_out_of_range_without_misaligning(row):
+    history = _history(3)
+    with pytest.raises(ValueError):
+        history.append_row(*row)
+    assert len(history) == 3
+    assert {len(values) for values in history._tail.values()} == {3}
+    history.append_row(2.0e9, 25, 25, 0)
+    assert history.row(-1) == (2.0e9, 25, 25, 0)
+
+def test_tail_keeps_newest_rows(tmp_path):
+    path = str(tmp_path / "user.col")
+    _history(10).save(path)
+    history = ColumnarHistory.open(path)
+    history.append_row(1_800_000_000.0, 25, 25, 0)
+
+    trimmed = history.tail(8)
+    assert len(trimmed) == 3
+    assert list(trimmed.iter_rows()) == list(history.iter_rows(8))
+    assert len(history) == 11
+
+def test_index_range_bisects_base_and_tail(tmp_path):
+    path = str(tmp_path / "user.col")
+    _history(10).save(path)
+    history = ColumnarHistory.open(path)
+    for i in range(10, 20):
+        history.append_row(1_700_000_000.0 + i * 60, 25, 25, 0)
+
+    assert history.index_range(1_700_000_000.0 + 5 * 60, 1_700_000_000.0 + 15 * 60) == (5, 15)
+    assert history.index_range() == (0, 20)
@@ -0,0 +1,22 @@
+"""Cycle engine fokus/istirahat"""
+
+import pytest
+
+import tools
+from config import MAX_TIMER_MINUTES
+
+@pytest.mark.parametrize("focus", [-3, 0, MAX_TIMER_MINUTES + 1])
+def test_cycle_rejects_out_of_range_focus(engine, focus):
+    assert tools.start_cycle(4, focus, "u")["status"] == "error"
+    assert tools.get_cycle_status("u")["status"] == "idle"
+
+def test_cycle_runs_all_phases(engine):
+    clock, scheduler = engine
+    result = tools.start_cycle(2, 10, "u")
+    assert result["status"] == "success"
+    scheduler.run_for(24 * 3600)
+    assert tools.get_cycle_status("u")["status"] == "idle"
+    with tools.registry.session("u") as state:
+        assert state.stats.completed_sessions == 2
+        assert state.stats.completed_minutes == 20
+
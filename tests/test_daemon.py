@@ -0,0 +1,84 @@
+"""Daemon Unix socket dan client tipis"""
+
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+import client
+from daemon import create_server, handle_request, _remove_stale_socket
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "umask") or os.name == "nt", reason="butuh Unix domain socket")
+
+@pytest.fixture
+def server(engine, tmp_path):
+    """Daemon di thread terpisah, tools memakai jam virtual dari fixture engine"""
+    path = str(tmp_path / "d.sock")
+    daemon = create_server(path)
+    thread = threading.Thread(target=daemon.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield path
+    finally:
+        daemon.shutdown()
+        daemon.server_close()
+        thread.join(5)
+
+def test_handle_request_json_and_text(engine):
+    response = json.loads(handle_request(b'{"id": 7, "name": "start_pomodoro", "input": {"duration_minutes": 5, "user_id": "d"}}\n'))
+    assert response["id"] == 7
+    assert response["result"]["status"] == "success"
+
+    text = handle_request(b'{"name": "get_remaining_time", "input": {"user_id": "d"}, "reply": "text"}\n')
+    assert text.startswith("⏱️ 05:00".encode("utf-8"))
+    assert text.endswith(b"\n") and text.count(b"\n") == 1
+
+def test_handle_request_errors(engine):
+    assert json.loads(handle_request(b"not json\n"))["error"].startswith("Invalid JSON")
+    assert "error" in json.loads(handle_request(b"[1, 2]\n"))
+    response = json.loads(handle_request(b'{"id": 1, "name": "start_pomodoro", "input": {"duration_minutes": -5}}\n'))
+    assert response["id"] == 1 and "result" not in response
+    assert handle_request(b'{"name": "nope", "reply": "text"}\n').startswith("❌".encode("utf-8"))
+
+def test_socket_is_private_from_bind(server):
+    assert stat.S_IMODE(os.stat(server).st_mode) == 0o600
+    # umask proses dikembalikan setelah bind
+    current = os.umask(0o022)
+    os.umask(current)
+    assert current != 0o177
+
+def test_client_round_trip(server):
+    assert not client.send(client.build_request("start", ["10"], "c"), server).startswith("❌")
+    assert client.send(client.build_request("time", [], "c"), server).startswith("⏱️ 10:00")
+    assert not client.send(client.build_request("stop", [], "c"), server).startswith("❌")
+    assert client.send(client.build_request("time", [], "c"), server).startswith("⏳")
+
+def test_client_main(server, monkeypatch, capsys):
+    monkeypatch.setenv("POMODORO_SOCKET", server)
+    assert client.main(["--user", "m", "start", "3"]) == 0
+    assert client.main(["--user", "m", "time"]) == 0
+    assert "03:00" in capsys.readouterr().out
+    assert client.main(["start", "abc"]) == 2
+    assert client.main(["bogus"]) == 2
+
+def test_client_without_daemon(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("POMODORO_SOCKET", str(tmp_path / "missing.sock"))
+    assert client.main(["time"]) == 1
+    assert "Daemon tidak berjalan" in capsys.readouterr().err
+
+def test_build_request_is_valid_json():
+    request = json.loads(client.build_request("cycle", ["3"], 'a"b\\c'))
+    assert request == {"name": "start_cycle", "input": {"sessions": 3, "user_id": 'a"b\\c'}, "reply": "text"}
+    with pytest.raises(ValueError):
+        client.build_request("time", [], "tab\there")
+
+def test_stale_socket_is_replaced(server, tmp_path):
+    with pytest.raises(RuntimeError):
+        _remove_stale_socket(server)
+    stale = tmp_path / "stale.sock"
+    daemon = create_server(str(stale))
+    daemon.server_close()                     # file socket tertinggal tanpa listener
+    _remove_stale_socket(str(stale))
+    assert not stale.exists()
@@ -0,0 +1,62 @@
+"""Live dashboard: render cell dan redraw diferensial"""
+
+import io
+
+import tools
+from config import Colors, MAX_TIMER_MINUTES
+from conftest import minutes
+from dashboard import CELLS, LiveDashboard
+
+def _cell(dashboard, event, name):
+    return dict(dashboard.render(event))[name]
+
+def test_cells_do_not_overlap():
+    row_cells = sorted((col, col + width) for row, col, width in CELLS.values() if row == 1)
+    assert all(end < start for (_, end), (start, _) in zip(row_cells, row_cells[1:]))
+
+def test_time_cell_is_padded_to_longest_timer(engine):
+    clock, _ = engine
+    dashboard = LiveDashboard("d", io.StringIO())
+    tools.start_pomodoro(MAX_TIMER_MINUTES, "d")
+    longest = _cell(dashboard, tools.get_progress("d"), "time")
+    assert f"{MAX_TIMER_MINUTES}:00" in longest
+
+    clock.advance(minutes(MAX_TIMER_MINUTES - 100))
+    assert "100:00" in _cell(dashboard, tools.get_progress("d"), "time")
+    clock.advance(1_000_000_000)                              # 100:00 -> 99:59
+    shorter = _cell(dashboard, tools.get_progress("d"), "time")
+    assert "99:59" in shorter
+    assert len(shorter) == len(longest)
+    assert shorter.startswith(Colors.BOLD) and shorter.endswith(Colors.RESET)
+
+def test_draw_writes_only_changed_cells(engine):
+    clock, _ = engine
+    stream = io.StringIO()
+    dashboard = LiveDashboard("d", stream)
+    tools.start_pomodoro(25, "d")
+
+    dashboard.draw(tools.get_progress("d"))
+    first = stream.getvalue()
+    assert "25:00" in first and "BERJALAN" in first
+
+    dashboard.draw(tools.get_progress("d"))
+    assert stream.getvalue() == first           # tidak ada yang berubah, tidak ada write
+
+    clock.advance(minutes(0.5))
+    dashboard.draw(tools.get_progress("d"))
+    update = stream.getvalue()[len(first):]
+    assert "24:30" in update
+    assert "BERJALAN" not in update            # cell status tidak ditulis ulang
+
+def test_start_and_stop_restore_terminal(engine):
+    stream = io.StringIO()
+    dashboard = LiveDashboard("d", stream, max_fps=100)
+    dashboard.start()
+    tools.start_pomodoro(5, "d")
+    tools.stop_pomodoro("d")
+    dashboard.stop()
+    output = stream.getvalue()
+    assert output.startswith(Colors.CLEAR_SCREEN)
+    assert Colors.RESET_SCROLL_REGION in output
+    assert not dashboard._running
+    dashboard.stop()                           # idempotent
@@ -0,0 +1,94 @@
+"""Format export binary: round-trip, CRC, file rusak, import atomic"""
+
+import os
+
+import pytest
+
+import tools
+from export_format import RECORD, SessionFile, write_sessions
+
+ROWS = [(1_700_000_000.0 + i * 1800, 25, 25 - i % 3, i % 2) for i in range(50)]
+
+def _mapped(path: str) -> int:
+    """Jumlah mapping file ini di proses sekarang (Linux)"""
+    if not os.path.exists("/proc/self/maps"):
+        pytest.skip("butuh /proc/self/maps")
+    with open("/proc/self/maps") as f:
+        return sum(os.path.basename(path) in line for line in f)
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "backup.pms")
+    size = write_sessions(path, ROWS, len(ROWS), "aisyah")
+    assert size == os.path.getsize(path)
+
+    with SessionFile(path) as source:
+        assert source.user_id == "aisyah"
+        assert len(source) == len(ROWS)
+        assert list(source) == ROWS
+        assert source.record(49) == ROWS[49]
+
+def test_count_mismatch_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_sessions(str(tmp_path / "bad.pms"), ROWS, len(ROWS) + 1)
+
+@pytest.mark.parametrize("corrupt", ["crc", "magic", "truncate", "empty"])
+def test_corrupt_file_is_rejected_and_unmapped(tmp_path, corrupt):
+    path = str(tmp_path / "backup.pms")
+    write_sessions(path, ROWS, len(ROWS), "u")
+    data = bytearray(open(path, "rb").read())
+    if corrupt == "crc":
+        data[-20] ^= 0xFF          # byte record terakhir, trailer utuh
+    elif corrupt == "magic":
+        data[:4] = b"NOPE"
+    elif corrupt == "truncate":
+        data = data[:-RECORD.size]
+    else:
+        data = b""
+    with open(path, "wb") as f:
+        f.write(data)
+
+    with pytest.raises(ValueError):
+        SessionFile(path)
+    assert _mapped(path) == 0
+
+def test_close_is_idempotent(tmp_path):
+    path = str(tmp_path / "backup.pms")
+    write_sessions(path, ROWS, len(ROWS))
+    source = SessionFile(path)
+    source.close()
+    source.close()
+
+def test_export_import_round_trip(engine, tmp_path):
+    for _ in range(3):
+        tools.start_pomodoro(25, "a")
+        tools.stop_pomodoro("a")
+    path = str(tmp_path / "a.pms")
+    assert tools.export_sessions(path, "a")["sessions"] == 3
+
+    result = tools.import_sessions(path, "b")
+    assert result["status"] == "success"
+    with tools.registry.session("a") as a, tools.registry.session("b") as b:
+        assert list(a.history.iter_rows()) == list(b.history.iter_rows())
+        assert b.stats.total_sessions == 3
+
+@pytest.mark.parametrize("bad_row", [
+    (1_700_000_100.0, 25, 25, 7),      # status code tidak dikenal
+    (float("nan"), 25, 25, 0),         # timestamp bukan angka
+    (1e20, 25, 25, 0),                 # timestamp di luar jangkauan datetime
+])
+def test_import_with_bad_row_changes_nothing(engine, tmp_path, bad_row):
+    path = str(tmp_path / "bad.pms")
+    rows = [(1_700_000_000.0, 25, 25, 0), bad_row]
+    write_sessions(path, rows, len(rows), "u")   # CRC valid
+
+    result = tools.import_sessions(path, "u")
+    assert result["status"] == "error"
+    with tools.registry.session("u") as state:
+        assert len(state.history) == 0
+        assert state.stats.total_sessions == 0
+
+def test_import_rejects_unsorted_records(engine, tmp_path):
+    path = str(tmp_path / "unsorted.pms")
+    rows = [(1_700_000_100.0, 25, 25, 0), (1_700_000_000.0, 25, 25, 0)]
+    write_sessions(path, rows, len(rows))
+    assert tools.import_sessions(path, "u")["status"] == "error"
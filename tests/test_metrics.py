@@ -0,0 +1,74 @@
+"""Instrumentasi latency: histogram bucket, snapshot, call_tool, profiler"""
+
+import pstats
+
+import pytest
+
+import registry
+import tools
+from metrics import BUCKET_BOUNDS_NS, LatencyHistogram, PerformanceMetrics
+
+@pytest.fixture
+def metrics(monkeypatch):
+    """Instance metrics baru untuk tools dan registry"""
+    instance = PerformanceMetrics()
+    monkeypatch.setattr(tools, "metrics", instance)
+    monkeypatch.setattr(registry, "metrics", instance)
+    return instance
+
+def test_histogram_buckets_and_percentiles():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) == 0
+    for _ in range(90):
+        histogram.record(1_500)            # <= 2 µs
+    for _ in range(10):
+        histogram.record(3_000_000)        # <= 5 ms
+    histogram.record(20_000_000_000)       # di atas bucket terbesar
+
+    assert histogram.count == 101
+    assert histogram.percentile(50) == 2_000
+    assert histogram.percentile(95) == 5_000_000
+    assert histogram.percentile(100) == histogram.max_ns == 20_000_000_000
+    summary = histogram.to_dict()
+    assert summary["buckets"] == {"<=0.002ms": 90, "<=5ms": 10, "inf": 1}
+    assert summary["max_ms"] == 20_000.0
+
+def test_percentile_is_capped_by_max():
+    histogram = LatencyHistogram()
+    histogram.record(1_100)
+    assert histogram.percentile(99) == 1_100
+    assert BUCKET_BOUNDS_NS[0] == 1_000 and BUCKET_BOUNDS_NS[-1] == 10_000_000_000
+
+def test_call_tool_records_only_when_enabled(engine, metrics):
+    tools.call_tool("get_remaining_time", {"user_id": "m"})
+    assert metrics.snapshot()["metrics"] == {}
+
+    metrics.enable()
+    tools.call_tool("get_remaining_time", {"user_id": "m"})
+    tools.call_tool("start_pomodoro", {"duration_minutes": 5, "user_id": "m"})
+    tools.call_tool("start_pomodoro", {"duration_minutes": -5, "user_id": "m"})   # ditolak validator
+    snapshot = metrics.snapshot()
+    assert snapshot["enabled"] is True
+    assert snapshot["metrics"]["tool"]["get_remaining_time"]["count"] == 1
+    assert snapshot["metrics"]["tool"]["start_pomodoro"]["count"] == 1
+    assert snapshot["metrics"]["lock"]["registry"]["count"] >= 2
+
+def test_performance_tool_toggles_and_resets(metrics):
+    result = tools.get_performance_metrics(enabled=True)
+    assert result["status"] == "success" and metrics.enabled
+    metrics.record("command", "start", 1_000)
+    assert tools.get_performance_metrics(reset=True)["metrics"]["command"]["start"]["count"] == 1
+    assert tools.get_performance_metrics()["metrics"] == {}
+    tools.get_performance_metrics(enabled=False)
+    assert not metrics.enabled
+
+def test_profile_next_writes_after_count(metrics, tmp_path):
+    path = str(tmp_path / "profile.pstats")
+    assert not metrics.profile_begin()
+    metrics.profile_next(2, path)
+    for expected in (None, path):
+        assert metrics.profile_begin()
+        sum(range(1000))
+        assert metrics.profile_end() == expected
+    assert metrics.profiler is None
+    assert pstats.Stats(path).total_calls > 0
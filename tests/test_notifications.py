@@ -0,0 +1,98 @@
+"""Notification dispatcher: antrian terbatas, coalescing, rate limit, sink"""
+
+import io
+import json
+import threading
+import time
+
+import pytest
+
+from notifications import (CommandSink, FileSink, NotificationDispatcher, NotificationEvent, NotificationSink,
+                           TerminalBellSink, sinks_from_config)
+
+class RecordingSink(NotificationSink):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.events = []
+
+    def send(self, event):
+        self.events.append((event.kind, event.user_id, event.message))
+
+class BlockingSink(NotificationSink):
+    def __init__(self):
+        super().__init__(coalesce_window=0, rate_limit=1e9)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.sent = 0
+
+    def send(self, event):
+        self.entered.set()
+        self.release.wait(10)
+        self.sent += 1
+
+def test_sink_requires_send():
+    with pytest.raises(TypeError):
+        NotificationSink()
+
+def test_dispatch_coalesces_duplicates():
+    sink = RecordingSink(coalesce_window=60, rate_limit=100)
+    dispatcher = NotificationDispatcher([sink])
+    for _ in range(5):
+        dispatcher.emit("warning", "u", "beep")
+    dispatcher.emit("warning", "v", "beep")
+    dispatcher.emit("complete", "u", "selesai")
+    dispatcher.close(timeout=5)
+    assert sink.events == [("warning", "u", "beep"), ("warning", "v", "beep"), ("complete", "u", "selesai")]
+
+def test_rate_limit_is_token_bucket():
+    sink = RecordingSink(coalesce_window=0, rate_limit=3)
+    accepted = sum(sink.accept(NotificationEvent("complete", str(i), "")) for i in range(10))
+    assert accepted == 3
+
+def test_failing_sink_does_not_stop_others():
+    class Broken(NotificationSink):
+        def send(self, event):
+            raise OSError("sink mati")
+    sink = RecordingSink()
+    dispatcher = NotificationDispatcher([Broken(), sink])
+    dispatcher.emit("complete", "u")
+    dispatcher.close(timeout=5)
+    assert dispatcher.failed == 1
+    assert sink.events == [("complete", "u", "")]
+
+def test_full_queue_drops_instead_of_blocking():
+    sink = BlockingSink()
+    dispatcher = NotificationDispatcher([sink], maxsize=2)
+    results = [dispatcher.emit("complete", str(i)) for i in range(10)]
+    assert results.count(False) == dispatcher.dropped > 0
+    sink.release.set()
+    dispatcher.close(timeout=5)
+
+def test_close_with_full_queue_respects_timeout():
+    sink = BlockingSink()
+    dispatcher = NotificationDispatcher([sink], maxsize=2)
+    dispatcher.emit("complete", "first")
+    assert sink.entered.wait(5)              # thread dispatcher tertahan di sink lambat
+    for i in range(5):
+        dispatcher.emit("complete", str(i))
+
+    started = time.monotonic()
+    dispatcher.close(timeout=0.2)
+    assert time.monotonic() - started < 1.0
+    sink.release.set()
+
+def test_sinks_from_config(tmp_path):
+    path = tmp_path / "events.jsonl"
+    sinks = sinks_from_config("notify-send Pomodoro {message}", str(path), None)
+    assert [type(sink) for sink in sinks] == [CommandSink, FileSink]
+    assert not sinks[0].accept(NotificationEvent("warning", "u", ""))
+
+    dispatcher = NotificationDispatcher([sinks[1]])
+    dispatcher.emit("complete", "u", "Timer selesai")
+    dispatcher.close(timeout=5)
+    assert json.loads(path.read_text())["message"] == "Timer selesai"
+
+def test_terminal_bell():
+    stream = io.StringIO()
+    TerminalBellSink(stream).send(NotificationEvent("complete", "u", ""))
+    assert stream.getvalue() == "\a"
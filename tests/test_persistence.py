@@ -0,0 +1,191 @@
+"""Persistent history: replay log, snapshot columnar delta, recovery setelah restart"""
+
+import json
+import os
+
+import tools
+from conftest import minutes
+import pytest
+
+from history_store import HistoryStore, SNAPSHOT_FILE, list_segments, read_segment, segment_name
+from registry import SessionRegistry
+
+def _record(count: int, clock, user_id: str = "u") -> None:
+    for i in range(count):
+        tools.start_pomodoro(25, user_id)
+        if i % 3:
+            clock.advance(minutes(10))
+            tools.stop_pomodoro(user_id)
+        else:
+            clock.advance(minutes(26))
+            tools.get_remaining_time(user_id)     # timer lewat deadline -> completed
+
+def _rows(user_id: str = "u"):
+    with tools.registry.session(user_id) as state:
+        return list(state.history.iter_rows()), state.stats.to_dict()
+
+def _sync() -> None:
+    """Tunggu writer: flush kedua selesai setelah compaction yang dipicu batch sebelumnya"""
+    tools.history_store.flush()
+    tools.history_store.flush()
+
+def _restart(directory: str, monkeypatch) -> None:
+    tools.close_history()
+    monkeypatch.setattr(tools, "registry", SessionRegistry())
+    tools.configure_history(directory)
+
+def test_replay_log_without_snapshot(engine, tmp_path, monkeypatch):
+    clock, _ = engine
+    tools.configure_history(str(tmp_path))
+    _record(20, clock)
+    before = _rows()
+
+    _restart(str(tmp_path), monkeypatch)
+    assert not os.path.exists(tmp_path / SNAPSHOT_FILE)
+    assert _rows() == before
+
+def test_snapshots_write_deltas_and_recover(engine, tmp_path, monkeypatch):
+    clock, _ = engine
+    tools.configure_history(str(tmp_path))
+    tools.history_store.compact_every = 7
+    written = []
+    for _ in range(12):
+        _record(5, clock)
+        _record(2, clock, "other")
+        _sync()
+        with open(tmp_path / SNAPSHOT_FILE) as f:
+            written.append(json.load(f)["state"]["users"]["u"]["files"])
+    before, other = _rows(), _rows("other")
+    assert len(before[0]) == 60
+
+    # Jumlah file per user tetap logaritmik (delta kecil digabung)
+    assert all(len(files) <= 4 for files in written)
+    assert len(set(map(tuple, written))) > 1
+
+    _restart(str(tmp_path), monkeypatch)
+    assert _rows() == before
+    assert _rows("other") == other
+
+    # Setelah restart, snapshot berikutnya tetap konsisten
+    tools.history_store.compact_every = 1
+    _record(3, clock)
+    _sync()
+    expected = _rows()
+    _restart(str(tmp_path), monkeypatch)
+    assert _rows() == expected
+
+def test_orphan_columnar_files_are_removed(engine, tmp_path, monkeypatch):
+    clock, _ = engine
+    tools.configure_history(str(tmp_path))
+    tools.history_store.compact_every = 1
+    _record(4, clock)
+    _sync()
+    orphan = tmp_path / "deadbeef-99999999.col"
+    orphan.write_bytes(b"")
+
+    _restart(str(tmp_path), monkeypatch)
+    assert not orphan.exists()
+    with open(tmp_path / SNAPSHOT_FILE) as f:
+        for summary in json.load(f)["state"]["users"].values():
+            assert all((tmp_path / name).exists() for name in summary["files"])
+
+def test_truncated_log_line_is_skipped(tmp_path):
+    def fold(state, record):
+        state.setdefault("records", []).append(record)
+
+    store = HistoryStore(str(tmp_path), fold)
+    store.load()
+    store.append({"n": 1})
+    store.append({"n": 2})
+    store.close()
+    with open(tmp_path / segment_name(0), "ab") as f:
+        f.write(b'{"n": 3')            # crash di tengah baris
+
+    store = HistoryStore(str(tmp_path), fold)
+    assert store.load()["records"] == [{"n": 1}, {"n": 2}]
+    store.append({"n": 4})
+    store.close()
+    store = HistoryStore(str(tmp_path), fold)
+    assert store.load()["records"] == [{"n": 1}, {"n": 2}, {"n": 4}]
+    store.close()
+
+def test_writer_error_is_raised_instead_of_hanging(tmp_path):
+    def fold(state, record):
+        if record.get("bad"):
+            raise OSError(28, "No space left on device")
+
+    store = HistoryStore(str(tmp_path), fold)
+    store.load()
+    store.append({"n": 1})
+    assert store.flush(5)
+    store.append({"bad": True})
+    with pytest.raises(OSError):
+        store.flush(5)
+    with pytest.raises(OSError):
+        store.append({"n": 2})
+    with pytest.raises(OSError):
+        store.flush()
+    with pytest.raises(OSError):
+        store.close()
+
+def test_snapshot_failure_wakes_waiters(tmp_path):
+    def encode(state, directory):
+        raise OSError(5, "Input/output error")
+
+    store = HistoryStore(str(tmp_path), lambda state, record: None, compact_every=1, encode=encode)
+    store.load()
+    store.append({"n": 1})
+    store.flush(5)
+    with pytest.raises(OSError):
+        store.flush(5)
+    with pytest.raises(OSError):
+        store.close()
+
+def test_snapshotted_segments_are_deleted(tmp_path):
+    store = HistoryStore(str(tmp_path), lambda state, record: state.update(n=record["n"]), compact_every=2)
+    store.load()
+    for n in range(5):
+        store.append({"n": n})
+        store.flush()
+    store.close()
+    segments = list_segments(str(tmp_path))
+    with open(tmp_path / SNAPSHOT_FILE) as f:
+        snapshot = json.load(f)
+    assert all(seq > snapshot["segment"] for seq, _ in segments)
+    assert HistoryStore(str(tmp_path), lambda state, record: state.update(n=record["n"])).load() == {"n": 4}
+
+def test_keep_segments_archives_logs(tmp_path):
+    store = HistoryStore(str(tmp_path), lambda state, record: None, compact_every=1, keep_segments=True)
+    store.load()
+    for n in range(3):
+        store.append({"n": n})
+        store.flush()
+    store.close()
+    records = [record for _, path in list_segments(str(tmp_path)) for record in read_segment(path)]
+    assert records == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+def test_locked_garbage_is_removed_on_next_snapshot(engine, tmp_path, monkeypatch):
+    clock, _ = engine
+    tools.configure_history(str(tmp_path))
+    tools.history_store.compact_every = 1
+    _record(1, clock)
+    _sync()
+    locked = {name for name in os.listdir(tmp_path) if name.endswith(".col")}
+
+    # Windows: file yang masih di-mmap tidak bisa dihapus
+    remove = os.remove
+    def refuse(path):
+        if os.path.basename(path) in locked:
+            raise PermissionError(13, "file sedang dipakai", path)
+        remove(path)
+    monkeypatch.setattr(os, "remove", refuse)
+    for _ in range(3):
+        _record(1, clock)
+        _sync()
+    assert tools.history_store.error is None
+    assert locked <= set(os.listdir(tmp_path))
+
+    monkeypatch.setattr(os, "remove", remove)
+    _record(1, clock)
+    _sync()
+    assert not locked & set(os.listdir(tmp_path))
@@ -0,0 +1,72 @@
+"""Timer engine: deadline, pause/resume, progress push, penyelesaian timer"""
+
+import pytest
+
+import tools
+from conftest import minutes
+
+def test_timer_completes_once(engine):
+    clock, scheduler = engine
+    tools.start_pomodoro(25, "u")
+    clock.advance(minutes(30))
+    for _ in range(3):
+        tools.get_remaining_time("u")
+    scheduler.run_for(60)
+    with tools.registry.session("u") as state:
+        assert state.stats.total_sessions == 1
+        assert not state.active
+
+def test_failed_publish_still_resets_timer(engine, monkeypatch):
+    clock, _ = engine
+    subscription = tools.progress_hub.subscribe("u")
+    tools.start_pomodoro(1, "u")
+    clock.advance(minutes(2))
+
+    def broken(state, kind):
+        raise ZeroDivisionError
+    monkeypatch.setattr(tools, "_progress_event", broken)
+    with pytest.raises(ZeroDivisionError):
+        tools.get_remaining_time("u")
+    for _ in range(3):
+        assert tools.get_remaining_time("u")["status"] == "idle"
+    with tools.registry.session("u") as state:
+        assert state.stats.total_sessions == 1
+    tools.progress_hub.unsubscribe(subscription)
+
+def test_zero_duration_progress_event(engine):
+    with tools.registry.session("u") as state:
+        state.active = True
+        state.duration_ns = 0
+        state.deadline_ns = tools.clock.monotonic_ns()
+        assert tools._progress_event(state, None)["percentage"] == 100
+        state.active = False
+
+def test_progress_after_deadline_reports_completion(engine):
+    clock, _ = engine
+    tools.start_pomodoro(1, "u")
+    assert tools.get_progress("u")["status"] == "running"
+    clock.advance(minutes(1) + 1)          # callback scheduler belum jalan
+    event = tools.get_progress("u")
+    assert event["status"] == "completed"
+    assert event["percentage"] == 100
+    assert tools.get_progress("u")["status"] == "idle"
+
+def test_watch_progress_yields_complete_once(engine):
+    clock, _ = engine
+    tools.start_pomodoro(1, "u")
+    watcher = tools.watch_progress("u")
+    assert next(watcher)["status"] == "running"
+    clock.advance(minutes(2))
+    assert [event["status"] for event in watcher] == ["completed"]
+
+def test_pause_resume_shifts_deadline(engine):
+    clock, _ = engine
+    tools.start_pomodoro(10, "u")
+    clock.advance(minutes(4))
+    tools.pause_pomodoro("u")
+    clock.advance(minutes(60))
+    assert tools.get_remaining_time("u")["remaining"] == 6 * 60
+    tools.resume_pomodoro("u")
+    clock.advance(minutes(3))
+    assert tools.get_remaining_time("u")["remaining"] == 3 * 60
+
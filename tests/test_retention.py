@@ -0,0 +1,86 @@
+"""Retention: eviction row lama, statistik tetap utuh"""
+
+import tools
+from columnar import ColumnarHistory, ROW_SIZE
+from conftest import START, minutes
+from retention import RetentionPolicy
+
+DAY = 86400
+
+def _history(count: int, start: float = START, step: float = 3600) -> ColumnarHistory:
+    history = ColumnarHistory()
+    for i in range(count):
+        history.append_row(start + i * step, 25, 25, 0)
+    return history
+
+def test_keep_sessions_with_slack():
+    policy = RetentionPolicy(keep_sessions=100, slack=0.1)
+    assert policy.apply(_history(110)) is None
+    trimmed = policy.apply(_history(111))
+    assert len(trimmed) == 100
+    assert trimmed.row(0)[0] == START + 11 * 3600
+
+def test_keep_days():
+    policy = RetentionPolicy(keep_days=2, slack=0)
+    history = _history(24 * 5)
+    now = START + 5 * DAY
+    trimmed = policy.apply(history, now)
+    assert trimmed.row(0)[0] >= now - 2 * DAY
+    assert len(history) == 24 * 5
+
+def test_budget_cutoff_evicts_globally_oldest_rows():
+    old = _history(100, START)
+    new = _history(100, START + 1000 * 3600)
+    policy = RetentionPolicy(memory_budget=120 * ROW_SIZE)
+    cutoffs = policy.budget_cutoff({"old": old, "new": new})
+    kept = sum(len(history) - cutoffs.get(user_id, 0) for user_id, history in (("old", old), ("new", new)))
+    assert kept <= 120
+    assert "new" not in cutoffs
+    assert cutoffs["old"] == 80
+
+def test_enforce_retention_keeps_statistics(engine, monkeypatch):
+    clock, _ = engine
+    for _ in range(30):
+        tools.start_pomodoro(25, "u")
+        clock.advance(minutes(10))
+        tools.stop_pomodoro("u")
+    before = tools.get_session_statistics("u")
+
+    monkeypatch.setattr(tools, "retention", RetentionPolicy(keep_sessions=10, slack=0))
+    result = tools.enforce_retention()
+    assert result["evicted"] == 20
+
+    after = tools.get_session_statistics("u", include_history=True, limit=50)
+    assert after["total_sessions"] == before["total_sessions"] == 30
+    assert after["total_minutes"] == before["total_minutes"]
+    assert after["history_total"] == 10
+    assert after["history_evicted"] == 20
+
+def test_mapped_rows_do_not_count_against_budget(tmp_path):
+    path = str(tmp_path / "old.col")
+    _history(100).save(path)
+    mapped = ColumnarHistory.open(path)
+    for i in range(100, 110):
+        mapped.append_row(START + i * 3600, 25, 25, 0)
+    assert mapped.mapped_rows == 100
+    assert mapped.memory_usage() == 10 * ROW_SIZE
+
+    # Slice atas row mmap tetap berbagi mapping: tidak ada heap yang dibebaskan
+    assert mapped.tail(50).memory_usage() == 10 * ROW_SIZE
+    assert mapped.tail(105).memory_usage() == 5 * ROW_SIZE
+
+def test_budget_cutoff_only_frees_heap_rows(tmp_path):
+    path = str(tmp_path / "old.col")
+    _history(100).save(path)
+    mapped = ColumnarHistory.open(path)
+    for i in range(100, 130):
+        mapped.append_row(START + i * 3600, 25, 25, 0)
+    heap = _history(30, START + 200 * 3600)
+
+    policy = RetentionPolicy(memory_budget=100 * ROW_SIZE)
+    assert policy.budget_cutoff({"mapped": mapped, "heap": heap}) == {}
+
+    policy = RetentionPolicy(memory_budget=40 * ROW_SIZE)
+    cutoffs = policy.budget_cutoff({"mapped": mapped, "heap": heap})
+    assert cutoffs == {"mapped": 120}
+    assert mapped.tail(cutoffs["mapped"]).memory_usage() + heap.memory_usage() <= 40 * ROW_SIZE
@@ -0,0 +1,61 @@
+"""TimerScheduler (thread) dan SimulatedScheduler (jam virtual)"""
+
+import threading
+
+import pytest
+
+from clock import SimulatedClock
+from scheduler import SimulatedScheduler, TimerScheduler
+
+def test_failing_callback_is_reported_and_worker_survives(capsys):
+    scheduler = TimerScheduler()
+    done = threading.Event()
+    scheduler.schedule(0, lambda: 1 / 0)
+    scheduler.schedule(1_000_000, done.set)
+    try:
+        assert done.wait(5)
+        assert scheduler.failed == 1
+        assert isinstance(scheduler.last_error, ZeroDivisionError)
+        assert "ZeroDivisionError" in capsys.readouterr().err
+    finally:
+        scheduler.shutdown()
+
+def test_cancel_prevents_callback():
+    scheduler = TimerScheduler()
+    fired = []
+    done = threading.Event()
+    handle = scheduler.schedule(10_000_000, lambda: fired.append(1))
+    scheduler.cancel(handle)
+    scheduler.schedule(20_000_000, done.set)
+    try:
+        assert done.wait(5)
+        assert fired == []
+    finally:
+        scheduler.shutdown()
+
+def test_simulated_scheduler_order_and_clock():
+    clock = SimulatedClock(0)
+    scheduler = SimulatedScheduler(clock)
+    order = []
+    scheduler.schedule(30, lambda: order.append("c"))
+    scheduler.schedule(10, lambda: order.append("a"))
+    scheduler.schedule(10, lambda: order.append("b"))
+    cancelled = scheduler.schedule(20, lambda: order.append("x"))
+    scheduler.cancel(cancelled)
+
+    assert scheduler.run_until(25) == 2
+    assert order == ["a", "b"]
+    assert clock.monotonic_ns() == 25
+    assert scheduler.run_for(1) == 1
+    assert order == ["a", "b", "c"]
+    assert len(scheduler) == 0
+
+def test_schedule_after_shutdown_is_rejected():
+    scheduler = TimerScheduler()
+    done = threading.Event()
+    scheduler.schedule(0, done.set)
+    assert done.wait(5)
+    scheduler.shutdown()
+    with pytest.raises(RuntimeError):
+        scheduler.schedule(0, lambda: None)
+    assert len(scheduler) == 0
@@ -0,0 +1,96 @@
+"""Running aggregates dan sketch (quantile, streak, heatmap jam)"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from stats import QuantileSketch, SessionAggregates, StreakCounter
+
+def _entry(when: datetime, minutes: int, status: str = "completed"):
+    return {"timestamp": when.isoformat(), "duration_requested": 25, "duration_completed": minutes, "status": status}
+
+def test_quantile_exact_for_small_integers():
+    sketch = QuantileSketch()
+    for value in range(1, 101):
+        sketch.add(value)
+    assert sketch.quantile(0.5) == 50
+    assert sketch.quantile(0.9) == 90
+    assert QuantileSketch().quantile(0.5) == 0.0
+
+def test_quantile_relative_error_for_large_values():
+    sketch = QuantileSketch(accuracy=0.01)
+    values = [300 + i * 7.5 for i in range(1000)]
+    for value in values:
+        sketch.add(value)
+    expected = sorted(values)[int(0.9 * (len(values) - 1))]
+    assert sketch.quantile(0.9) == pytest.approx(expected, rel=0.02)
+
+def test_quantile_merge_and_round_trip():
+    left, right = QuantileSketch(), QuantileSketch()
+    for value in range(50):
+        left.add(value)
+    for value in (500.5, 1000.0):
+        right.add(value)
+    left.merge(right)
+    restored = QuantileSketch.from_dict(left.to_dict())
+    assert restored.count == 52
+    assert restored.quantile(0.5) == left.quantile(0.5)
+    assert restored.quantile(1.0) == left.quantile(1.0)
+
+def test_streak_counter():
+    counter = StreakCounter()
+    start = date(2024, 1, 1).toordinal()
+    for day in (0, 1, 2, 5, 6):
+        counter.add_day(start + day)
+    assert counter.longest == 3
+    assert counter.current(start + 6) == 2
+    assert counter.current(start + 7) == 2
+    assert counter.current(start + 8) == 0
+
+    # Merge exact walau urutan/rentang tumpang tindih
+    other = StreakCounter()
+    for day in (3, 4):
+        other.add_day(start + day)
+    counter.merge(other)
+    assert counter.longest == 7
+    restored = StreakCounter.from_dict(counter.to_dict())
+    assert restored.current(start + 6) == 7
+
+def test_aggregates_report_and_round_trip():
+    aggregates = SessionAggregates()
+    now = datetime(2024, 5, 14, 15, 0)
+    for days_ago in range(3):
+        for hour in (9, 10):
+            aggregates.add(_entry(now - timedelta(days=days_ago, hours=15 - hour), 25))
+    aggregates.add(_entry(now, 10, "stopped"))
+
+    report = aggregates.report("day", now=now)
+    assert report["total_sessions"] == 7
+    assert report["total_minutes"] == 160
+    assert report["today"] == {"sessions": 3, "minutes": 60}
+    assert report["current_streak"] == 3
+    assert report["median_minutes"] == 25
+    assert report["peak_hour"] in (9, 10)
+    assert [bucket["period"] for bucket in report["buckets"]] == ["2024-05-14", "2024-05-13", "2024-05-12"]
+
+    restored = SessionAggregates.from_dict(aggregates.to_dict())
+    assert restored.report("day", now=now) == report
+    assert aggregates.copy().to_dict() == aggregates.to_dict()
+
+def test_add_updates_sketches_by_status():
+    aggregates = SessionAggregates()
+    aggregates.add(_entry(datetime(2024, 5, 14, 9, 30), 10, "stopped"))
+    assert aggregates.hours[9] == [1, 10]
+    assert aggregates.lengths.count == 0
+    assert aggregates.streak.longest == 0
+
+    aggregates.add(_entry(datetime(2024, 5, 14, 9, 45), 25))
+    assert aggregates.hours[9] == [2, 35]
+    assert aggregates.lengths.count == 1
+    assert aggregates.streak.longest == 1
+
+def test_invalid_timestamp_changes_nothing():
+    aggregates = SessionAggregates()
+    with pytest.raises(ValueError):
+        aggregates.add({"timestamp": "bukan waktu", "duration_requested": 25, "duration_completed": 25, "status": "completed"})
+    assert aggregates.to_dict() == SessionAggregates().to_dict()
@@ -0,0 +1,83 @@
+"""Time index: overlap/at query di atas history, tool timeline"""
+
+from datetime import datetime
+
+import pytest
+
+import tools
+from columnar import ColumnarHistory
+from conftest import START
+from timeindex import SessionTimeIndex, index_for
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch).isoformat()
+
+@pytest.fixture
+def history():
+    """Session selesai tiap jam: 25 menit, kecuali row 3 yang berjalan 120 menit"""
+    history = ColumnarHistory()
+    for i in range(10):
+        history.append_row(START + (i + 1) * 3600, 25, 120 if i == 3 else 25, 0)
+    return history
+
+def test_overlapping_uses_longest_span(history):
+    index = SessionTimeIndex(history)
+    ended = START + 4 * 3600
+    # Row 3 mulai 120 menit sebelum selesai, jadi beririsan dengan jendela jauh sebelum waktu selesainya
+    assert index.overlapping(ended - 110 * 60, ended - 100 * 60) == [3]
+    assert index.overlapping(START, START + 3600 - 25 * 60) == []
+    assert index.overlapping(START, START + 10 * 3600 + 1) == list(range(10))
+
+def test_at_and_lazy_refresh(history):
+    index = SessionTimeIndex(history)
+    assert index.at(START + 3600 - 60) == [0]
+    assert index.at(START + 3600) == []                # end exclusive
+    history.append_row(START + 20 * 3600, 25, 300, 0)  # row baru di-index saat query berikutnya
+    assert index.at(START + 20 * 3600 - 250 * 60) == [10]
+    assert index.session(10)["started_at"] == _iso(START + 20 * 3600 - 300 * 60)
+
+def test_index_for_rebuilds_after_history_replaced(history):
+    index = index_for(history, None)
+    assert index_for(history, index) is index
+    assert index_for(history.tail(5), index) is not index
+
+def _complete(scheduler, count: int, user_id: str = "t") -> None:
+    """Session i berjalan [START + 30i menit, +25 menit)"""
+    for _ in range(count):
+        tools.start_pomodoro(25, user_id)
+        scheduler.run_for(30 * 60)
+
+def test_query_sessions_and_sessions_at(engine):
+    _, scheduler = engine
+    _complete(scheduler, 4)
+    result = tools.query_sessions(_iso(START + 20 * 60), _iso(START + 65 * 60), "t")
+    assert result["status"] == "success"
+    assert result["count"] == 3
+    assert result["total_minutes"] == 75
+
+    limited = tools.query_sessions(_iso(START), _iso(START + 4 * 3600), "t", limit=2)
+    assert limited["truncated"] and limited["total_minutes"] is None
+    assert len(limited["sessions"]) == 2
+
+    assert tools.sessions_at(_iso(START + 40 * 60), "t")["sessions"][0]["started_at"] == _iso(START + 30 * 60)
+    assert tools.sessions_at(_iso(START + 27 * 60), "t")["status"] == "no_data"
+
+def test_statistics_range(engine):
+    _, scheduler = engine
+    _complete(scheduler, 4)
+    result = tools.get_session_statistics("t", start=_iso(START + 30 * 60), end=_iso(START + 90 * 60))
+    assert result["range"]["sessions"] == 2
+    assert result["range"]["partial"] is False
+
+@pytest.mark.parametrize("tool, kwargs", [
+    (tools.get_session_statistics, {"start": "kemarin"}),
+    (tools.get_session_statistics, {"end": "2024-13-01"}),
+    (tools.query_sessions, {"start": "2024-05-01", "end": "bukan tanggal"}),
+    (tools.sessions_at, {"timestamp": "jam 9"}),
+])
+def test_invalid_time_returns_error(engine, tool, kwargs):
+    _, scheduler = engine
+    _complete(scheduler, 1)
+    result = tool(user_id="t", **kwargs)
+    assert result["status"] == "error"
+    assert "Format waktu" in result["message"]
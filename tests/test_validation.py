@@ -0,0 +1,50 @@
+"""Validasi input tool (range), batch JSON Lines API"""
+
+import io
+
+import pytest
+
+import tools
+from config import MAX_TIMER_MINUTES
+from conftest import minutes
+from cycle import MAX_CYCLE_SESSIONS
+
+@pytest.mark.parametrize("tool_name, tool_input", [
+    ("start_pomodoro", {"duration_minutes": -1}),
+    ("start_pomodoro", {"duration_minutes": 0}),
+    ("start_pomodoro", {"duration_minutes": 70000}),
+    ("start_pomodoro", {"duration_minutes": True}),
+    ("start_cycle", {"sessions": 0}),
+    ("start_cycle", {"sessions": MAX_CYCLE_SESSIONS + 1}),
+    ("start_cycle", {"focus_minutes": -3}),
+    ("start_cycle", {"focus_minutes": 0}),
+    ("get_session_statistics", {"offset": -1}),
+    ("get_session_statistics", {"limit": -5}),
+    ("query_sessions", {"start": "2024-01-01", "end": "2024-01-02", "limit": 0}),
+])
+def test_validator_rejects_out_of_range(engine, tool_name, tool_input):
+    assert "error" in tools.call_tool(tool_name, dict(tool_input, user_id="u"))
+    assert tools.get_remaining_time("u")["status"] == "idle"
+
+@pytest.mark.parametrize("duration", [-1, 0, MAX_TIMER_MINUTES + 1, 70000])
+def test_engine_rejects_out_of_range_duration(engine, duration):
+    assert tools.start_pomodoro(duration, "u")["status"] == "error"
+    assert tools.get_remaining_time("u")["status"] == "idle"
+    assert tools.stop_pomodoro("u")["status"] == "error"
+
+def test_max_duration_round_trip(engine):
+    clock, _ = engine
+    assert tools.start_pomodoro(MAX_TIMER_MINUTES, "u")["status"] == "success"
+    clock.advance(minutes(MAX_TIMER_MINUTES + 1))
+    assert tools.get_remaining_time("u")["status"] == "completed"
+    with tools.registry.session("u") as state:
+        assert state.history.row(-1)[1:] == (MAX_TIMER_MINUTES, MAX_TIMER_MINUTES, 0)
+
+def test_batch_api(engine):
+    calls = io.StringIO('{"id": 1, "name": "start_pomodoro", "input": {"duration_minutes": 5, "user_id": "b"}}\n'
+                        '{"id": 2, "name": "start_pomodoro", "input": {"duration_minutes": -5}}\n'
+                        'not json\n')
+    output = io.StringIO()
+    assert tools.execute_tools_batch(calls, output) == 3
+    lines = output.getvalue().splitlines()
+    assert '"result"' in lines[0] and '"error"' in lines[1] and '"error"' in lines[2]
@@ -0,0 +1,84 @@
+"""
+Time index untuk session history (timeline query)
+Row ColumnarHistory sudah urut menurut waktu selesai, jadi range query cukup bisect.
+Interval session = [selesai - menit completed, selesai) (pause tidak dihitung);
+overlap query memakai durasi session terpanjang sebagai batas jendela bisect
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from columnar import ColumnarHistory
+
+# SESSION TIME INDEX
+class SessionTimeIndex:
+    """
+    Interval index di atas ColumnarHistory (tanpa copy data)
+    Hanya menyimpan durasi terpanjang; row baru di-index lazily saat query berikutnya
+    """
+    __slots__ = ("history", "_indexed", "_max_span")
+
+    def __init__(self, history: ColumnarHistory):
+        """
+        Args:
+            history (ColumnarHistory): History yang di-index
+        """
+        self.history = history
+        self._indexed = 0
+        self._max_span = 0.0  # durasi session terpanjang (detik)
+
+    def _refresh(self) -> None:
+        """Perbarui durasi terpanjang dengan row yang di-append sejak query terakhir"""
+        rows = len(self.history)
+        if rows > self._indexed:
+            self._max_span = max(self._max_span, self.history.maximum("completed", self._indexed, rows) * 60.0)
+            self._indexed = rows
+
+    def overlapping(self, start_ts: float, end_ts: float) -> List[int]:
+        """
+        Index row yang interval-nya beririsan dengan [start_ts, end_ts)
+        Kandidat: selesai di [start_ts, end_ts + durasi terpanjang), O(log n + k)
+        Args:
+            start_ts (float): Epoch awal
+            end_ts (float): Epoch akhir (exclusive)
+        Returns:
+            List index row, urut waktu selesai
+        """
+        self._refresh()
+        lo, hi = self.history.index_range(start_ts, end_ts + self._max_span + 1)
+        matches = []
+        for index, (ended, _, completed, _) in zip(range(lo, hi), self.history.iter_rows(lo, hi)):
+            if ended > start_ts and ended - completed * 60 < end_ts:
+                matches.append(index)
+        return matches
+
+    def at(self, timestamp: float) -> List[int]:
+        """
+        Index row yang sedang berjalan pada timestamp (mulai <= timestamp < selesai)
+        Args:
+            timestamp (float): Epoch
+        Returns:
+            List index row
+        """
+        self._refresh()
+        lo, hi = self.history.index_range(timestamp, timestamp + self._max_span + 1)
+        return [
+            index for index, (ended, _, completed, _) in zip(range(lo, hi), self.history.iter_rows(lo, hi))
+            if ended - completed * 60 <= timestamp < ended
+        ]
+
+    def session(self, index: int) -> Dict[str, Any]:
+        """Entry history (format dict tools.py) plus started_at ISO"""
+        entry = self.history.entry(index)
+        ended, _, completed, _ = self.history.row(index)
+        entry["started_at"] = _iso(ended - completed * 60)
+        return entry
+
+def _iso(timestamp: float) -> str:
+    """Epoch -> ISO local time"""
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+def index_for(history: ColumnarHistory, index: Optional[SessionTimeIndex]) -> SessionTimeIndex:
+    """Index yang masih cocok untuk history ini, atau index baru jika history sudah diganti"""
+    if index is None or index.history is not history:
+        return SessionTimeIndex(history)
+    return index
@@ -3,299 +3,1308 @@ Custom tools/functions untuk Pomodoro Timer
 Backend logic untuk timer management
 """
 
-import threading
-import time
-import sys
+import os
 import json
-from datetime import datetime, timedelta
-from typing import Dict, Any
-
-# Global Timer State
-timer_state = {
-    "active": False,
-    "start_time": None,
-    "duration": 0,
-    "paused_time": None,
-    "total_paused": 0,
-    "sessions_completed": 0,
-    "total_focus_time": 0,  # dalam detik
-}
+import math
+import time
+import atexit
+import itertools
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional, TextIO, Tuple
+from clock import SystemClock
+from columnar import ColumnarHistory, check_row, row_entry, to_epoch
+from cycle import CyclePlan, MAX_CYCLE_SESSIONS, PHASE_FOCUS, PHASE_LABELS, PHASE_NAMES
+from config import (DEFAULT_USER_ID, POMODORO_DURATION, MAX_TIMER_MINUTES, SESSIONS_UNTIL_LONG_BREAK, NOTIFY_COMMAND, NOTIFY_FILE, NOTIFY_WEBHOOK,
+                    HISTORY_KEEP_SESSIONS, HISTORY_KEEP_DAYS, HISTORY_MEMORY_BUDGET, HISTORY_KEEP_LOGS)
+from export_format import SessionFile, write_sessions
+from history_store import HistoryStore
+from metrics import metrics
+from notifications import NotificationDispatcher, TerminalBellSink, sinks_from_config
+from progress import ProgressHub
+from stats import BUCKET_PERIODS, SessionAggregates
+from registry import SessionRegistry, TimerSession
+from retention import RetentionPolicy
+from scheduler import TimerScheduler
+from timeindex import index_for
+
+# Registry state timer per user (sharded, thread-safe)
+registry = SessionRegistry()
+
+# Persistent history (None = history hanya in-memory)
+history_store: Optional[HistoryStore] = None
+
+# Retention row detail history (row lama tetap terhitung di stats)
+retention = RetentionPolicy(HISTORY_KEEP_SESSIONS, HISTORY_KEEP_DAYS, HISTORY_MEMORY_BUDGET)
+BUDGET_CHECK_INTERVAL = 1024  # cek memory budget semua user setiap n session tercatat
+SNAPSHOT_MERGE_RATIO = 4      # file columnar delta digabung jika file sebelumnya < 4x total sesudahnya
+_recorded = itertools.count(1)
+
+# Subscriber progress (push, bukan polling)
+progress_hub = ProgressHub()
+
+# Notifikasi (warning, complete) lewat antrian; sink berjalan di thread dispatcher
+notifier = NotificationDispatcher([TerminalBellSink()] + sinks_from_config(NOTIFY_COMMAND, NOTIFY_FILE, NOTIFY_WEBHOOK))
+
+# Sumber waktu timer dan history (bisa diganti, lihat use_clock)
+clock = SystemClock()
+
+# Satu scheduler untuk semua timer (tidak ada thread per timer)
+scheduler = TimerScheduler(clock)
+WARNING_WINDOW = 5        # detik terakhir dengan beep
+WARNING_INTERVAL = 0.5    # jarak antar beep di warning window
+_NS = 1_000_000_000
+_WARNING_WINDOW_NS = WARNING_WINDOW * _NS
+_WARNING_INTERVAL_NS = int(WARNING_INTERVAL * _NS)
 
-session_history = []
+# Progress bar untuk setiap persentase (0-100), dibuat sekali saja
+PROGRESS_BAR_LENGTH = 20
+PROGRESS_BARS = tuple(
+    "[" + "█" * (PROGRESS_BAR_LENGTH * p // 100) + "░" * (PROGRESS_BAR_LENGTH - PROGRESS_BAR_LENGTH * p // 100) + f"] {p}%"
+    for p in range(101)
+)
 
 # POMODORO TOOLS
-def start_pomodoro(duration_minutes: int) -> Dict[str, Any]:
+def start_pomodoro(duration_minutes: int, user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
     """
     Mulai Pomodoro timer dengan durasi tertentu
     Args:
         duration_minutes (int): Durasi dalam menit (default: 25)
+        user_id (str): ID user/session pemilik timer
     Returns:
         Dict dengan status dan metadata
     """
-    if timer_state["active"]:
-        remaining = get_remaining_time()["remaining"]
+    return start_timer(duration_minutes, user_id, scheduler)
+
+def start_timer(duration_minutes: int, user_id: str, timer_scheduler: Any,
+                cycle: Optional[CyclePlan] = None) -> Dict[str, Any]:
+    """
+    Implementasi start_pomodoro dengan scheduler tertentu (thread atau asyncio)
+    Args:
+        duration_minutes (int): Durasi dalam menit
+        user_id (str): ID user/session pemilik timer
+        timer_scheduler: Objek dengan schedule_at(deadline_ns, callback) dan cancel(handle)
+        cycle (CyclePlan): Timeline siklus jika timer berpindah fase otomatis
+    Returns:
+        Dict dengan status dan metadata
+    """
+    if not 1 <= duration_minutes <= MAX_TIMER_MINUTES:
         return {
             "status": "error",
-            "message": f"⚠️ Timer sudah berjalan! Sisa: {remaining} detik"
+            "message": f"❌ Durasi harus 1-{MAX_TIMER_MINUTES} menit"
         }
     
-    timer_state["active"] = True
-    timer_state["start_time"] = datetime.now()
-    timer_state["duration"] = duration_minutes * 60
-    timer_state["total_paused"] = 0
-    
-    # Start background thread untuk countdown
-    threading.Thread(target=_timer_countdown, daemon=True).start()
+    with registry.session(user_id) as state:
+        if state.active:
+            remaining = _remaining_info(state)["remaining"]
+            return {
+                "status": "error",
+                "message": f"⚠️ Timer sudah berjalan! Sisa: {remaining} detik"
+            }
+        
+        state.active = True
+        state.start_time = clock.now()
+        state.duration = duration_minutes * 60
+        state.duration_ns = state.duration * _NS if cycle is None else cycle.ends[0]
+        state.cycle_start_ns = clock.monotonic_ns()
+        state.deadline_ns = state.cycle_start_ns + state.duration_ns
+        state.total_paused_ns = 0
+        state.paused_ns = 0
+        state.scheduler = timer_scheduler
+        state.cycle = cycle
+        state.phase = 0
+        
+        # Jadwalkan countdown di scheduler
+        _schedule_timer_event(state)
+        _publish_progress(state, "start")
+        
+        return {
+            "status": "success",
+            "message": f"✅ Pomodoro dimulai! Durasi: {duration_minutes} menit",
+            "start_time": state.start_time.isoformat(),
+            "duration_seconds": state.duration
+        }
+
+def start_cycle(sessions: int = SESSIONS_UNTIL_LONG_BREAK, focus_minutes: int = POMODORO_DURATION,
+                user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
+    """
+    Mulai siklus otomatis fokus/short break/long break (durasi break dari config)
+    Args:
+        sessions (int): Jumlah sesi fokus dalam siklus
+        focus_minutes (int): Durasi satu sesi fokus dalam menit
+        user_id (str): ID user/session pemilik timer
+    Returns:
+        Dict dengan status, metadata, dan posisi siklus
+    """
+    return start_cycle_timer(sessions, focus_minutes, user_id, scheduler)
+
+def start_cycle_timer(sessions: int, focus_minutes: int, user_id: str, timer_scheduler: Any) -> Dict[str, Any]:
+    """
+    Implementasi start_cycle dengan scheduler tertentu (thread atau asyncio)
+    Args:
+        sessions (int): Jumlah sesi fokus dalam siklus
+        focus_minutes (int): Durasi satu sesi fokus dalam menit
+        user_id (str): ID user/session pemilik timer
+        timer_scheduler: Objek dengan schedule_at(deadline_ns, callback) dan cancel(handle)
+    Returns:
+        Dict dengan status, metadata, dan posisi siklus
+    """
+    if not 1 <= sessions <= MAX_CYCLE_SESSIONS:
+        return {
+            "status": "error",
+            "message": f"❌ Jumlah sesi harus 1-{MAX_CYCLE_SESSIONS}"
+        }
+    if not 1 <= focus_minutes <= MAX_TIMER_MINUTES:
+        return {
+            "status": "error",
+            "message": f"❌ Durasi fokus harus 1-{MAX_TIMER_MINUTES} menit"
+        }
     
-    return {
-        "status": "success",
-        "message": f"✅ Pomodoro dimulai! Durasi: {duration_minutes} menit",
-        "start_time": timer_state["start_time"].isoformat(),
-        "duration_seconds": timer_state["duration"]
-    }
+    plan = CyclePlan(sessions, focus_minutes)
+    result = start_timer(focus_minutes, user_id, timer_scheduler, plan)
+    if result["status"] == "success":
+        result["message"] = (f"🔁 Siklus dimulai! {sessions} sesi × {focus_minutes} menit, "
+                             f"selesai dalam {plan.total_ns // (60 * _NS)} menit")
+        result["cycle"] = plan.status(0, 0)
+    return result
+
+def get_cycle_status(user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
+    """
+    Posisi siklus saat ini: fase sekarang, fase berikutnya, waktu sampai long break
+    Args:
+        user_id (str): ID user/session pemilik timer
+    Returns:
+        Dict dengan status dan posisi siklus (waktu dalam detik)
+    """
+    with registry.session(user_id) as state:
+        if not state.active or state.cycle is None:
+            return {
+                "status": "idle",
+                "message": "🔁 Tidak ada siklus yang berjalan"
+            }
+        
+        result = state.cycle.status(_cycle_offset_ns(state, clock.monotonic_ns()), state.phase)
+        minutes, seconds = divmod(result["phase_remaining"], 60)
+        result["status"] = "paused" if state.paused_ns else "running"
+        result["message"] = (f"{PHASE_LABELS[state.cycle.kinds[state.phase]]} "
+                             f"({result['focus_completed']}/{result['sessions']} sesi), sisa {minutes:02d}:{seconds:02d}")
+        return result
 
-def get_remaining_time() -> Dict[str, Any]:
+def get_remaining_time(user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
     """
     Dapatkan sisa waktu timer yang sedang berjalan
+    Args:
+        user_id (str): ID user/session pemilik timer
     Returns:
         Dict dengan status, remaining time, dan progress bar
     """
-    if not timer_state["active"]:
+    with registry.session(user_id) as state:
+        return _remaining_info(state)
+
+def stop_pomodoro(user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
+    """
+    Hentikan dan reset timer
+    Args:
+        user_id (str): ID user/session pemilik timer
+    Returns:
+        Dict dengan status dan waktu yang sudah dikerjakan
+    """
+    with registry.session(user_id) as state:
+        if not state.active:
+            return {
+                "status": "error",
+                "message": "❌ Tidak ada timer yang sedang berjalan"
+            }
+        
+        minutes_completed = _elapsed_ns(state, clock.monotonic_ns()) // (60 * _NS)
+        
+        # Save to history (break dalam siklus bukan sesi fokus)
+        if _in_focus(state):
+            _record_session(state, minutes_completed, "stopped")
+        else:
+            minutes_completed = 0
+        _publish_progress(state, "stop")
+        _reset_timer(state)
+        
         return {
-            "status": "idle",
-            "message": "⏳ Tidak ada timer yang berjalan",
-            "remaining": 0
+            "status": "stopped",
+            "message": f"⏹️ Timer dihentikan. Selesai {minutes_completed} menit.",
+            "time_completed": minutes_completed
         }
-    
-    elapsed = (datetime.now() - timer_state["start_time"]).total_seconds() - timer_state["total_paused"]
-    remaining = timer_state["duration"] - elapsed
-    
-    if remaining <= 0:
-        timer_state["active"] = False
+
+def pause_pomodoro(user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
+    """
+    Pause timer yang sedang berjalan
+    Args:
+        user_id (str): ID user/session pemilik timer
+    Returns:
+        Dict dengan status dan remaining time
+    """
+    with registry.session(user_id) as state:
+        if not state.active:
+            return {
+                "status": "error",
+                "message": "❌ Tidak ada timer yang sedang berjalan"
+            }
+        
+        if state.paused_ns:
+            return {
+                "status": "error",
+                "message": "⏸️ Timer sudah di-pause. Gunakan 'resume' untuk melanjutkan."
+            }
+        
+        state.paused_ns = clock.monotonic_ns()
+        state.scheduler.cancel(state.handle)
+        state.handle = None
+        _publish_progress(state, "pause")
         return {
-            "status": "completed",
-            "message": "🎉 Timer selesai! Waktu untuk istirahat!",
-            "remaining": 0
+            "status": "paused",
+            "message": "⏸️ Timer di-pause",
+            "remaining": _remaining_info(state)["remaining"]
+        }
+
+def resume_pomodoro(user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
+    """
+    Resume timer yang di-pause
+    Args:
+        user_id (str): ID user/session pemilik timer
+    Returns:
+        Dict dengan status dan remaining time
+    """
+    with registry.session(user_id) as state:
+        if not state.active:
+            return {
+                "status": "error",
+                "message": "❌ Tidak ada timer yang sedang berjalan"
+            }
+        
+        if not state.paused_ns:
+            return {
+                "status": "error",
+                "message": "❌ Timer tidak sedang di-pause"
+            }
+        
+        # Geser deadline sebesar lama pause (monotonic, kebal NTP/DST)
+        pause_duration = clock.monotonic_ns() - state.paused_ns
+        state.total_paused_ns += pause_duration
+        state.deadline_ns += pause_duration
+        state.cycle_start_ns += pause_duration
+        state.paused_ns = 0
+        
+        remaining = _remaining_info(state)["remaining"]
+        if state.active:
+            _schedule_timer_event(state)
+            _publish_progress(state, "resume")
+        
+        return {
+            "status": "resumed",
+            "message": "▶️ Timer dilanjutkan",
+            "remaining": remaining
+        }
+
+def get_session_statistics(user_id: str = DEFAULT_USER_ID, period: Optional[str] = None, include_history: bool = False,
+                           offset: int = 0, limit: int = 20, start: Optional[str] = None,
+                           end: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Dapatkan statistik session history dari running aggregates (tanpa scan history)
+    Args:
+        user_id (str): ID user/session pemilik history
+        period (str): "day", "week", atau "month" untuk menyertakan rollup per periode
+        include_history (bool): Sertakan halaman history (terbaru dulu)
+        offset (int): Offset halaman history
+        limit (int): Jumlah entry history / bucket per halaman
+        start (str): Awal range (ISO date/datetime) untuk ringkasan "range"
+        end (str): Akhir range exclusive (ISO date/datetime) untuk ringkasan "range"
+    Returns:
+        Dict dengan statistics
+    """
+    if period is not None and period not in BUCKET_PERIODS:
+        return {
+            "status": "error",
+            "message": f"❌ Periode tidak dikenal: {period} (pilih: {', '.join(BUCKET_PERIODS)})"
         }
+    try:
+        start_ts = to_epoch(start) if start is not None else None
+        end_ts = to_epoch(end) if end is not None else None
+    except ValueError as e:
+        return {"status": "error", "message": f"❌ Format waktu tidak valid: {e}"}
+    
+    with registry.session(user_id) as state:
+        result = state.stats.report(period, limit, clock.now())
+        if result["status"] == "no_data":
+            return result
+        evicted = state.stats.total_sessions - len(state.history)
+        
+        if start is not None or end is not None:
+            lo, hi = state.history.index_range(start_ts, end_ts)
+            result["range"] = state.history.summary(lo, hi)
+            # Row sebelum history yang tersimpan sudah di-evict (hanya ada di rollup)
+            result["range"]["partial"] = lo == 0 and evicted > 0
+        if include_history:
+            stop = max(len(state.history) - offset, 0)
+            result["history"] = state.history.entries(max(stop - limit, 0), stop)[::-1]
+            result["history_total"] = len(state.history)
+            result["history_offset"] = offset
+            result["history_evicted"] = evicted
     
-    minutes = int(remaining // 60)
-    seconds = int(remaining % 60)
-    percentage = int((elapsed / timer_state["duration"]) * 100)
+    return result
+
+# TIMELINE QUERIES
+def query_sessions(start: str, end: str, user_id: str = DEFAULT_USER_ID, limit: int = 100) -> Dict[str, Any]:
+    """
+    Session yang berlangsung (beririsan) dalam rentang waktu tertentu
+    Args:
+        start (str): Awal rentang (ISO date/datetime, local time)
+        end (str): Akhir rentang exclusive (ISO date/datetime, local time)
+        user_id (str): ID user/session pemilik history
+        limit (int): Maksimal session yang dikembalikan (paling awal dulu)
+    Returns:
+        Dict dengan status, count, total_minutes, dan sessions
+    """
+    try:
+        start_ts, end_ts = to_epoch(start), to_epoch(end)
+    except ValueError as e:
+        return {"status": "error", "message": f"❌ Format waktu tidak valid: {e}"}
     
-    # Generate progress bar
-    bar_length = 20
-    filled = int(bar_length * percentage / 100)
-    progress_bar = "█" * filled + "░" * (bar_length - filled)
+    with registry.session(user_id) as state:
+        state.time_index = index = index_for(state.history, state.time_index)
+        matches = index.overlapping(start_ts, end_ts)
+        sessions = [index.session(i) for i in matches[:limit]]
     
+    total_minutes = sum(session["duration_completed"] for session in sessions)
     return {
-        "status": "running",
-        "remaining": int(remaining),
-        "formatted": f"{minutes:02d}:{seconds:02d}",
-        "percentage": percentage,
-        "progress_bar": f"[{progress_bar}] {percentage}%",
-        "message": f"⏱️ Sisa: {minutes:02d}:{seconds:02d}"
+        "status": "success",
+        "start": start,
+        "end": end,
+        "count": len(matches),
+        "total_minutes": total_minutes if len(matches) <= limit else None,
+        "sessions": sessions,
+        "truncated": len(matches) > limit,
+        "message": f"🗓️ {len(matches)} session antara {start} dan {end}"
     }
 
-def stop_pomodoro() -> Dict[str, Any]:
+def sessions_at(timestamp: str, user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
     """
-    Hentikan dan reset timer
+    Session yang sedang berjalan pada waktu tertentu ("apa yang saya kerjakan jam T")
+    Args:
+        timestamp (str): Waktu (ISO datetime, local time)
+        user_id (str): ID user/session pemilik history
     Returns:
-        Dict dengan status dan waktu yang sudah dikerjakan
+        Dict dengan status dan sessions
     """
-    if not timer_state["active"]:
-        return {
-            "status": "error",
-            "message": "❌ Tidak ada timer yang sedang berjalan"
-        }
+    try:
+        epoch = to_epoch(timestamp)
+    except ValueError as e:
+        return {"status": "error", "message": f"❌ Format waktu tidak valid: {e}"}
+    
+    with registry.session(user_id) as state:
+        state.time_index = index = index_for(state.history, state.time_index)
+        sessions = [index.session(i) for i in index.at(epoch)]
+    
+    if not sessions:
+        return {"status": "no_data", "timestamp": timestamp, "sessions": [], "message": f"🕳️ Tidak ada session pada {timestamp}"}
+    return {
+        "status": "success",
+        "timestamp": timestamp,
+        "sessions": sessions,
+        "message": f"🎯 Session {sessions[0]['started_at'][11:16]}-{sessions[0]['timestamp'][11:16]} "
+                   f"({sessions[0]['duration_completed']} menit, {sessions[0]['status']})"
+    }
+
+# PROGRESS SUBSCRIPTIONS
+def get_progress(user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
+    """
+    Event progress saat ini untuk user (tanpa efek samping)
+    Args:
+        user_id (str): ID user/session pemilik timer
+    Returns:
+        Dict event progress (lihat _progress_event)
+    """
+    with registry.session(user_id) as state:
+        if state.active and not state.paused_ns and _remaining_ns(state, clock.monotonic_ns()) <= 0:
+            # Deadline lewat tapi callback scheduler belum jalan: selesaikan sekarang (sama seperti _remaining_info)
+            if _remaining_info(state)["status"] == "completed":
+                return {"event": "complete", "status": "completed", "remaining": 0, "formatted": "00:00",
+                        "percentage": 100, "progress_bar": PROGRESS_BARS[100], "next_update_in": None}
+        return _progress_event(state, None)
+
+def watch_progress(user_id: str = DEFAULT_USER_ID, follow: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Generator event progress, hanya yield saat nilai yang ditampilkan berubah
+    (detik/persentase berganti, pause/resume, start/stop/selesai)
+    Consumer lambat tidak menumpuk event: yang diterima selalu state terbaru
+    Args:
+        user_id (str): ID user/session pemilik timer
+        follow (bool): Terus watch timer berikutnya setelah timer selesai/berhenti
+    Yields:
+        Dict event progress
+    """
+    subscription = progress_hub.subscribe(user_id)
+    try:
+        last_key = None
+        while True:
+            event = subscription.take()
+            if event is None:
+                event = get_progress(user_id)
+                # get_progress bisa menyelesaikan timer yang lewat deadline (event complete ikut dipublish)
+                event = subscription.take() or event
+            key = (event["status"], event["remaining"], event["percentage"])
+            if event["event"] is not None or key != last_key:
+                last_key = key
+                yield event
+            if not follow and event["status"] in ("idle", "completed", "stopped"):
+                return
+            subscription.wait(event["next_update_in"])
+    finally:
+        progress_hub.unsubscribe(subscription)
+
+def _progress_event(state: TimerSession, kind: Optional[str]) -> Dict[str, Any]:
+    """
+    Bangun event progress dari state (lock shard harus sudah dipegang)
+    Args:
+        state (TimerSession): Session user
+        kind (str): Jenis perubahan (start, pause, resume, stop, complete, phase) atau None untuk tick
+    Returns:
+        Dict dengan event, status, remaining, formatted, percentage, progress_bar, next_update_in
+    """
+    if not state.active:
+        return {"event": kind, "status": "idle", "remaining": 0, "formatted": "00:00", "percentage": 0,
+                "progress_bar": PROGRESS_BARS[0], "next_update_in": None}
     
-    elapsed = (datetime.now() - timer_state["start_time"]).total_seconds() - timer_state["total_paused"]
-    minutes_completed = int(elapsed // 60)
+    remaining_ns = _remaining_ns(state, clock.monotonic_ns())
+    if kind == "complete":
+        remaining_ns = 0
+    remaining = max(remaining_ns, 0) // _NS
+    minutes, seconds = divmod(remaining, 60)
+    if state.duration_ns > 0:
+        percentage = min((state.duration_ns - max(remaining_ns, 0)) * 100 // state.duration_ns, 100)
+    else:
+        percentage = 100
     
-    timer_state["active"] = False
-    timer_state["start_time"] = None
-    timer_state["duration"] = 0
+    if kind == "complete":
+        status = "completed"
+    elif kind == "stop":
+        status = "stopped"
+    elif state.paused_ns:
+        status = "paused"
+    else:
+        status = "running"
     
-    # Save to history
-    session_history.append({
-        "timestamp": datetime.now().isoformat(),
-        "duration_requested": timer_state["duration"] // 60,
-        "duration_completed": minutes_completed,
-        "status": "stopped"
-    })
+    if status != "running":
+        next_update_in = None
+    elif remaining_ns <= 0:
+        next_update_in = 0.01   # scheduler akan menandai selesai sebentar lagi
+    else:
+        # Sampai angka detik yang ditampilkan berganti
+        next_update_in = ((remaining_ns % _NS) or _NS) / _NS
     
     return {
-        "status": "stopped",
-        "message": f"⏹️ Timer dihentikan. Selesai {minutes_completed} menit.",
-        "time_completed": minutes_completed
+        "event": kind,
+        "status": status,
+        "remaining": remaining,
+        "formatted": f"{minutes:02d}:{seconds:02d}",
+        "percentage": percentage,
+        "progress_bar": PROGRESS_BARS[percentage],
+        "next_update_in": next_update_in
     }
 
-def pause_pomodoro() -> Dict[str, Any]:
+def _publish_progress(state: TimerSession, kind: str) -> None:
+    """Kirim event perubahan state ke subscriber (murah jika tidak ada subscriber)"""
+    if progress_hub.has_subscribers(state.user_id):
+        progress_hub.publish(state.user_id, _progress_event(state, kind))
+
+# PERFORMANCE METRICS
+def get_performance_metrics(enabled: Optional[bool] = None, reset: bool = False) -> Dict[str, Any]:
     """
-    Pause timer yang sedang berjalan
+    Latency per command/tool (count, mean, p50/p90/p99, max, bucket histogram)
+    Args:
+        enabled (bool): Nyalakan/matikan instrumentasi (None = tidak diubah)
+        reset (bool): Kosongkan histogram setelah snapshot diambil
     Returns:
-        Dict dengan status dan remaining time
+        Dict dengan status, enabled, since, metrics per jenis (command, parse, output, tool, lock)
     """
-    if not timer_state["active"]:
-        return {
-            "status": "error",
-            "message": "❌ Tidak ada timer yang sedang berjalan"
-        }
+    if enabled is not None:
+        metrics.enable(enabled)
+    result = metrics.snapshot()
+    if reset:
+        metrics.reset()
+    state = "aktif" if metrics.enabled else "nonaktif"
+    result["status"] = "success"
+    result["message"] = f"📈 Instrumentasi {state}, {sum(len(names) for names in result['metrics'].values())} metric"
+    return result
+
+# EXPORT / IMPORT
+def export_sessions(path: str, user_id: str = DEFAULT_USER_ID) -> Dict[str, Any]:
+    """
+    Export history user ke file binary (lihat export_format)
+    Hanya row detail yang masih tersimpan (row yang sudah di-evict retention tidak ikut)
+    Args:
+        path (str): File tujuan
+        user_id (str): ID user/session pemilik history
+    Returns:
+        Dict dengan status, sessions, dan bytes
+    """
+    with registry.session(user_id) as state:
+        history = state.history
+        count = len(history)
+    # History hanya di-append (eviction membuat objek baru), jadi row [0, count) aman dibaca tanpa lock
+    size = write_sessions(path, history.iter_rows(0, count), count, user_id)
+    return {
+        "status": "success",
+        "message": f"💾 {count} session diekspor ke {path} ({size} byte)",
+        "sessions": count,
+        "bytes": size
+    }
+
+def import_sessions(path: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Import file binary ke history user (dan ke persistent history jika aktif)
+    Record harus urut waktu dan lebih baru dari history yang sudah ada; semua record
+    divalidasi dulu sehingga file yang rusak tidak diimpor sebagian
+    Args:
+        path (str): File dari export_sessions
+        user_id (str): User tujuan (None = user_id di header file, atau default)
+    Returns:
+        Dict dengan status dan sessions
+    """
+    try:
+        source = SessionFile(path)
+    except (OSError, ValueError) as e:
+        return {"status": "error", "message": f"❌ {e}"}
     
-    if timer_state["paused_time"] is not None:
-        return {
-            "status": "error",
-            "message": "⏸️ Timer sudah di-pause. Gunakan 'resume' untuk melanjutkan."
-        }
+    with source:
+        user_id = user_id or source.user_id or DEFAULT_USER_ID
+        previous = None
+        for index, (timestamp, requested, completed, status) in enumerate(source):
+            if not math.isfinite(timestamp):
+                return {"status": "error", "message": f"❌ Record {index} tidak valid: timestamp {timestamp}"}
+            if previous is not None and timestamp < previous:
+                return {"status": "error", "message": "❌ Record di file tidak urut waktu"}
+            previous = timestamp
+            try:
+                check_row(requested, completed, status)
+            except ValueError as e:
+                return {"status": "error", "message": f"❌ Record {index} tidak valid: {e}"}
+        if len(source):
+            # Record urut waktu: cukup cek record pertama dan terakhir bisa dikonversi ke datetime
+            try:
+                row_entry(*source.record(0))
+                row_entry(*source.record(len(source) - 1))
+            except (ValueError, OverflowError, OSError) as e:
+                return {"status": "error", "message": f"❌ Timestamp di file di luar jangkauan: {e}"}
+        
+        with registry.session(user_id) as state:
+            history = state.history
+            if len(source) and len(history) and history.row(-1)[0] > source.record(0)[0]:
+                return {
+                    "status": "error",
+                    "message": "❌ File berisi session yang lebih lama dari history yang ada (import hanya untuk data baru)"
+                }
+            for row in source:
+                entry = row_entry(*row)
+                history.append_row(*row)
+                state.stats.add(entry)
+                if history_store is not None:
+                    history_store.append(dict(entry, user_id=user_id))
+            state.sessions_completed = state.stats.completed_sessions
+            state.total_focus_time = state.stats.completed_minutes * 60
+            _apply_retention(state)
     
-    timer_state["paused_time"] = datetime.now()
     return {
-        "status": "paused",
-        "message": "⏸️ Timer di-pause",
-        "remaining": get_remaining_time()["remaining"]
+        "status": "success",
+        "message": f"📥 {len(source)} session diimpor ke '{user_id}'",
+        "sessions": len(source),
+        "user_id": user_id
     }
 
-def resume_pomodoro() -> Dict[str, Any]:
+# CLOCK
+def use_clock(new_clock: Any, new_scheduler: Any) -> Tuple[Any, Any]:
     """
-    Resume timer yang di-pause
+    Ganti sumber waktu dan scheduler default timer (mis. SimulatedClock + SimulatedScheduler)
+    Timer yang sedang berjalan tetap memakai scheduler lamanya; ganti saat tidak ada timer aktif
+    Args:
+        new_clock: Objek dengan monotonic_ns(), time(), dan now()
+        new_scheduler: Objek dengan schedule(), schedule_at(), dan cancel()
     Returns:
-        Dict dengan status dan remaining time
+        (clock, scheduler) sebelumnya, untuk dipasang kembali
     """
-    if not timer_state["active"]:
-        return {
-            "status": "error",
-            "message": "❌ Tidak ada timer yang sedang berjalan"
-        }
+    global clock, scheduler
+    previous = (clock, scheduler)
+    clock, scheduler = new_clock, new_scheduler
+    return previous
+
+# RETENTION
+def enforce_retention(now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Jalankan retention untuk semua user: batas per user, lalu memory budget global
+    (row tertua semua user di-evict lebih dulu). Statistik tidak berubah
+    Args:
+        now (float): Epoch sekarang untuk batas hari (None = clock.time())
+    Returns:
+        Dict dengan evicted, history_rows, dan history_bytes
+    """
+    now = clock.time() if now is None else now
+    evicted = 0
+    histories = {}
+    for user_id in registry.user_ids():
+        with registry.session(user_id) as state:
+            trimmed = retention.apply(state.history, now)
+            if trimmed is not None:
+                evicted += len(state.history) - len(trimmed)
+                state.history = trimmed
+            histories[user_id] = state.history
     
-    if timer_state["paused_time"] is None:
-        return {
-            "status": "error",
-            "message": "❌ Timer tidak sedang di-pause"
+    if retention.over_budget(sum(history.memory_usage() for history in histories.values())):
+        for user_id, start in retention.budget_cutoff(histories).items():
+            with registry.session(user_id) as state:
+                # Lewati user yang history-nya berubah sejak dihitung
+                if state.history is histories[user_id]:
+                    state.history = histories[user_id] = state.history.tail(start)
+                    evicted += start
+    
+    return {
+        "status": "success",
+        "evicted": evicted,
+        "history_rows": sum(len(history) for history in histories.values()),
+        "history_bytes": sum(history.memory_usage() for history in histories.values())
+    }
+
+# PERSISTENT HISTORY
+def configure_history(directory: str) -> HistoryStore:
+    """
+    Aktifkan persistent history di directory tertentu dan restore statistik user
+    Args:
+        directory (str): Directory untuk snapshot, log, dan file columnar history
+    Returns:
+        HistoryStore yang aktif
+    """
+    global history_store
+    close_history()
+    store = HistoryStore(directory, _fold_history, encode=_encode_snapshot, decode=_decode_snapshot,
+                         keep_segments=HISTORY_KEEP_LOGS)
+    snapshot = store.load()
+    for user_id, summary in snapshot.get("users", {}).items():
+        aggregates = summary["stats"].copy()
+        # File columnar dibuka via mmap, lalu tambahkan row dari tail log
+        history = _open_history(directory, summary["files"])
+        for row in summary["pending"].iter_rows():
+            history.append_row(*row)
+        with registry.session(user_id) as state:
+            state.history = retention.apply(history, clock.time()) or history
+            state.stats = aggregates
+            state.sessions_completed = aggregates.completed_sessions
+            state.total_focus_time = aggregates.completed_minutes * 60
+    
+    history_store = store
+    atexit.register(store.close)
+    return store
+
+def close_history() -> None:
+    """Flush dan tutup persistent history (error writer tetap dilempar setelah store dilepas)"""
+    global history_store
+    store, history_store = history_store, None
+    if store is not None:
+        store.close()
+
+def _fold_history(snapshot: Dict[str, Any], record: Dict[str, Any]) -> None:
+    """
+    Reducer snapshot history: aggregates + row baru sejak snapshot terakhir per user
+    History lengkap hanya ada di registry (dan di file columnar), tidak diduplikasi di store
+    Args:
+        snapshot (Dict): State snapshot (diubah in-place)
+        record (Dict): Record session dari log
+    """
+    users = snapshot.setdefault("users", {})
+    summary = users.get(record["user_id"])
+    if summary is None:
+        summary = users[record["user_id"]] = {
+            "stats": SessionAggregates(),
+            "pending": ColumnarHistory(),
+            "files": [],
+            "rows": []
         }
     
-    pause_duration = (datetime.now() - timer_state["paused_time"]).total_seconds()
-    timer_state["total_paused"] += pause_duration
-    timer_state["paused_time"] = None
+    entry = {key: value for key, value in record.items() if key != "user_id"}
+    summary["stats"].add(entry)
+    summary["pending"].append(entry)
+
+def _open_history(directory: str, files: Iterable[str]) -> ColumnarHistory:
+    """File columnar satu user (urut lama -> baru) sebagai satu history: file pertama via mmap, sisanya di-append"""
+    files = list(files)
+    if not files:
+        return ColumnarHistory()
+    history = ColumnarHistory.open(os.path.join(directory, files[0]))
+    for name in files[1:]:
+        for row in ColumnarHistory.open(os.path.join(directory, name)).iter_rows():
+            history.append_row(*row)
+    return history
+
+def _encode_snapshot(snapshot: Dict[str, Any], directory: str) -> Dict[str, Any]:
+    """
+    Snapshot state -> JSON
+    Row baru user yang berubah ditulis sebagai file columnar delta (O(row baru), bukan O(history)).
+    File digabung seperti LSM: file i selalu >= SNAPSHOT_MERGE_RATIO x total file sesudahnya, jadi jumlah file
+    O(log n) dan setiap row ditulis ulang O(log n) kali. Retention diterapkan saat file tertua ikut
+    digabung. File lama dihapus pada snapshot berikutnya (setelah tidak direferensikan lagi); file yang
+    masih di-mmap registry (Windows menolak menghapusnya) dicoba lagi pada snapshot sesudahnya
+    """
+    import hashlib  # _hashlib (OpenSSL) lambat dimuat; hanya dibutuhkan thread snapshot
+    garbage = []
+    for name in snapshot.pop("garbage", []):
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            garbage.append(name)
+    
+    generation = snapshot["generation"] = snapshot.get("generation", 0) + 1
+    for user_id, summary in snapshot.get("users", {}).items():
+        pending = summary["pending"]
+        if not len(pending):
+            continue
+        files, rows = summary["files"], summary["rows"]
+        sizes = rows + [len(pending)]
+        merge_from = len(rows)
+        while merge_from > 0 and sizes[merge_from - 1] < SNAPSHOT_MERGE_RATIO * sum(sizes[merge_from:]):
+            merge_from -= 1
+        if merge_from < len(files):
+            history = _open_history(directory, files[merge_from:])
+            for row in pending.iter_rows():
+                history.append_row(*row)
+            if merge_from == 0:
+                history = retention.apply(history, clock.time()) or history
+        else:
+            history = pending
+        
+        name = f"{hashlib.sha1(user_id.encode('utf-8')).hexdigest()[:16]}-{generation:08d}.col"
+        history.save(os.path.join(directory, name))
+        garbage.extend(files[merge_from:])
+        files[merge_from:] = [name]
+        rows[merge_from:] = [len(history)]
+        summary["pending"] = ColumnarHistory()
+    snapshot["garbage"] = garbage
     
     return {
-        "status": "resumed",
-        "message": "▶️ Timer dilanjutkan",
-        "remaining": get_remaining_time()["remaining"]
+        "generation": generation,
+        "users": {
+            user_id: {"stats": summary["stats"].to_dict(), "files": summary["files"]}
+            for user_id, summary in snapshot.get("users", {}).items()
+        }
     }
 
-def get_session_statistics() -> Dict[str, Any]:
+def _decode_snapshot(data: Dict[str, Any], directory: str) -> Dict[str, Any]:
+    """JSON -> snapshot state (kebalikan _encode_snapshot), buang file columnar yatim"""
+    users = {}
+    for user_id, summary in data.get("users", {}).items():
+        stats = SessionAggregates.from_dict(summary["stats"])
+        files = summary["files"]
+        rows = [len(ColumnarHistory.open(os.path.join(directory, name))) for name in files]
+        users[user_id] = {
+            "stats": stats,
+            "pending": ColumnarHistory(),
+            "files": files,
+            "rows": rows
+        }
+    
+    referenced = {name for summary in users.values() for name in summary["files"]}
+    for name in os.listdir(directory):
+        if name.endswith((".col", ".col.tmp")) and name not in referenced:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass  # masih di-mmap (Windows), dibuang saat startup berikutnya
+    
+    return {"generation": data.get("generation", 0), "users": users}
+
+# BACKGROUND UTILITIES
+def _remaining_info(state: TimerSession) -> Dict[str, Any]:
     """
-    Dapatkan statistik session history
+    Hitung sisa waktu untuk satu session (lock shard harus sudah dipegang)
+    Args:
+        state (TimerSession): Session user
     Returns:
-        Dict dengan statistics
+        Dict dengan status, remaining time, dan progress bar
     """
-    if not session_history:
+    if not state.active:
         return {
-            "status": "no_data",
-            "message": "📊 Belum ada session yang tercatat"
+            "status": "idle",
+            "message": "⏳ Tidak ada timer yang berjalan",
+            "remaining": 0
         }
     
-    total_completed = sum(s["duration_completed"] for s in session_history)
-    total_sessions = len(session_history)
+    remaining_ns = _remaining_ns(state, clock.monotonic_ns())
     
-    return {
-        "status": "success",
-        "total_sessions": total_sessions,
-        "total_minutes": total_completed,
-        "total_hours": round(total_completed / 60, 2),
-        "message": f"📊 Total: {total_sessions} sessions, {total_completed} menit ({round(total_completed / 60, 2)} jam)",
-        "history": session_history
+    # Siklus bisa melewati beberapa fase sekaligus jika scheduler terlambat
+    while remaining_ns <= 0:
+        _complete_timer(state)
+        if not state.active:
+            return {
+                "status": "completed",
+                "message": "🎉 Timer selesai! Waktu untuk istirahat!",
+                "remaining": 0
+            }
+        remaining_ns = _remaining_ns(state, clock.monotonic_ns())
+    
+    remaining = remaining_ns // _NS
+    minutes, seconds = divmod(remaining, 60)
+    percentage = (state.duration_ns - remaining_ns) * 100 // state.duration_ns
+    formatted = f"{minutes:02d}:{seconds:02d}"
+    
+    result = {
+        "status": "running",
+        "remaining": remaining,
+        "formatted": formatted,
+        "percentage": percentage,
+        "progress_bar": PROGRESS_BARS[percentage],
+        "message": f"⏱️ Sisa: {formatted}"
     }
+    if state.cycle is not None:
+        result["phase"] = _phase_name(state)
+    return result
 
-# BACKGROUND UTILITIES
-def _timer_countdown():
+def _remaining_ns(state: TimerSession, now_ns: int) -> int:
+    """Sisa waktu (nanodetik, clock.monotonic_ns), berhenti berkurang saat pause"""
+    if state.paused_ns:
+        now_ns = state.paused_ns
+    return state.deadline_ns - now_ns
+
+def _cycle_offset_ns(state: TimerSession, now_ns: int) -> int:
+    """Waktu aktif sejak awal siklus (nanodetik), tidak termasuk pause"""
+    if state.paused_ns:
+        now_ns = state.paused_ns
+    return now_ns - state.cycle_start_ns
+
+def _in_focus(state: TimerSession) -> bool:
+    """True jika timer sedang fase fokus (timer biasa selalu fokus)"""
+    return state.cycle is None or state.cycle.kinds[state.phase] == PHASE_FOCUS
+
+def _phase_name(state: TimerSession) -> str:
+    """Nama fase aktif (focus, short_break, long_break)"""
+    return PHASE_NAMES[state.cycle.kinds[state.phase]] if state.cycle is not None else "focus"
+
+def _elapsed_ns(state: TimerSession, now_ns: int) -> int:
+    """Waktu fokus yang sudah berjalan (nanodetik), tidak termasuk pause"""
+    return state.duration_ns - max(_remaining_ns(state, now_ns), 0)
+
+def _record_session(state: TimerSession, minutes_completed: int, status: str) -> None:
+    """Simpan session yang selesai/dihentikan ke history user (dan ke disk jika aktif)"""
+    entry = {
+        "timestamp": clock.now().isoformat(),
+        "duration_requested": state.duration // 60,
+        "duration_completed": minutes_completed,
+        "status": status
+    }
+    state.history.append(entry)
+    state.stats.add(entry)
+    if history_store is not None:
+        history_store.append(dict(entry, user_id=state.user_id))
+    _apply_retention(state)
+
+def _apply_retention(state: TimerSession) -> None:
+    """
+    Evict row history lama milik user ini (dipanggil dengan lock user dipegang)
+    Memory budget semua user dicek sesekali di thread scheduler, di luar lock user
+    """
+    trimmed = retention.apply(state.history, clock.time())
+    if trimmed is not None:
+        state.history = trimmed
+    if retention.memory_budget is not None and next(_recorded) % BUDGET_CHECK_INTERVAL == 0:
+        scheduler.schedule(0, enforce_retention)
+
+def _reset_timer(state: TimerSession) -> None:
+    """Reset state timer dan batalkan jadwal yang tersisa"""
+    if state.scheduler is not None:
+        state.scheduler.cancel(state.handle)
+    state.handle = None
+    state.active = False
+    state.start_time = None
+    state.paused_ns = 0
+    state.duration = 0
+    state.duration_ns = 0
+    state.cycle = None
+    state.phase = 0
+
+def _complete_timer(state: TimerSession) -> None:
     """
-    Background thread untuk countdown dan notifikasi
-    Berjalan di thread terpisah agar tidak blocking
+    Tandai timer/fase selesai penuh dan catat sesi fokus ke history
+    Dalam siklus langsung pindah ke fase berikutnya (tanpa perintah manual)
+    Timer terakhir selalu di-reset (juga jika record/publish gagal) agar sesi tidak tercatat berulang
     """
-    while timer_state["active"]:
-        time.sleep(0.5)
-        remaining = get_remaining_time()["remaining"]
+    last = state.cycle is None or state.phase + 1 >= len(state.cycle)
+    try:
+        if _in_focus(state):
+            state.sessions_completed += 1
+            state.total_focus_time += state.duration
+            _record_session(state, state.duration // 60, "completed")
         
-        if remaining <= 0:
-            timer_state["active"] = False
-            _beep_notification()
-            timer_state["sessions_completed"] += 1
-            break
+        if not last:
+            _start_phase(state, state.phase + 1)
+            return
         
-        # Beep di 5 detik terakhir
-        if 0 < remaining <= 5:
-            _beep_notification()
+        if state.cycle is not None:
+            message = f"🎉 Siklus {state.cycle.sessions} sesi selesai!"
+        else:
+            message = f"🎉 Pomodoro {state.duration // 60} menit selesai!"
+        _publish_progress(state, "complete")
+    finally:
+        if last:
+            _reset_timer(state)
+    notifier.emit("complete", state.user_id, message)
 
-def _beep_notification():
+def _start_phase(state: TimerSession, index: int) -> None:
     """
-    Terminal bell notification (beep)
+    Mulai fase index dari plan siklus (O(1): batas fase sudah dihitung di CyclePlan)
+    Deadline dihitung dari awal siklus sehingga keterlambatan callback tidak menumpuk
     """
-    sys.stdout.write('\a')
-    sys.stdout.flush()
+    state.scheduler.cancel(state.handle)
+    plan = state.cycle
+    state.phase = index
+    state.start_time = clock.now()
+    state.duration_ns = plan.ends[index] - plan.start_of(index)
+    state.duration = state.duration_ns // _NS
+    state.deadline_ns = state.cycle_start_ns + plan.ends[index]
+    _schedule_timer_event(state)
+    _publish_progress(state, "phase")
+    
+    kind = plan.kinds[index]
+    notifier.emit("focus_start" if kind == PHASE_FOCUS else "break_start", state.user_id,
+                  f"{PHASE_LABELS[kind]} {state.duration // 60} menit")
 
-# TOOL DEFINITION
-def get_tool_definitions() -> list:
+def _schedule_timer_event(state: TimerSession) -> None:
     """
-    Definisikan tools dalam format OpenAI
-    Returns:
-        List of tool definitions
+    Jadwalkan event countdown berikutnya di scheduler
+    Worker tidur tepat sampai awal warning window, beep berikutnya, atau deadline
+    Args:
+        state (TimerSession): Session user
+    """
+    warning_start = state.deadline_ns - _WARNING_WINDOW_NS
+    now_ns = clock.monotonic_ns()
+    if not notifier.sinks:
+        # Tanpa sink, warning tidak dikirim ke mana pun: cukup bangun di deadline
+        wake_at = state.deadline_ns
+    elif now_ns < warning_start:
+        wake_at = warning_start
+    else:
+        wake_at = min(state.deadline_ns, now_ns + _WARNING_INTERVAL_NS)
+    state.generation += 1
+    generation = state.generation
+    state.handle = state.scheduler.schedule_at(wake_at, lambda: _timer_countdown(state.user_id, generation))
+
+def _timer_countdown(user_id: str, generation: int):
+    """
+    Callback scheduler untuk countdown dan notifikasi
+    Dipanggil hanya saat warning window atau deadline, bukan polling
     """
-    return [
-        {
-            "name": "start_pomodoro",
-            "description": "Mulai Pomodoro timer dengan durasi tertentu (dalam menit). Default 25 menit untuk fokus, 5 menit untuk istirahat.",
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "duration_minutes": {
-                        "type": "integer",
-                        "description": "Durasi Pomodoro dalam menit (default: 25)"
-                    }
+    with registry.session(user_id) as state:
+        if state.generation != generation or not state.active or state.paused_ns:
+            return
+        
+        remaining_ns = _remaining_ns(state, clock.monotonic_ns())
+        
+        if remaining_ns <= 0:
+            _complete_timer(state)
+            return
+        
+        # Beep di 5 detik terakhir (hanya antrikan event, tidak menunggu sink)
+        if remaining_ns <= _WARNING_WINDOW_NS:
+            notifier.emit("warning", user_id, f"⏳ Sisa {-(-remaining_ns // _NS)} detik")
+        _schedule_timer_event(state)
+
+# TOOL DEFINITION
+_USER_ID_SCHEMA = {
+    "type": "string",
+    "description": f"ID user/session pemilik timer (opsional, default: '{DEFAULT_USER_ID}')"
+}
+
+TOOL_DEFINITIONS = [
+    {
+        "name": "start_pomodoro",
+        "description": "Mulai Pomodoro timer dengan durasi tertentu (dalam menit). Default 25 menit untuk fokus, 5 menit untuk istirahat.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "duration_minutes": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": MAX_TIMER_MINUTES,
+                    "description": "Durasi Pomodoro dalam menit (default: 25)"
+                },
+                "user_id": _USER_ID_SCHEMA
+            },
+            "required": ["duration_minutes"]
+        }
+    },
+    {
+        "name": "query_sessions",
+        "description": "Cari session yang berlangsung dalam rentang waktu (mis. jam 9-12 hari Selasa)",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "start": {
+                    "type": "string",
+                    "description": "Awal rentang, ISO date/datetime local time (mis. 2024-05-14T09:00)"
+                },
+                "end": {
+                    "type": "string",
+                    "description": "Akhir rentang (exclusive), ISO date/datetime local time"
+                },
+                "limit": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Maksimal session yang dikembalikan (default: 100)"
+                },
+                "user_id": _USER_ID_SCHEMA
+            },
+            "required": ["start", "end"]
+        }
+    },
+    {
+        "name": "sessions_at",
+        "description": "Session yang sedang berjalan pada waktu tertentu",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "timestamp": {
+                    "type": "string",
+                    "description": "Waktu, ISO datetime local time (mis. 2024-05-14T10:30)"
                 },
-                "required": ["duration_minutes"]
+                "user_id": _USER_ID_SCHEMA
+            },
+            "required": ["timestamp"]
+        }
+    },
+    {
+        "name": "start_cycle",
+        "description": "Mulai siklus Pomodoro otomatis: fokus, short break, dan long break berganti sendiri sesuai config",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "sessions": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": MAX_CYCLE_SESSIONS,
+                    "description": f"Jumlah sesi fokus (default: {SESSIONS_UNTIL_LONG_BREAK}, maks {MAX_CYCLE_SESSIONS})"
+                },
+                "focus_minutes": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": MAX_TIMER_MINUTES,
+                    "description": f"Durasi satu sesi fokus dalam menit (default: {POMODORO_DURATION})"
+                },
+                "user_id": _USER_ID_SCHEMA
+            }
+        }
+    },
+    {
+        "name": "get_cycle_status",
+        "description": "Cek posisi siklus: fase sekarang, fase berikutnya, dan waktu sampai long break",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "user_id": _USER_ID_SCHEMA
             }
-        },
-        {
-            "name": "get_remaining_time",
-            "description": "Cek sisa waktu pada Pomodoro yang sedang berjalan dengan progress bar",
-            "input_schema": {
-                "type": "object",
-                "properties": {}
+        }
+    },
+    {
+        "name": "get_remaining_time",
+        "description": "Cek sisa waktu pada Pomodoro yang sedang berjalan dengan progress bar",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "user_id": _USER_ID_SCHEMA
             }
-        },
-        {
-            "name": "stop_pomodoro",
-            "description": "Hentikan Pomodoro timer dan reset",
-            "input_schema": {
-                "type": "object",
-                "properties": {}
+        }
+    },
+    {
+        "name": "stop_pomodoro",
+        "description": "Hentikan Pomodoro timer dan reset",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "user_id": _USER_ID_SCHEMA
             }
-        },
-        {
-            "name": "pause_pomodoro",
-            "description": "Pause Pomodoro timer sementara",
-            "input_schema": {
-                "type": "object",
-                "properties": {}
+        }
+    },
+    {
+        "name": "pause_pomodoro",
+        "description": "Pause Pomodoro timer sementara",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "user_id": _USER_ID_SCHEMA
+            }
+        }
+    },
+    {
+        "name": "resume_pomodoro",
+        "description": "Resume Pomodoro timer yang di-pause",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "user_id": _USER_ID_SCHEMA
             }
-        },
-        {
-            "name": "resume_pomodoro",
-            "description": "Resume Pomodoro timer yang di-pause",
-            "input_schema": {
-                "type": "object",
-                "properties": {}
+        }
+    },
+    {
+        "name": "get_session_statistics",
+        "description": "Dapatkan statistik semua session yang sudah dikerjakan (total, hari/minggu/bulan ini, rollup per periode, median/p90, completion rate, streak, heatmap per jam)",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "user_id": _USER_ID_SCHEMA,
+                "period": {
+                    "type": "string",
+                    "enum": list(BUCKET_PERIODS),
+                    "description": "Sertakan rollup per hari/minggu/bulan"
+                },
+                "include_history": {
+                    "type": "boolean",
+                    "description": "Sertakan halaman history session (terbaru dulu, default: false)"
+                },
+                "offset": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "description": "Offset halaman history (default: 0)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Jumlah entry history / bucket per halaman (default: 20)"
+                },
+                "start": {
+                    "type": "string",
+                    "description": "Awal range ISO date/datetime untuk ringkasan range (rata-rata, median, p90)"
+                },
+                "end": {
+                    "type": "string",
+                    "description": "Akhir range ISO date/datetime (exclusive)"
+                }
             }
-        },
-        {
-            "name": "get_session_statistics",
-            "description": "Dapatkan statistik semua session yang sudah dikerjakan",
-            "input_schema": {
-                "type": "object",
-                "properties": {}
+        }
+    },
+    {
+        "name": "get_performance_metrics",
+        "description": "Latency per command REPL dan per tool (count, mean, p50/p90/p99, max, histogram), bisa menyalakan/mematikan instrumentasi",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "enabled": {
+                    "type": "boolean",
+                    "description": "Nyalakan (true) atau matikan (false) instrumentasi"
+                },
+                "reset": {
+                    "type": "boolean",
+                    "description": "Kosongkan histogram setelah dibaca (default: false)"
+                }
             }
         }
-    ]
+    }
+]
+
+def get_tool_definitions() -> list:
+    """
+    Definisikan tools dalam format OpenAI (dibuat sekali saat import, jangan diubah)
+    Returns:
+        List of tool definitions
+    """
+    return TOOL_DEFINITIONS
+
+TOOL_MAPPING = {
+    "start_pomodoro": start_pomodoro,
+    "get_remaining_time": get_remaining_time,
+    "stop_pomodoro": stop_pomodoro,
+    "pause_pomodoro": pause_pomodoro,
+    "resume_pomodoro": resume_pomodoro,
+    "get_session_statistics": get_session_statistics,
+    "start_cycle": start_cycle,
+    "get_cycle_status": get_cycle_status,
+    "query_sessions": query_sessions,
+    "sessions_at": sessions_at,
+    "get_performance_metrics": get_performance_metrics,
+}
+
+# INPUT VALIDATION
+_JSON_TYPES = {
+    "integer": int,
+    "string": str,
+    "boolean": bool,
+    "object": dict,
+}
+
+def _compile_validator(schema: Dict[str, Any]) -> Callable[[Dict[str, Any]], Optional[str]]:
+    """
+    Compile input_schema menjadi fungsi validasi
+    Args:
+        schema (Dict): input_schema dari TOOL_DEFINITIONS
+    Returns:
+        Callable(tool_input) -> pesan error atau None jika valid
+    """
+    properties = schema.get("properties", {})
+    required = tuple(schema.get("required", ()))
+    checks = tuple(
+        (name, spec["type"], _JSON_TYPES[spec["type"]], frozenset(spec["enum"]) if "enum" in spec else None,
+         spec.get("minimum"), spec.get("maximum"))
+        for name, spec in properties.items()
+    )
+    
+    def validate(tool_input: Dict[str, Any]) -> Optional[str]:
+        if not isinstance(tool_input, dict):
+            return "Input harus berupa object"
+        for name in required:
+            if name not in tool_input:
+                return f"Parameter wajib tidak ada: {name}"
+        for name, type_name, expected, enum, minimum, maximum in checks:
+            value = tool_input.get(name)
+            if value is None:
+                continue
+            # bool adalah subclass int, jangan terima sebagai integer
+            if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+                return f"Parameter {name} harus bertipe {type_name}"
+            if enum is not None and value not in enum:
+                return f"Parameter {name} harus salah satu dari: {', '.join(sorted(enum))}"
+            if minimum is not None and value < minimum:
+                return f"Parameter {name} minimal {minimum}"
+            if maximum is not None and value > maximum:
+                return f"Parameter {name} maksimal {maximum}"
+        if len(tool_input) > len(checks):
+            for name in tool_input:
+                if name not in properties:
+                    return f"Parameter tidak dikenal: {name}"
+        return None
+    
+    return validate
+
+TOOL_VALIDATORS = {definition["name"]: _compile_validator(definition["input_schema"]) for definition in TOOL_DEFINITIONS}
+
+def call_tool(tool_name: str, tool_input: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validasi input lalu panggil tool
+    Args:
+        tool_name (str): Nama tool yang dipanggil
+        tool_input (Dict): Parameter tool
+    Returns:
+        Dict hasil tool, atau {"error": ...}
+    """
+    tool = TOOL_MAPPING.get(tool_name)
+    if tool is None:
+        return {"error": f"Unknown tool: {tool_name}"}
+    
+    error = TOOL_VALIDATORS[tool_name](tool_input)
+    if error is not None:
+        return {"error": error}
+    
+    if not metrics.enabled:
+        try:
+            return tool(**tool_input)
+        except Exception as e:
+            return {"error": str(e)}
+    
+    started = time.perf_counter_ns()
+    try:
+        return tool(**tool_input)
+    except Exception as e:
+        return {"error": str(e)}
+    finally:
+        metrics.record("tool", tool_name, time.perf_counter_ns() - started)
 
 def execute_tool(tool_name: str, tool_input: Dict[str, Any]) -> str:
     """
@@ -307,20 +1316,53 @@ def execute_tool(tool_name: str, tool_input: Dict[str, Any]) -> str:
     Returns:
         JSON string dengan hasil tool
     """
-    tool_mapping = {
-        "start_pomodoro": start_pomodoro,
-        "get_remaining_time": get_remaining_time,
-        "stop_pomodoro": stop_pomodoro,
-        "pause_pomodoro": pause_pomodoro,
-        "resume_pomodoro": resume_pomodoro,
-        "get_session_statistics": get_session_statistics,
-    }
-    
-    if tool_name not in tool_mapping:
-        return json.dumps({"error": f"Unknown tool: {tool_name}"}, ensure_ascii=False)
+    result = call_tool(tool_name, tool_input)
+    if "error" in result:
+        return json.dumps(result, ensure_ascii=False)
+    return json.dumps(result, indent=2, ensure_ascii=False)
+
+# BATCH / JSON LINES
+_compact_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+def execute_tools_batch(input_stream: Iterable[str], output_stream: TextIO, flush_every: int = 256) -> int:
+    """
+    Jalankan banyak tool call dari stream JSON Lines
+    Setiap baris input: {"name": ..., "input": {...}, "id": ... (opsional)}
+    Setiap baris output (urutan sama dengan input): {"id": ..., "result": {...}} atau {"id": ..., "error": ...}
+    Args:
+        input_stream (Iterable[str]): Baris JSON Lines (mis. sys.stdin)
+        output_stream (TextIO): Tujuan output (mis. sys.stdout)
+        flush_every (int): Jumlah hasil per write ke output
+    Returns:
+        int: Jumlah tool call yang diproses
+    """
+    count = 0
+    pending = []
+    for line in input_stream:
+        line = line.strip()
+        if not line:
+            continue
+        count += 1
+        try:
+            call = json.loads(line)
+        except ValueError as e:
+            pending.append(_compact_json({"id": None, "error": f"Invalid JSON: {e}"}))
+        else:
+            if not isinstance(call, dict):
+                call = {}
+            response = {"id": call.get("id")}
+            result = call_tool(call.get("name"), call.get("input", {}))
+            if "error" in result:
+                response["error"] = result["error"]
+            else:
+                response["result"] = result
+            pending.append(_compact_json(response))
+        
+        if len(pending) >= flush_every:
+            output_stream.write("\n".join(pending) + "\n")
+            pending.clear()
     
-    try:
-        result = tool_mapping[tool_name](**tool_input)
-        return json.dumps(result, indent=2, ensure_ascii=False)
-    except Exception as e:
-        return json.dumps({"error": str(e)}, ensure_ascii=False)
+    if pending:
+        output_stream.write("\n".join(pending) + "\n")
+    output_stream.flush()
+    return count
@@ -2,13 +2,20 @@
 Utility functions untuk UI, input handling
 """
 
-import os
+import sys
+import time
 from config import Colors, WELCOME_MESSAGE, AVAILABLE_COMMANDS
+from metrics import metrics
+
+# String UI statis (dirangkai sekali, bukan per pemanggilan)
+PROMPT = f"{Colors.GREEN}📝 Kamu:{Colors.RESET} "
+RESPONSE_PREFIX = f"{Colors.CYAN}🤖 Assistant:{Colors.RESET} "
 
 # TERMINAL UI FUNCTIONS
 def clear_terminal() -> None:
-    """Clear terminal screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    """Clear terminal screen (escape sequence ANSI, tanpa spawn proses cls/clear)"""
+    sys.stdout.write(Colors.CLEAR_SCREEN)
+    sys.stdout.flush()
 
 def print_welcome() -> None:
     """Print welcome banner"""
@@ -43,8 +50,7 @@ def print_user_input(text: str = "") -> str:
     Returns:
         str: User input
     """
-    prompt = f"{Colors.GREEN}📝 Kamu:{Colors.RESET} "
-    return input(prompt)
+    return input(PROMPT)
 
 def print_response(response: str) -> None:
     """
@@ -52,7 +58,12 @@ def print_response(response: str) -> None:
     Args:
         response (str): Response text
     """
-    print(f"{Colors.CYAN}🤖 Assistant:{Colors.RESET} {response}\n")
+    if not metrics.enabled:
+        print(f"{RESPONSE_PREFIX}{response}\n")
+        return
+    started = time.perf_counter_ns()
+    print(f"{RESPONSE_PREFIX}{response}\n")
+    metrics.record("output", "print_response", time.perf_counter_ns() - started)
 
 def print_goodbye() -> None:
     """Print goodbye message"""